@@ -10,15 +10,200 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from project.Dijkstra import DijkstraShortestPath
 from project.AStarShortestPath import AStarShortestPath
 from project.AltShortestPath import AltShortestPath
-from project.DataLoader import MetroDataLoader
+from project.BidirectionalDijkstra import BidirectionalDijkstraShortestPath
+from project.ContractionHierarchies import ContractionHierarchyShortestPath
+from project.HubLabeling import HubLabelShortestPath
+from project.Landmarks import select_landmarks, LANDMARK_STRATEGIES
+from project.LandmarkStore import QUANTIZATION_TYPECODES
+from project.DataLoader import MetroDataLoader, deep_sizeof
 from project.PerformanceTest import PerformanceTester
+from project.SharedGraph import share_graph, attach_graph, detach_graph
+from typing import Dict, List, Tuple, Optional
+from array import array
+import multiprocessing
 import random
+import tempfile
+import time
 
 
-def batch_test(num_graphs: int = 10, num_tests_per_graph: int = 5):
+ALGORITHM_NAMES = [
+    'Dijkstra',
+    'A* (with Haversine heuristic)',
+    'ALT (A* with Landmarks)',
+    'Bidirectional Dijkstra',
+    'Contraction Hierarchies',
+    'Hub Labeling'
+]
+
+
+def _empty_results() -> Dict[str, Dict[str, list]]:
+    """每个算法一组空的统计列表"""
+    return {
+        name: {'times': [], 'visited': [], 'expanded': [], 'preprocess': []}
+        for name in ALGORITHM_NAMES
+    }
+
+
+def run_graph_tests(
+    loader: MetroDataLoader,
+    graph_id: str,
+    graph: Dict[str, List[Tuple[str, float]]],
+    coordinates: Dict[str, Tuple[float, float]],
+    max_speed: float,
+    num_tests_per_graph: int,
+    landmark_strategy: str = 'avoid'
+) -> Dict[str, Dict[str, list]]:
     """
-    批量测试多个图
+    在一张图上运行所有算法的多次查询，返回按算法分组的统计
+    landmark_strategy: ALT地标的选择策略（见 project.Landmarks）
+    """
+    results = _empty_results()
+    
+    # 每张图只选一次地标，算法实例在该图的所有查询间复用，
+    # 这样ALT的地标距离表只需预处理一次
+    landmarks = select_landmarks(graph, 5, landmark_strategy, coordinates, seed=random.randrange(2 ** 32))
+    
+    # 创建算法实例
+    dijkstra = DijkstraShortestPath()
+    astar = AStarShortestPath(coordinates, max_speed=max_speed)
+    alt = AltShortestPath()
+    bidirectional = BidirectionalDijkstraShortestPath()
+    # 收缩结果缓存在数据目录中，再次运行时直接加载
+    ch = ContractionHierarchyShortestPath(
+        hierarchy_file=os.path.join(loader.data_dir, f"{graph_id}.ch")
+    )
+    hub_labels = HubLabelShortestPath(
+        label_file=os.path.join(loader.data_dir, f"{graph_id}.labels")
+    )
+    
+    # 在这个图上进行多次测试
+    for j in range(num_tests_per_graph):
+        # 随机选择起点、终点
+        start, end, _ = loader.select_random_nodes(graph, num_landmarks=0)
+        
+        # 测试每个算法
+        for algo in [dijkstra, astar, alt, bidirectional, ch, hub_labels]:
+            tester = PerformanceTester()
+            result = tester.test_algorithm(
+                algorithm=algo,
+                graph=graph,
+                start=start,
+                end=end,
+                landmarks=landmarks,
+                num_runs=1
+            )
+            
+            algo_name = result['algorithm']
+            if algo_name in results and 'error' not in result:
+                results[algo_name]['times'].append(result['avg_time_ms'])
+                # 预处理只在每张图的第一次查询时真正执行
+                if j == 0:
+                    results[algo_name]['preprocess'].append(result['preprocess_time_ms'])
+                stats = result.get('statistics', {})
+                if 'nodes_visited' in stats:
+                    results[algo_name]['visited'].append(stats['nodes_visited'])
+                if 'nodes_expanded' in stats:
+                    results[algo_name]['expanded'].append(stats['nodes_expanded'])
+    
+    return results
 
+
+def _merge_results(
+    total_results: Dict[str, Dict[str, list]],
+    results: Dict[str, Dict[str, list]]
+):
+    """把一张图的统计合并进总统计"""
+    for algo_name, data in results.items():
+        for key, values in data.items():
+            total_results[algo_name][key].extend(values)
+
+
+def _test_shared_graph(task: tuple) -> Tuple[str, Optional[Dict[str, Dict[str, list]]], Optional[str]]:
+    """
+    进程池的工作函数：映射共享内存中的图并完成该图的全部查询
+    返回 (图ID, 统计, 错误信息)
+    """
+    descriptor, graph_id, coordinates, max_speed, data_dir, num_tests_per_graph, landmark_strategy, seed = task
+    random.seed(seed)
+    
+    try:
+        shm, shared = attach_graph(descriptor)
+        try:
+            # 与串行模式一样在邻接表上计时，保证两种模式的结果可比
+            graph = shared.to_adjacency()
+        finally:
+            detach_graph(shm, shared)
+        
+        loader = MetroDataLoader(data_dir)
+        results = run_graph_tests(
+            loader, graph_id, graph, coordinates, max_speed, num_tests_per_graph, landmark_strategy
+        )
+        return graph_id, results, None
+    except Exception as e:
+        return graph_id, None, str(e)
+
+
+def _run_parallel(
+    loader: MetroDataLoader,
+    test_graphs: List[str],
+    num_tests_per_graph: int,
+    workers: int,
+    total_results: Dict[str, Dict[str, list]],
+    landmark_strategy: str = 'avoid'
+):
+    """
+    每张图作为一个任务分给进程池；图只在主进程解析一次，
+    CSR数组放进共享内存，子进程直接映射
+    """
+    shared_blocks = []
+    tasks = []
+    
+    try:
+        for graph_id in test_graphs:
+            try:
+                graph = loader.load_graph(graph_id, compact=True)
+            except Exception as e:
+                print(f"  Error loading {graph_id}: {e}")
+                continue
+            
+            shm, descriptor = share_graph(graph)
+            shared_blocks.append(shm)
+            tasks.append((
+                descriptor,
+                graph_id,
+                loader.get_coordinates(graph_id),
+                loader.get_max_speed(graph_id),
+                loader.data_dir,
+                num_tests_per_graph,
+                landmark_strategy,
+                random.randrange(2 ** 32)
+            ))
+        
+        with multiprocessing.Pool(processes=workers) as pool:
+            for i, (graph_id, results, error) in enumerate(
+                pool.imap_unordered(_test_shared_graph, tasks), 1
+            ):
+                if error is not None:
+                    print(f"  Error testing {graph_id}: {error}")
+                    continue
+                print(f"[{i}/{len(tasks)}] Finished {graph_id}")
+                _merge_results(total_results, results)
+    finally:
+        for shm in shared_blocks:
+            shm.close()
+            shm.unlink()
+
+
+def batch_test(
+    num_graphs: int = 10,
+    num_tests_per_graph: int = 5,
+    workers: int = 1,
+    landmark_strategy: str = 'avoid'
+):
+    """
+    批量测试多个图
+    
+    workers > 1 时按图分片到进程池并行运行
     """
     print("\n" + "="*80)
     print(f"BATCH TEST: {num_graphs} graphs × {num_tests_per_graph} tests each")
@@ -38,54 +223,29 @@ def batch_test(num_graphs: int = 10, num_tests_per_graph: int = 5):
     )
     
     # 累积统计
-    total_results = {
-        'Dijkstra': {'times': [], 'visited': [], 'expanded': []},
-        'A* (with Haversine heuristic)': {'times': [], 'visited': [], 'expanded': []},
-        'ALT (A* with Landmarks)': {'times': [], 'visited': [], 'expanded': []}
-    }
+    total_results = _empty_results()
     
-    for i, graph_id in enumerate(test_graphs, 1):
-        print(f"\n[{i}/{len(test_graphs)}] Testing {graph_id}...")
-        
-        try:
-            # 加载图
-            graph = loader.load_graph(graph_id)
-            coordinates = loader.get_coordinates(graph_id)
+    if workers > 1:
+        print(f"\nRunning on {workers} worker processes...")
+        _run_parallel(loader, test_graphs, num_tests_per_graph, workers, total_results, landmark_strategy)
+    else:
+        for i, graph_id in enumerate(test_graphs, 1):
+            print(f"\n[{i}/{len(test_graphs)}] Testing {graph_id}...")
             
-            # 在这个图上进行多次测试
-            for j in range(num_tests_per_graph):
-                # 随机选择起点、终点和地标
-                start, end, landmarks = loader.select_random_nodes(graph, num_landmarks=5)
+            try:
+                # 加载图
+                graph = loader.load_graph(graph_id)
+                coordinates = loader.get_coordinates(graph_id)
                 
-                # 创建算法实例
-                dijkstra = DijkstraShortestPath()
-                astar = AStarShortestPath(coordinates)
-                alt = AltShortestPath()
-                
-                # 测试每个算法
-                for algo in [dijkstra, astar, alt]:
-                    tester = PerformanceTester()
-                    result = tester.test_algorithm(
-                        algorithm=algo,
-                        graph=graph,
-                        start=start,
-                        end=end,
-                        landmarks=landmarks,
-                        num_runs=1
-                    )
-                    
-                    algo_name = result['algorithm']
-                    if algo_name in total_results and 'error' not in result:
-                        total_results[algo_name]['times'].append(result['avg_time_ms'])
-                        stats = result.get('statistics', {})
-                        if 'nodes_visited' in stats:
-                            total_results[algo_name]['visited'].append(stats['nodes_visited'])
-                        if 'nodes_expanded' in stats:
-                            total_results[algo_name]['expanded'].append(stats['nodes_expanded'])
-        
-        except Exception as e:
-            print(f"  Error testing {graph_id}: {e}")
-            continue
+                results = run_graph_tests(
+                    loader, graph_id, graph, coordinates,
+                    loader.get_max_speed(graph_id), num_tests_per_graph, landmark_strategy
+                )
+                _merge_results(total_results, results)
+            
+            except Exception as e:
+                print(f"  Error testing {graph_id}: {e}")
+                continue
     
     # 打印汇总统计
     print("\n" + "="*80)
@@ -93,19 +253,20 @@ def batch_test(num_graphs: int = 10, num_tests_per_graph: int = 5):
     print("="*80)
     print(f"\nTotal tests: {len(test_graphs)} graphs × {num_tests_per_graph} tests = {len(test_graphs) * num_tests_per_graph} tests\n")
     
-    header = f"{'Algorithm':<35} {'Avg Time (ms)':<18} {'Avg Visited':<15} {'Avg Expanded':<15}"
+    header = f"{'Algorithm':<35} {'Avg Time (ms)':<18} {'Preproc/Graph (ms)':<20} {'Avg Visited':<15} {'Avg Expanded':<15}"
     print(header)
-    print("-" * 80)
+    print("-" * 100)
     
     for algo_name, data in total_results.items():
         if data['times']:
             avg_time = sum(data['times']) / len(data['times'])
+            avg_preprocess = sum(data['preprocess']) / len(data['preprocess']) if data['preprocess'] else 0
             avg_visited = sum(data['visited']) / len(data['visited']) if data['visited'] else 0
             avg_expanded = sum(data['expanded']) / len(data['expanded']) if data['expanded'] else 0
             
-            print(f"{algo_name:<35} {avg_time:<18.4f} {avg_visited:<15.1f} {avg_expanded:<15.1f}")
+            print(f"{algo_name:<35} {avg_time:<18.4f} {avg_preprocess:<20.4f} {avg_visited:<15.1f} {avg_expanded:<15.1f}")
     
-    print("="*80)
+    print("="*100)
     
     # 计算改进百分比
     if (total_results['Dijkstra']['times'] and 
@@ -120,8 +281,202 @@ def batch_test(num_graphs: int = 10, num_tests_per_graph: int = 5):
         if total_results['ALT (A* with Landmarks)']['times']:
             alt_avg = sum(total_results['ALT (A* with Landmarks)']['times']) / len(total_results['ALT (A* with Landmarks)']['times'])
             alt_improvement = ((dijkstra_avg - alt_avg) / dijkstra_avg) * 100
-            print(f"✓ ALT average improvement over Dijkstra: {alt_improvement:.2f}%")
+            print(f"✓ ALT average improvement over Dijkstra: {alt_improvement:.2f}% (query only)")
+            
+            # 摊销：每张图预处理一次 + num_tests_per_graph 次查询
+            alt_preprocess = total_results['ALT (A* with Landmarks)']['preprocess']
+            if alt_preprocess:
+                alt_preprocess_avg = sum(alt_preprocess) / len(alt_preprocess)
+                alt_amortized = alt_avg + alt_preprocess_avg / num_tests_per_graph
+                amortized_improvement = ((dijkstra_avg - alt_amortized) / dijkstra_avg) * 100
+                print(f"✓ ALT amortized improvement over Dijkstra "
+                      f"({num_tests_per_graph} queries/graph): {amortized_improvement:.2f}%")
+        
+        if total_results['Bidirectional Dijkstra']['times']:
+            bidirectional_avg = sum(total_results['Bidirectional Dijkstra']['times']) / len(total_results['Bidirectional Dijkstra']['times'])
+            bidirectional_improvement = ((dijkstra_avg - bidirectional_avg) / dijkstra_avg) * 100
+            print(f"✓ Bidirectional Dijkstra average improvement over Dijkstra: {bidirectional_improvement:.2f}%")
+        
+        if total_results['Contraction Hierarchies']['times']:
+            ch_avg = sum(total_results['Contraction Hierarchies']['times']) / len(total_results['Contraction Hierarchies']['times'])
+            ch_improvement = ((dijkstra_avg - ch_avg) / dijkstra_avg) * 100
+            print(f"✓ Contraction Hierarchies average improvement over Dijkstra: {ch_improvement:.2f}% (query only)")
+        
+        if total_results['Hub Labeling']['times']:
+            hl_avg = sum(total_results['Hub Labeling']['times']) / len(total_results['Hub Labeling']['times'])
+            hl_improvement = ((dijkstra_avg - hl_avg) / dijkstra_avg) * 100
+            print(f"✓ Hub Labeling average improvement over Dijkstra: {hl_improvement:.2f}% (query only)")
+    
+    print()
+
+
+def landmark_benchmark(
+    num_graphs: int = 10,
+    num_queries: int = 50,
+    landmark_counts: Tuple[int, ...] = (2, 4, 8, 16),
+    strategies: Tuple[str, ...] = LANDMARK_STRATEGIES
+):
+    """
+    地标选择策略对比
+    
+    每张图抽一批随机查询，所有 (策略, 地标数) 组合都跑同一批查询，
+    报告ALT相对Dijkstra减少的扩展节点比例、选地标和预处理的耗时，
+    最后列出每张图上扩展节点最少的组合
+    """
+    print("\n" + "="*80)
+    print(f"LANDMARK BENCHMARK: {num_graphs} graphs × {num_queries} queries each")
+    print("="*80)
+    
+    loader = MetroDataLoader("metro_graphs")
+    available_graphs = loader.list_available_graphs()
+    
+    if not available_graphs:
+        print("\n⚠ No metro graphs found. Please run gen_metro_graphs.py first.")
+        return
+    
+    test_graphs = random.sample(available_graphs, min(num_graphs, len(available_graphs)))
+    
+    totals = {
+        (strategy, k): {'reduction': [], 'select': [], 'preprocess': []}
+        for strategy in strategies for k in landmark_counts
+    }
+    best_per_graph = []
+    
+    for i, graph_id in enumerate(test_graphs, 1):
+        print(f"[{i}/{len(test_graphs)}] {graph_id}")
+        graph = loader.load_graph(graph_id)
+        coordinates = loader.get_coordinates(graph_id)
+        queries = [loader.select_random_nodes(graph, num_landmarks=0)[:2] for _ in range(num_queries)]
+        
+        dijkstra = DijkstraShortestPath()
+        baseline = sum(dijkstra.query(graph, start, end).nodes_expanded for start, end in queries)
+        best = None
+        
+        for strategy in strategies:
+            for k in landmark_counts:
+                select_start = time.perf_counter()
+                landmarks = select_landmarks(graph, k, strategy, coordinates, seed=random.randrange(2 ** 32))
+                preprocess_start = time.perf_counter()
+                alt = AltShortestPath()
+                alt.preprocess(graph, landmarks)
+                preprocess_end = time.perf_counter()
+                
+                expanded = sum(alt.query(graph, start, end).nodes_expanded for start, end in queries)
+                reduction = 1 - expanded / baseline if baseline else 0.0
+                
+                data = totals[(strategy, k)]
+                data['reduction'].append(reduction)
+                data['select'].append((preprocess_start - select_start) * 1000)
+                data['preprocess'].append((preprocess_end - preprocess_start) * 1000)
+                if best is None or reduction > best[2]:
+                    best = (strategy, k, reduction)
+        
+        best_per_graph.append((graph_id, best))
+    
+    print("\n" + "="*80)
+    print("LANDMARK BENCHMARK SUMMARY (ALT expanded nodes vs Dijkstra)")
+    print("="*80)
+    header = f"{'Strategy':<12} {'Landmarks':<10} {'Avg Reduction (%)':<20} {'Select (ms)':<15} {'Preprocess (ms)':<15}"
+    print(header)
+    print("-" * 80)
+    
+    for (strategy, k), data in totals.items():
+        if data['reduction']:
+            avg_reduction = sum(data['reduction']) / len(data['reduction']) * 100
+            avg_select = sum(data['select']) / len(data['select'])
+            avg_preprocess = sum(data['preprocess']) / len(data['preprocess'])
+            print(f"{strategy:<12} {k:<10} {avg_reduction:<20.2f} {avg_select:<15.2f} {avg_preprocess:<15.2f}")
+    
+    print("\nBest setup per graph:")
+    for graph_id, (strategy, k, reduction) in best_per_graph:
+        print(f"  {graph_id:<20} {strategy:<12} {k:>3} landmarks  {reduction * 100:.2f}% fewer expanded nodes")
+    print()
+
+
+def landmark_store_report(
+    num_graphs: int = 10,
+    num_queries: int = 50,
+    num_landmarks: int = 16,
+    levels: Tuple[int, ...] = (32, 16, 8)
+):
+    """
+    量化地标文件的大小/精度报告
+    
+    每张图用同一组地标和同一批查询，比较字典地标表、float64 矩阵和各量化位数的
+    地标数据大小与ALT扩展节点数；“剪枝损失”是量化后多扩展的节点占精确ALT所剪掉节点的比例
+    量化的启发值仍可采纳，所以同时检查距离与精确结果一致
+    """
+    print("\n" + "="*80)
+    print(f"LANDMARK STORE REPORT: {num_graphs} graphs × {num_queries} queries, {num_landmarks} landmarks")
+    print("="*80)
+    
+    loader = MetroDataLoader("metro_graphs")
+    available_graphs = loader.list_available_graphs()
+    
+    if not available_graphs:
+        print("\n⚠ No metro graphs found. Please run gen_metro_graphs.py first.")
+        return
+    
+    test_graphs = random.sample(available_graphs, min(num_graphs, len(available_graphs)))
+    rows = ['dict', 'float64'] + [f'uint{bits}' for bits in levels]
+    totals = {row: {'bytes': 0, 'expanded': 0, 'wrong': 0} for row in rows}
+    pruned = 0
+    
+    # 量化文件以内存映射方式打开，Windows上删除仍被映射的文件会失败，忽略即可
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as store_dir:
+        for i, graph_id in enumerate(test_graphs, 1):
+            print(f"[{i}/{len(test_graphs)}] {graph_id}")
+            graph = loader.load_graph(graph_id)
+            csr = loader.load_graph(graph_id, compact=True)
+            landmarks = select_landmarks(csr, num_landmarks, seed=random.randrange(2 ** 32))
+            queries = [loader.select_random_nodes(graph, num_landmarks=0)[:2] for _ in range(num_queries)]
+            
+            dijkstra = DijkstraShortestPath()
+            baseline = [dijkstra.query(csr, start, end) for start, end in queries]
+            
+            dict_alt = AltShortestPath()
+            dict_alt.preprocess(graph, landmarks)
+            alt = AltShortestPath()
+            alt.preprocess(csr, landmarks)
+            totals['dict']['bytes'] += deep_sizeof(dict_alt.landmark_distances)
+            totals['float64']['bytes'] += csr.num_nodes * len(landmarks) * 8
+            
+            instances = [('dict', dict_alt, graph), ('float64', alt, csr)]
+            for bits in levels:
+                filepath = os.path.join(store_dir, f"{graph_id}.uint{bits}")
+                alt.save_landmark_store(filepath, bits)
+                # 只计地标矩阵，不含文件头中的节点名
+                totals[f'uint{bits}']['bytes'] += csr.num_nodes * len(landmarks) * array(QUANTIZATION_TYPECODES[bits]).itemsize
+                quantized = AltShortestPath()
+                quantized.load_landmark_store(filepath, csr)
+                instances.append((f'uint{bits}', quantized, csr))
+            
+            for row, instance, query_graph in instances:
+                for (start, end), exact in zip(queries, baseline):
+                    result = instance.query(query_graph, start, end)
+                    totals[row]['expanded'] += result.nodes_expanded
+                    if abs(result.distance - exact.distance) > 1e-9:
+                        totals[row]['wrong'] += 1
+            
+            pruned += sum(result.nodes_expanded for result in baseline)
+    
+    exact_expanded = totals['float64']['expanded']
+    pruned -= exact_expanded
+    
+    print("\n" + "="*80)
+    print("LANDMARK STORE SUMMARY")
+    print("="*80)
+    header = f"{'Storage':<10} {'Size (KB)':<12} {'vs float64':<12} {'Expanded/query':<16} {'Pruning lost (%)':<18} {'Wrong':<6}"
+    print(header)
+    print("-" * 80)
     
+    num_total = len(test_graphs) * num_queries
+    float_bytes = totals['float64']['bytes'] or 1
+    for row in rows:
+        data = totals[row]
+        lost = (data['expanded'] - exact_expanded) / pruned * 100 if pruned else 0.0
+        print(f"{row:<10} {data['bytes'] / 1024:<12.1f} {data['bytes'] / float_bytes:<12.2f} "
+              f"{data['expanded'] / num_total:<16.1f} {lost:<18.2f} {data['wrong']:<6}")
     print()
 
 
@@ -133,7 +488,31 @@ if __name__ == "__main__":
                        help='Number of graphs to test (default: 10)')
     parser.add_argument('--tests', type=int, default=5,
                        help='Number of tests per graph (default: 5)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes (default: 1, run serially)')
+    parser.add_argument('--landmark-strategy', choices=LANDMARK_STRATEGIES, default='avoid',
+                       help='ALT landmark selection strategy (default: avoid)')
+    parser.add_argument('--landmark-benchmark', action='store_true',
+                       help='Compare landmark strategies and counts instead of running the batch test')
+    parser.add_argument('--landmark-counts', default='2,4,8,16',
+                       help='Comma-separated landmark counts for --landmark-benchmark (default: 2,4,8,16)')
+    parser.add_argument('--landmark-store-report', action='store_true',
+                       help='Report size and pruning of quantized landmark stores instead of running the batch test')
     
     args = parser.parse_args()
     
-    batch_test(num_graphs=args.graphs, num_tests_per_graph=args.tests)
+    if args.landmark_benchmark:
+        landmark_benchmark(
+            num_graphs=args.graphs,
+            num_queries=args.tests,
+            landmark_counts=tuple(int(k) for k in args.landmark_counts.split(','))
+        )
+    elif args.landmark_store_report:
+        landmark_store_report(num_graphs=args.graphs, num_queries=args.tests)
+    else:
+        batch_test(
+            num_graphs=args.graphs,
+            num_tests_per_graph=args.tests,
+            workers=args.workers,
+            landmark_strategy=args.landmark_strategy
+        )
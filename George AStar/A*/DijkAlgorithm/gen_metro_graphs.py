@@ -207,6 +207,12 @@ def zip_dir(src_dir: str, zip_path: str):
                 z.write(full, arcname=arc)
 
 
+def write_collection(out_dir: str) -> str:
+    """把目录下所有CSV图打包成一个图集合文件（MetroDataLoader 用 mmap 零拷贝读取）"""
+    from project.DataLoader import MetroDataLoader
+    return MetroDataLoader(out_dir, use_cache=False, memory_budget=0).build_collection()
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--num-graphs", type=int, default=120, help="生成多少份独立地铁图（>=100）")
@@ -214,6 +220,7 @@ def main():
     ap.add_argument("--out-dir", type=str, default="metro_graphs", help="输出目录")
     ap.add_argument("--seed", type=int, default=42, help="随机种子（可复现）")
     ap.add_argument("--zip", action="store_true", help="额外输出一个包含所有CSV的zip")
+    ap.add_argument("--no-collection", action="store_true", help="不生成 graphs.collection 图集合文件")
     args = ap.parse_args()
 
     out_dir = args.out_dir
@@ -243,6 +250,9 @@ def main():
     print(f"Done. graphs={len(counts)} min_edges={min_e} max_edges={max_e}")
     print(f"Output dir: {out_dir}")
 
+    if not args.no_collection:
+        print(f"Collection: {write_collection(out_dir)}")
+
     if args.zip:
         zip_path = out_dir.rstrip("/\\") + ".zip"
         zip_dir(out_dir, zip_path)
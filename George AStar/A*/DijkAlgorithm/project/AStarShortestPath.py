@@ -1,28 +1,117 @@
 """
 AStarShortestPath.py - A*最短路径算法实现
-使用欧几里得距离作为启发式函数的A*算法
+启发函数为球面距离 / 图中观测到的最大速度，即以分钟计的行程时间下界
 """
 
-from project.Interface import ShortestPathInterface
+from project.Interface import ShortestPathInterface, QueryResult
+from project.CSRGraph import CSRGraph
+from project.SearchWorkspace import WorkspacePool, INF
 import heapq
 import math
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
+
+EARTH_RADIUS_KM = 6371.0  # 地球半径（km）
+# 速度上界的相对放大量，抵消浮点误差，保证启发值不会略大于真实距离
+SPEED_SAFETY_FACTOR = 1 + 1e-9
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """两点间的球面距离（km）"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return EARTH_RADIUS_KM * 2 * math.asin(min(1.0, math.sqrt(a)))
+
+
+def max_speed_bound(
+    graph: Dict[str, List[Tuple[str, float]]],
+    coordinates: Dict[str, Tuple[float, float]]
+) -> float:
+    """
+    所有边上 球面距离 / 边权 的最大值（km/分钟），再乘以安全系数
+    
+    任意路径的行程时间 >= 各边球面距离之和 / 最大速度 >= 起终点球面距离 / 最大速度，
+    所以用它换算出的启发值是可采纳（且一致）的下界；
+    存在权重为0但两端距离大于0的边时返回 inf（启发值退化为0）
+    只统计两端都有坐标的边
+    """
+    max_speed = 0.0
+    for node, neighbors in graph.items():
+        if node not in coordinates:
+            continue
+        lat1, lon1 = coordinates[node]
+        for neighbor, weight in neighbors:
+            if neighbor not in coordinates:
+                continue
+            distance = haversine_km(lat1, lon1, *coordinates[neighbor])
+            if distance == 0:
+                continue
+            if weight <= 0:
+                return float('inf')
+            max_speed = max(max_speed, distance / weight)
+    if max_speed == 0:
+        # 没有任何有长度的边：不同坐标的节点之间不可达，启发值取0即可
+        return float('inf')
+    return max_speed * SPEED_SAFETY_FACTOR
 
 
 class AStarShortestPath(ShortestPathInterface):
     """A*算法实现类"""
     
-    def __init__(self, coordinates: Optional[Dict[str, Tuple[float, float]]] = None):
+    def __init__(
+        self,
+        coordinates: Optional[Dict[str, Tuple[float, float]]] = None,
+        max_speed: Optional[float] = None
+    ):
         """
         初始化A*算法
+        max_speed: 速度上界（km/分钟，如 MetroDataLoader.get_max_speed 的结果），
+                   为 None 时在预处理中根据图和坐标计算
         """
-        self.coordinates = coordinates or {}
         self.nodes_visited = 0
         self.nodes_expanded = 0
+        self.max_speed = max_speed
+        self._speed = max_speed
+        # CSR查询复用的 dist/prev/visited 数组，每个并发查询借用一份
+        self._workspaces = WorkspacePool()
+        self.set_coordinates(coordinates or {})
     
     def set_coordinates(self, coordinates: Dict[str, Tuple[float, float]]):
-        """设置节点坐标"""
+        """设置节点坐标，同时预先换算成弧度 (phi, lambda, cos(phi))"""
         self.coordinates = coordinates
+        self._radians = {
+            node: (math.radians(lat), math.radians(lon), math.cos(math.radians(lat)))
+            for node, (lat, lon) in coordinates.items()
+        }
+        # (已预处理的图, 速度上界)，整体替换，查询时只读取一次
+        self._calibration = (None, self.max_speed)
+    
+    def preprocess(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        landmarks: Optional[List[str]] = None
+    ) -> None:
+        """
+        预处理：未指定 max_speed 时，根据图的边权和坐标计算速度上界（同一张图只算一次）
+        """
+        self._calibrate(graph)
+    
+    def _calibrate(self, graph: Dict[str, List[Tuple[str, float]]]) -> Optional[float]:
+        """
+        返回 graph 对应的速度上界，必要时计算并替换缓存的 (图, 速度) 快照
+        并发查询不同的图时各自使用自己算出的速度，不会读到别的图的结果
+        """
+        calibrated_graph, speed = self._calibration
+        if calibrated_graph is graph:
+            return speed
+        
+        speed = self.max_speed
+        if speed is None and self.coordinates:
+            speed = max_speed_bound(graph, self.coordinates)
+        self._calibration = (graph, speed)
+        self._speed = speed
+        return speed
     
     def compute_shortest_path(
         self,
@@ -35,17 +124,40 @@ class AStarShortestPath(ShortestPathInterface):
         使用 A* 算法计算从 start 到 end 的最短路径
         
         """
-        # 重置统计信息
-        self.nodes_visited = 0
-        self.nodes_expanded = 0
+        return self._record_result(self.query(graph, start, end, landmarks))
+    
+    def query(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        end: str,
+        landmarks: Optional[List[str]] = None
+    ) -> QueryResult:
+        """
+        可重入的查询：统计信息只保存在局部变量中，多个线程可以共享同一个实例
+        """
+        speed = self._calibrate(graph)
+        if not self._may_reach(graph, start, end):
+            # 不在同一连通分量，不必搜索
+            return QueryResult(float('inf'), [], self._statistics(0, 0, speed))
+        
+        heuristic = self._heuristic_to(end, speed)
         
-        # 初始化
-        dist = {node: float('inf') for node in graph}
-        dist[start] = 0
-        prev = {node: None for node in graph}
+        if isinstance(graph, CSRGraph):
+            return self._query_csr(graph, start, end, heuristic, speed)
+        
+        nodes_visited = 0
+        nodes_expanded = 0
+        
+        # 距离/前驱只记录搜索到的节点，初始化不随图的规模增长
+        dist = {start: 0}
+        prev = {start: None}
+        
+        # 本次查询的启发值缓存：每个节点只计算一次
+        h_cache = {}
         
         # 优先队列：(f值, g值, 节点)
-        h_start = self._heuristic(start, end)
+        h_start = heuristic(start)
         pq = [(h_start, 0, start)]
         visited = set()
         
@@ -57,30 +169,122 @@ class AStarShortestPath(ShortestPathInterface):
                 continue
             
             visited.add(current_node)
-            self.nodes_visited += 1
+            nodes_visited += 1
             
             # 如果到达终点，重建路径
             if current_node == end:
                 path = self._reconstruct_path(prev, start, end)
-                return current_dist, path
+                return QueryResult(current_dist, path, self._statistics(nodes_visited, nodes_expanded, speed))
             
             # 扩展邻居节点
-            self.nodes_expanded += 1
+            nodes_expanded += 1
             for neighbor, weight in graph[current_node]:
                 new_dist = current_dist + weight
                 
-                if new_dist < dist[neighbor]:
+                if new_dist < dist.get(neighbor, INF):
                     dist[neighbor] = new_dist
                     prev[neighbor] = current_node
                     
                     # 计算f值 = g值 + h值
-                    h_val = self._heuristic(neighbor, end)
+                    h_val = h_cache.get(neighbor)
+                    if h_val is None:
+                        h_val = h_cache[neighbor] = heuristic(neighbor)
                     f_val = new_dist + h_val
                     
                     heapq.heappush(pq, (f_val, new_dist, neighbor))
         
         # 没有找到路径
-        return float('inf'), []
+        return QueryResult(float('inf'), [], self._statistics(nodes_visited, nodes_expanded, speed))
+    
+    def _query_csr(
+        self,
+        graph: CSRGraph,
+        start: str,
+        end: str,
+        heuristic: Callable[[str], float],
+        speed: Optional[float]
+    ) -> QueryResult:
+        """
+        CSR图上的A*：节点用整数ID，距离/前驱/启发值使用工作区中预分配的数组
+        """
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        names = graph.node_names
+        source = graph.node_index[start]
+        target = graph.node_index[end]
+        nodes_visited = 0
+        nodes_expanded = 0
+        
+        with self._workspaces.borrow(graph.num_nodes) as workspace:
+            dist, prev, visited = workspace.dist, workspace.prev, workspace.visited
+            # 启发值缓存按节点ID存放，-1 表示尚未计算
+            h_cache = workspace.h_cache
+            touched = workspace.touched
+            dist[source] = 0
+            touched.append(source)
+            
+            pq = [(heuristic(start), 0, source)]
+            
+            while pq:
+                f_val, current_dist, u = heapq.heappop(pq)
+                
+                if visited[u]:
+                    continue
+                
+                visited[u] = 1
+                nodes_visited += 1
+                
+                if u == target:
+                    path = graph.reconstruct_path(prev, source, target)
+                    return QueryResult(current_dist, path, self._statistics(nodes_visited, nodes_expanded, speed))
+                
+                nodes_expanded += 1
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = targets[i]
+                    new_dist = current_dist + weights[i]
+                    
+                    if new_dist < dist[v]:
+                        if dist[v] == INF:
+                            touched.append(v)
+                        dist[v] = new_dist
+                        prev[v] = u
+                        h_val = h_cache[v]
+                        if h_val < 0:
+                            h_val = h_cache[v] = heuristic(names[v])
+                        f_val = new_dist + h_val
+                        heapq.heappush(pq, (f_val, new_dist, v))
+            
+            return QueryResult(float('inf'), [], self._statistics(nodes_visited, nodes_expanded, speed))
+    
+    def _heuristic_to(self, target: str, speed: Optional[float] = None) -> Callable[[str], float]:
+        """
+        返回本次查询使用的启发函数 h(node)
+        
+        终点的三角函数值只算一次，节点坐标使用预先换算好的弧度；
+        speed 为 None 时使用最近一次预处理得到的速度上界；
+        子类重写了 _heuristic 时直接调用子类的实现
+        """
+        if type(self)._heuristic is not AStarShortestPath._heuristic:
+            return lambda node: self._heuristic(node, target)
+        
+        if speed is None:
+            speed = self._speed
+        radians = self._radians
+        if target not in radians or speed == float('inf'):
+            return lambda node: 0
+        
+        phi2, lambda2, cos_phi2 = radians[target]
+        # 球面距离换算为分钟；没有速度上界时保持原来的公里数
+        scale = EARTH_RADIUS_KM * 2 / speed if speed else EARTH_RADIUS_KM * 2
+        
+        def heuristic(node: str) -> float:
+            if node not in radians:
+                return 0
+            phi1, lambda1, cos_phi1 = radians[node]
+            a = (math.sin((phi2 - phi1) / 2) ** 2 +
+                 cos_phi1 * cos_phi2 * math.sin((lambda2 - lambda1) / 2) ** 2)
+            return scale * math.asin(min(1.0, math.sqrt(a)))
+        
+        return heuristic
     
     def _heuristic(self, node: str, target: str) -> float:
         """
@@ -91,8 +295,11 @@ class AStarShortestPath(ShortestPathInterface):
         
         lat1, lon1 = self.coordinates[node]
         lat2, lon2 = self.coordinates[target]
+        distance = self._haversine_distance(lat1, lon1, lat2, lon2)
         
-        return self._haversine_distance(lat1, lon1, lat2, lon2)
+        if self._speed:
+            return distance / self._speed
+        return distance
     
     def _haversine_distance(
         self,
@@ -104,7 +311,7 @@ class AStarShortestPath(ShortestPathInterface):
         """
         计算两点间的Haversine距离（球面距离）
         """
-        R = 6371.0  # 地球半径（km）
+        R = EARTH_RADIUS_KM
         
         phi1 = math.radians(lat1)
         phi2 = math.radians(lat2)
@@ -144,10 +351,15 @@ class AStarShortestPath(ShortestPathInterface):
         """返回算法名称"""
         return "A* (with Haversine heuristic)"
     
-    def get_statistics(self) -> Dict[str, int]:
-        """返回算法统计信息"""
+    def _statistics(self, nodes_visited: int, nodes_expanded: int, speed: Optional[float]) -> Dict[str, int]:
+        """生成一次查询的统计信息"""
         return {
-            'nodes_visited': self.nodes_visited,
-            'nodes_expanded': self.nodes_expanded,
-            'has_coordinates': len(self.coordinates) > 0
+            'nodes_visited': nodes_visited,
+            'nodes_expanded': nodes_expanded,
+            'has_coordinates': len(self.coordinates) > 0,
+            'max_speed': speed
         }
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """返回算法统计信息"""
+        return self._statistics(self.nodes_visited, self.nodes_expanded, self._speed)
@@ -2,18 +2,247 @@
 AltShortestPath.py - ALT (A*, Landmarks, Triangle inequality) 算法实现
 """
 
-from project.Interface import ShortestPathInterface
+from project.Interface import ShortestPathInterface, QueryResult
+from project.CSRGraph import CSRGraph
+from project.SearchWorkspace import WorkspacePool, INF
+from project.LandmarkStore import save_landmark_store, load_landmark_store
+from project.Storage import graph_signature
+from array import array
 import heapq
-from typing import Dict, List, Tuple, Optional
+import json
+import threading
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple, Optional
+
+
+class LandmarkTables(NamedTuple):
+    """
+    一张图上的地标距离表快照：预处理完成后不再修改，
+    更换图或地标时整体替换，正在进行的查询继续使用旧快照
+    
+    distances 按地标存放（地标 -> 距离表），用于保存/加载；
+    matrix 是查询用的按节点存放的 (V, k) 稠密矩阵：CSR图为按节点ID排列的一维 array，
+    节点 v 的一行是 matrix[v * k:(v + 1) * k]；邻接表字典为 节点 -> 长度为 k 的元组
+    CSR图的 distances 是 matrix 按列的视图，不另占内存
+    矩阵只改变数据的存放方式：查询时每个节点的下界仍由 _heuristic 在Python中逐个地标计算
+    
+    step 不为 None 时 matrix 是从量化文件加载的整数编码（见 project.LandmarkStore），
+    距离约为 编码 * step，此时没有 distances
+    """
+    graph: Any
+    landmarks: List[str]
+    distances: Dict[str, Any]
+    matrix: Any = None
+    step: Optional[float] = None
+
+
+def build_landmark_matrix(
+    graph: Dict[str, List[Tuple[str, float]]],
+    landmarks: List[str],
+    distances: Dict[str, Any]
+):
+    """把按地标存放的距离表转成按节点存放的 (V, k) 矩阵（格式见 LandmarkTables）"""
+    columns = [distances[landmark] for landmark in landmarks]
+    if isinstance(graph, CSRGraph):
+        matrix = array('d', [0.0]) * (graph.num_nodes * len(columns))
+        for j, column in enumerate(columns):
+            matrix[j::len(columns)] = array('d', column)
+        return matrix
+    
+    inf = float('inf')
+    return {node: tuple(column.get(node, inf) for column in columns) for node in graph}
 
 
 class AltShortestPath(ShortestPathInterface):
-    """ALT算法实现类"""
+    """
+    ALT算法实现类
     
-    def __init__(self):
+    每次查询只用少数几个“活跃”地标计算启发值：查询开始时选出对 start -> end 下界最大的
+    active_landmarks 个，之后每隔 recheck_interval 个出队节点检查一次，
+    如果某个未启用的地标在当前节点给出更紧的下界，就把它加入活跃地标并重建优先队列
+    （启发值只增不减，仍然一致）。这样可以预处理 16~32 个地标，
+    而每次松弛的开销与 2~4 个地标相当
+    """
+    
+    def __init__(self, active_landmarks: Optional[int] = 4, recheck_interval: int = 32):
+        """
+        active_landmarks: 每次查询开始时启用的地标数（至少 1），None 表示总是使用全部地标
+        recheck_interval: 每出队多少个节点重新检查一次活跃地标（至少 1）
+        """
+        if active_landmarks is not None and active_landmarks < 1:
+            raise ValueError(f"active_landmarks must be at least 1 or None, got {active_landmarks}")
+        if recheck_interval < 1:
+            raise ValueError(f"recheck_interval must be at least 1, got {recheck_interval}")
+        self.active_landmarks = active_landmarks
+        self.recheck_interval = recheck_interval
         self.nodes_visited = 0
         self.nodes_expanded = 0
-        self.landmark_distances = {}
+        # 地标表所对应的图和地标列表（预处理一次，后续查询复用）
+        self._tables = LandmarkTables(None, [], {}, {})
+        # 只用于避免多个线程同时为同一张图重复构建地标表，查询本身不加锁
+        self._build_lock = threading.Lock()
+        # CSR查询复用的 dist/prev/visited 数组，每个并发查询借用一份
+        self._workspaces = WorkspacePool()
+    
+    @property
+    def landmarks(self) -> List[str]:
+        return self._tables.landmarks
+    
+    @property
+    def landmark_distances(self) -> Dict[str, Any]:
+        return self._tables.distances
+    
+    @property
+    def _preprocessed_graph(self):
+        return self._tables.graph
+    
+    def preprocess(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        landmarks: Optional[List[str]] = None
+    ) -> None:
+        """
+        预处理：从每个地标运行一次Dijkstra，保存地标距离表
+        同一张图、同一组地标重复调用时直接复用已有的表
+        """
+        self._tables_for(graph, list(landmarks or []))
+    
+    def _tables_for(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        landmarks: Optional[List[str]]
+    ) -> LandmarkTables:
+        """
+        返回 graph 与 landmarks 对应的地标表快照，没有时构建并替换当前快照
+        landmarks 为 None 表示沿用该图已有的地标（没有则不用地标）
+        """
+        tables = self._tables
+        if tables.graph is graph and (landmarks is None or list(landmarks) == tables.landmarks):
+            return tables
+        
+        with self._build_lock:
+            # 等锁期间其他线程可能已经建好了
+            tables = self._tables
+            if tables.graph is graph and (landmarks is None or list(landmarks) == tables.landmarks):
+                return tables
+            
+            landmarks = list(landmarks or [])
+            distances = {}
+            for landmark in landmarks:
+                distances[landmark] = self._dijkstra_from_landmark(graph, landmark)
+            
+            matrix = build_landmark_matrix(graph, landmarks, distances)
+            if isinstance(graph, CSRGraph):
+                # 各地标的距离数组换成矩阵的列视图，释放原数组
+                columns = memoryview(matrix)
+                distances = {landmark: columns[j::len(landmarks)] for j, landmark in enumerate(landmarks)}
+            
+            tables = LandmarkTables(graph, landmarks, distances, matrix)
+            self._tables = tables
+            return tables
+    
+    def has_landmark_tables(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        landmarks: Optional[List[str]] = None
+    ) -> bool:
+        """
+        判断是否已经为该图（及该组地标）建好了地标距离表
+        """
+        tables = self._tables
+        if tables.graph is not graph:
+            return False
+        return landmarks is None or list(landmarks) == tables.landmarks
+    
+    def save_landmarks(self, filepath: str):
+        """
+        将地标距离表保存为JSON文件（不可达的节点不写入）
+        """
+        graph, landmarks, landmark_distances, _, step = self._tables
+        if graph is None:
+            raise ValueError("No landmark tables to save, call preprocess() first")
+        if step is not None:
+            raise ValueError("Quantized landmark tables can only be saved with save_landmark_store()")
+        
+        distances = {}
+        for landmark in landmarks:
+            table = landmark_distances[landmark]
+            # CSR图的地标表按节点ID存放
+            items = zip(graph.node_names, table) if isinstance(graph, CSRGraph) else table.items()
+            distances[landmark] = {node: d for node, d in items if d != float('inf')}
+        
+        data = {
+            'num_nodes': len(graph),
+            'node_names': list(graph),
+            'signature': graph_signature(graph),
+            'landmarks': landmarks,
+            'distances': distances
+        }
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+    
+    def load_landmarks(
+        self,
+        filepath: str,
+        graph: Dict[str, List[Tuple[str, float]]]
+    ):
+        """
+        从JSON文件加载地标距离表，并绑定到指定的图
+        节点或边权与保存时的图不同（包括没有记录图摘要的旧文件）时抛出 ValueError，
+        因为其他图上的地标距离不能保证是下界
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        if data['num_nodes'] != len(graph):
+            raise ValueError(
+                f"Landmark file {filepath} was built for a graph with "
+                f"{data['num_nodes']} nodes, got {len(graph)}"
+            )
+        if data.get('node_names') != list(graph) or data.get('signature') != graph_signature(graph):
+            raise ValueError(f"Landmark file {filepath} was built for a different graph")
+        
+        landmarks = data['landmarks']
+        missing = [landmark for landmark in landmarks if landmark not in graph]
+        if missing:
+            raise ValueError(f"Landmarks not found in graph: {missing}")
+        
+        distances = {}
+        for landmark in landmarks:
+            if isinstance(graph, CSRGraph):
+                table = array('d', [float('inf')]) * graph.num_nodes
+                for node, d in data['distances'][landmark].items():
+                    table[graph.node_index[node]] = d
+            else:
+                table = {node: float('inf') for node in graph}
+                table.update(data['distances'][landmark])
+            distances[landmark] = table
+        
+        self._tables = LandmarkTables(graph, landmarks, distances, build_landmark_matrix(graph, landmarks, distances))
+    
+    def save_landmark_store(self, filepath: str, bits: int = 16):
+        """
+        将CSR图上的地标矩阵量化为 bits 位定点整数保存（见 project.LandmarkStore）
+        """
+        graph, landmarks, _, matrix, step = self._tables
+        if not isinstance(graph, CSRGraph):
+            raise ValueError("Landmark stores need landmark tables built on a CSRGraph, call preprocess() first")
+        if step is not None:
+            raise ValueError("Landmark tables are already quantized")
+        save_landmark_store(filepath, graph, landmarks, matrix, bits)
+    
+    def load_landmark_store(
+        self,
+        filepath: str,
+        graph: CSRGraph,
+        use_mmap: bool = True
+    ):
+        """
+        加载量化的地标文件并绑定到指定的CSR图
+        use_mmap=True 时直接映射文件，多个进程共享同一份物理内存
+        """
+        landmarks, matrix, step = load_landmark_store(filepath, graph, use_mmap=use_mmap)
+        self._tables = LandmarkTables(graph, landmarks, {}, matrix, step)
     
     def compute_shortest_path(
         self,
@@ -24,24 +253,50 @@ class AltShortestPath(ShortestPathInterface):
     ) -> Tuple[float, List[str]]:
         """
         使用 ALT 算法计算从 start 到 end 的最短路径
+        
+        如果已经为该图预处理过，直接复用地标距离表；
+        否则按给定地标先做一次预处理
         """
-        # 重置统计信息
-        self.nodes_visited = 0
-        self.nodes_expanded = 0
+        return self._record_result(self.query(graph, start, end, landmarks))
+    
+    def query(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        end: str,
+        landmarks: Optional[List[str]] = None
+    ) -> QueryResult:
+        """
+        可重入的查询：统计信息只保存在局部变量中，地标表取自不可变的快照，
+        多个线程可以共享同一个实例
+        """
+        # 未指定地标时沿用预处理时的地标；没有提供地标时退化为普通Dijkstra
+        snapshot = self._tables_for(graph, landmarks if landmarks is None else list(landmarks))
+        matrix = snapshot.matrix
+        num_landmarks = len(snapshot.landmarks)
         
-        # 如果没有提供地标，退化为普通Dijkstra
-        if not landmarks:
-            landmarks = []
+        if not self._may_reach(graph, start, end):
+            # 不在同一连通分量，不必搜索
+            return QueryResult(float('inf'), [], self._statistics(0, 0, num_landmarks))
         
-        # 预计算：从每个地标到所有节点的最短距离
-        self.landmark_distances = {}
-        for landmark in landmarks:
-            self.landmark_distances[landmark] = self._dijkstra_from_landmark(graph, landmark)
+        if isinstance(graph, CSRGraph):
+            return self._query_csr(graph, start, end, matrix, num_landmarks, snapshot.step)
+        
+        nodes_visited = 0
+        nodes_expanded = 0
+        # 终点那一行每次查询只取一次；不在表中的节点视为所有地标都不可达
+        missing_row = (INF,) * num_landmarks
+        target_row = matrix.get(end, missing_row)
+        active = self._initial_landmarks(matrix.get(start, missing_row), 0, target_row)
+        can_grow = len(active) < num_landmarks
+        added = 0
         
         # A*搜索
-        dist = {node: float('inf') for node in graph}
-        dist[start] = 0
-        prev = {node: None for node in graph}
+        # 距离/前驱只记录搜索到的节点，初始化不随图的规模增长
+        dist = {start: 0}
+        prev = {start: None}
+        # 每个节点的启发值只算一次（活跃地标变化时清空）
+        h_cache = {}
         
         # 优先队列：(f值, g值, 节点)，其中f = g + h
         pq = [(0, 0, start)]
@@ -55,30 +310,180 @@ class AltShortestPath(ShortestPathInterface):
                 continue
             
             visited.add(current_node)
-            self.nodes_visited += 1
+            nodes_visited += 1
             
             # 如果到达终点，重建路径
             if current_node == end:
                 path = self._reconstruct_path(prev, start, end)
-                return current_dist, path
+                return QueryResult(current_dist, path, self._statistics(nodes_visited, nodes_expanded, len(active), added))
+            
+            if can_grow and nodes_visited % self.recheck_interval == 0:
+                grown = self._grow_landmarks(matrix.get(current_node, missing_row), 0, target_row, active)
+                if grown is not None:
+                    # 启发值变了：清空缓存，用新的启发值重建队列
+                    active = grown
+                    added += 1
+                    can_grow = len(active) < num_landmarks
+                    h_cache = {}
+                    frontier = {v for _, _, v in pq if v not in visited}
+                    pq = []
+                    for v in frontier:
+                        h_val = h_cache[v] = self._heuristic(matrix.get(v, missing_row), 0, active)
+                        pq.append((dist[v] + h_val, dist[v], v))
+                    heapq.heapify(pq)
             
             # 扩展邻居节点
-            self.nodes_expanded += 1
+            nodes_expanded += 1
             for neighbor, weight in graph[current_node]:
                 new_dist = current_dist + weight
                 
-                if new_dist < dist[neighbor]:
+                if new_dist < dist.get(neighbor, INF):
                     dist[neighbor] = new_dist
                     prev[neighbor] = current_node
                     
                     # 计算启发式函数h(neighbor)
-                    h_val = self._heuristic(neighbor, end, landmarks)
+                    h_val = h_cache.get(neighbor)
+                    if h_val is None:
+                        h_val = h_cache[neighbor] = self._heuristic(matrix.get(neighbor, missing_row), 0, active)
                     f_val = new_dist + h_val
                     
                     heapq.heappush(pq, (f_val, new_dist, neighbor))
         
         # 没有找到路径
-        return float('inf'), []
+        return QueryResult(float('inf'), [], self._statistics(nodes_visited, nodes_expanded, len(active), added))
+    
+    def _query_csr(
+        self,
+        graph: CSRGraph,
+        start: str,
+        end: str,
+        matrix: Sequence,
+        k: int,
+        step: Optional[float] = None
+    ) -> QueryResult:
+        """
+        CSR图上的ALT：节点用整数ID，地标距离为按节点存放的 (V, k) 矩阵，
+        距离/前驱/启发值缓存使用工作区中预分配的数组
+        step 不为 None 时矩阵为量化编码；量化启发值不一致，已出队的节点找到更短距离时重新打开
+        """
+        if step is None:
+            heuristic = self._heuristic
+        else:
+            def heuristic(row, offset, active):
+                return self._quantized_heuristic(row, offset, active, step)
+        
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        source = graph.node_index[start]
+        target = graph.node_index[end]
+        nodes_visited = 0
+        nodes_expanded = 0
+        
+        target_row = tuple(matrix[target * k:(target + 1) * k])
+        active = self._initial_landmarks(matrix, source * k, target_row)
+        can_grow = len(active) < k
+        added = 0
+        
+        with self._workspaces.borrow(graph.num_nodes) as workspace:
+            dist, prev, visited = workspace.dist, workspace.prev, workspace.visited
+            h_cache = workspace.h_cache
+            touched = workspace.touched
+            dist[source] = 0
+            touched.append(source)
+            
+            pq = [(0, 0, source)]
+            
+            while pq:
+                f_val, current_dist, u = heapq.heappop(pq)
+                
+                if visited[u]:
+                    continue
+                
+                visited[u] = 1
+                nodes_visited += 1
+                
+                if u == target:
+                    path = graph.reconstruct_path(prev, source, target)
+                    return QueryResult(current_dist, path, self._statistics(nodes_visited, nodes_expanded, len(active), added))
+                
+                if can_grow and nodes_visited % self.recheck_interval == 0:
+                    grown = self._grow_landmarks(matrix, u * k, target_row, active)
+                    if grown is not None:
+                        # 启发值变了：作废缓存，用新的启发值重建队列
+                        active = grown
+                        added += 1
+                        can_grow = len(active) < k
+                        for v in touched:
+                            h_cache[v] = -1.0
+                        frontier = {v for _, _, v in pq if not visited[v]}
+                        pq = []
+                        for v in frontier:
+                            h_val = h_cache[v] = heuristic(matrix, v * k, active)
+                            pq.append((dist[v] + h_val, dist[v], v))
+                        heapq.heapify(pq)
+                
+                nodes_expanded += 1
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = targets[i]
+                    new_dist = current_dist + weights[i]
+                    
+                    if new_dist < dist[v]:
+                        if dist[v] == INF:
+                            touched.append(v)
+                        elif visited[v]:
+                            # 只有量化启发值（不一致）才会走到这里：重新打开已出队的节点
+                            visited[v] = 0
+                        dist[v] = new_dist
+                        prev[v] = u
+                        # 启发值缓存初始为 -1，每个节点只算一次
+                        h_val = h_cache[v]
+                        if h_val < 0:
+                            h_val = h_cache[v] = heuristic(matrix, v * k, active)
+                        heapq.heappush(pq, (new_dist + h_val, new_dist, v))
+            
+            return QueryResult(float('inf'), [], self._statistics(nodes_visited, nodes_expanded, len(active), added))
+    
+    def _initial_landmarks(
+        self,
+        row: Sequence[float],
+        offset: int,
+        target_row: Sequence[float]
+    ) -> List[Tuple[int, float]]:
+        """
+        查询开始时的活跃地标：对 start -> end 下界最大的 active_landmarks 个
+        返回 [(地标在矩阵中的列号, 该地标到终点的距离)]
+        """
+        bounds = self._landmark_bounds(row, offset, target_row)
+        columns = sorted(range(len(target_row)), key=lambda j: -bounds[j])
+        if self.active_landmarks is not None:
+            columns = columns[:self.active_landmarks]
+        return [(j, target_row[j]) for j in columns]
+    
+    def _grow_landmarks(
+        self,
+        row: Sequence[float],
+        offset: int,
+        target_row: Sequence[float],
+        active: List[Tuple[int, float]]
+    ) -> Optional[List[Tuple[int, float]]]:
+        """
+        在当前节点重新比较所有地标的下界：最好的地标未启用且比活跃地标都紧时，
+        返回加入它之后的活跃地标；否则返回 None
+        （只加不换：去掉地标会让已经出队的区域重新变得“有希望”，增加扩展的节点）
+        """
+        bounds = self._landmark_bounds(row, offset, target_row)
+        best = max(range(len(bounds)), key=lambda j: bounds[j])
+        active_columns = [j for j, _ in active]
+        if best in active_columns or bounds[best] <= max(bounds[j] for j in active_columns):
+            return None
+        return active + [(best, target_row[best])]
+    
+    def _landmark_bounds(self, row: Sequence[float], offset: int, target_row: Sequence[float]) -> List[float]:
+        """每个地标单独给出的下界 |d_L(t) - d_L(v)|（两者都不可达时为 0）"""
+        bounds = []
+        for j, dist_target in enumerate(target_row):
+            h = abs(dist_target - row[offset + j])
+            bounds.append(h if h == h else 0)
+        return bounds
     
     def _dijkstra_from_landmark(
         self,
@@ -87,7 +492,11 @@ class AltShortestPath(ShortestPathInterface):
     ) -> Dict[str, float]:
         """
         从单个地标节点运行Dijkstra算法，计算到所有节点的最短距离
+        CSR图返回按节点ID索引的数组
         """
+        if isinstance(graph, CSRGraph):
+            return self._dijkstra_from_landmark_csr(graph, landmark)
+        
         dist = {node: float('inf') for node in graph}
         dist[landmark] = 0
         pq = [(0, landmark)]
@@ -106,30 +515,68 @@ class AltShortestPath(ShortestPathInterface):
         
         return dist
     
-    def _heuristic(
-        self,
-        node: str,
-        target: str,
-        landmarks: List[str]
-    ) -> float:
+    def _dijkstra_from_landmark_csr(self, graph: CSRGraph, landmark: str) -> array:
         """
-        计算启发式函数 h(node)
-
+        CSR图上从地标出发的Dijkstra
         """
-        if not landmarks:
-            return 0
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        source = graph.node_index[landmark]
         
+        dist = array('d', [float('inf')]) * graph.num_nodes
+        dist[source] = 0
+        pq = [(0, source)]
+        
+        while pq:
+            current_dist, u = heapq.heappop(pq)
+            
+            if current_dist > dist[u]:
+                continue
+            
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                distance = current_dist + weights[i]
+                if distance < dist[v]:
+                    dist[v] = distance
+                    heapq.heappush(pq, (distance, v))
+        
+        return dist
+    
+    def _heuristic(self, row: Sequence[float], offset: int, active: List[Tuple[int, float]]) -> float:
+        """
+        启发式函数 h(v) = max_L |d_L(t) - d_L(v)|，只在活跃地标上取最大值：
+        row[offset + j] 为节点 v 到第 j 个地标的距离，active 为 [(j, d_j(t))]
+        每次调用是 O(活跃地标数) 的Python循环，查询中每个节点最多调用一次（结果缓存）
+        """
         max_h = 0
-        for landmark in landmarks:
-            if landmark in self.landmark_distances:
-                dist_to_landmark = self.landmark_distances[landmark]
-                # 三角不等式下界
-                h = abs(dist_to_landmark.get(target, float('inf')) - 
-                       dist_to_landmark.get(node, float('inf')))
-                max_h = max(max_h, h)
+        for j, dist_target in active:
+            # 三角不等式下界（两者都不可达时为 nan，比较结果为假，自动忽略）
+            h = abs(dist_target - row[offset + j])
+            if h > max_h:
+                max_h = h
         
         return max_h
     
+    def _quantized_heuristic(
+        self,
+        row: Sequence[int],
+        offset: int,
+        active: List[Tuple[int, int]],
+        step: float
+    ) -> float:
+        """
+        量化编码上的启发值 (max_L |c_L(t) - c_L(v)| - 1) * step，不小于 0
+        向下取整后编码之差最多比真实值多 1，减去 1 后仍是下界；
+        不可达编码比任何有限编码都大，效果与无穷大相同
+        这个下界可采纳但不一致（沿一条边最多差一个 step），所以 _query_csr 会重新打开节点
+        """
+        max_code = 1
+        for j, code_target in active:
+            code = abs(code_target - row[offset + j])
+            if code > max_code:
+                max_code = code
+        
+        return (max_code - 1) * step
+    
     def _reconstruct_path(
         self,
         prev: Dict[str, Optional[str]],
@@ -138,7 +585,7 @@ class AltShortestPath(ShortestPathInterface):
     ) -> List[str]:
         """
         从前驱字典重建路径
-   
+        
         """
         path = []
         current = end
@@ -158,10 +605,21 @@ class AltShortestPath(ShortestPathInterface):
         """返回算法名称"""
         return "ALT (A* with Landmarks)"
     
-    def get_statistics(self) -> Dict[str, int]:
-        """返回算法统计信息"""
+    def _statistics(
+        self,
+        nodes_visited: int,
+        nodes_expanded: int,
+        landmarks_used: int,
+        landmarks_added: int = 0
+    ) -> Dict[str, int]:
+        """生成一次查询的统计信息（landmarks_used 为查询结束时的活跃地标数，landmarks_added 为查询中途加入的个数）"""
         return {
-            'nodes_visited': self.nodes_visited,
-            'nodes_expanded': self.nodes_expanded,
-            'landmarks_used': len(self.landmark_distances)
+            'nodes_visited': nodes_visited,
+            'nodes_expanded': nodes_expanded,
+            'landmarks_used': landmarks_used,
+            'landmarks_added': landmarks_added
         }
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """返回算法统计信息"""
+        return self._statistics(self.nodes_visited, self.nodes_expanded, len(self.landmarks))
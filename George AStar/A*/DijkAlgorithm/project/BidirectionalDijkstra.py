@@ -0,0 +1,163 @@
+"""
+BidirectionalDijkstra.py - 双向Dijkstra最短路径算法实现
+从起点正向、从终点沿反向图同时搜索，两侧相遇后停止
+"""
+
+from project.Interface import ShortestPathInterface
+import heapq
+from typing import Dict, List, Tuple, Optional
+
+
+class BidirectionalDijkstraShortestPath(ShortestPathInterface):
+    """双向Dijkstra算法实现类"""
+    
+    def __init__(self):
+        self.nodes_visited = 0
+        self.nodes_expanded = 0
+        self.forward_settled = 0
+        self.backward_settled = 0
+        # 反向图只为当前图构建一次
+        self._reverse_graph = None
+        self._reverse_source = None
+    
+    def preprocess(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        landmarks: Optional[List[str]] = None
+    ) -> None:
+        """
+        预处理：构建反向邻接表（同一张图只构建一次）
+        """
+        if self._reverse_source is graph:
+            return
+        
+        reverse = {node: [] for node in graph}
+        for node, neighbors in graph.items():
+            for neighbor, weight in neighbors:
+                reverse.setdefault(neighbor, []).append((node, weight))
+        
+        self._reverse_graph = reverse
+        self._reverse_source = graph
+    
+    def compute_shortest_path(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        end: str,
+        landmarks: Optional[List[str]] = None
+    ) -> Tuple[float, List[str]]:
+        """
+        使用双向 Dijkstra 计算从 start 到 end 的最短路径
+        
+        终止条件：正向队首距离 + 反向队首距离 >= 当前最优相遇距离
+        """
+        # 重置统计信息
+        self.nodes_visited = 0
+        self.nodes_expanded = 0
+        self.forward_settled = 0
+        self.backward_settled = 0
+        
+        self.preprocess(graph)
+        reverse = self._reverse_graph
+        
+        if start == end:
+            self.nodes_visited = 1
+            return 0, [start]
+        
+        if not self._may_reach(graph, start, end):
+            # 不在同一连通分量，不必搜索
+            return float('inf'), []
+        
+        # 两个方向各自的距离、前驱（反向一侧记录的是通往终点的后继）
+        dist_f = {start: 0}
+        dist_b = {end: 0}
+        prev_f = {start: None}
+        next_b = {end: None}
+        settled_f = set()
+        settled_b = set()
+        pq_f = [(0, start)]
+        pq_b = [(0, end)]
+        
+        best = float('inf')
+        meeting = None
+        
+        while pq_f and pq_b:
+            # 停止条件：不可能再找到更短的相遇路径
+            if pq_f[0][0] + pq_b[0][0] >= best:
+                break
+            
+            # 每次扩展队首距离较小的一侧
+            if pq_f[0][0] <= pq_b[0][0]:
+                current_dist, current_node = heapq.heappop(pq_f)
+                if current_node in settled_f:
+                    continue
+                settled_f.add(current_node)
+                self.forward_settled += 1
+                adjacency, dist, pred, other_dist, pq = graph, dist_f, prev_f, dist_b, pq_f
+            else:
+                current_dist, current_node = heapq.heappop(pq_b)
+                if current_node in settled_b:
+                    continue
+                settled_b.add(current_node)
+                self.backward_settled += 1
+                adjacency, dist, pred, other_dist, pq = reverse, dist_b, next_b, dist_f, pq_b
+            
+            self.nodes_visited += 1
+            self.nodes_expanded += 1
+            
+            for neighbor, weight in adjacency[current_node]:
+                distance = current_dist + weight
+                
+                if distance < dist.get(neighbor, float('inf')):
+                    dist[neighbor] = distance
+                    pred[neighbor] = current_node
+                    heapq.heappush(pq, (distance, neighbor))
+                    
+                    # 邻居已被另一侧到达：更新最优相遇点
+                    if neighbor in other_dist:
+                        total = distance + other_dist[neighbor]
+                        if total < best:
+                            best = total
+                            meeting = neighbor
+        
+        if meeting is None:
+            # 没有找到路径
+            return float('inf'), []
+        
+        return best, self._reconstruct_path(prev_f, next_b, meeting)
+    
+    def _reconstruct_path(
+        self,
+        prev_f: Dict[str, Optional[str]],
+        next_b: Dict[str, Optional[str]],
+        meeting: str
+    ) -> List[str]:
+        """
+        拼接路径：起点 -> 相遇点（正向前驱）+ 相遇点 -> 终点（反向后继）
+        """
+        path = []
+        current = meeting
+        while current is not None:
+            path.append(current)
+            current = prev_f[current]
+        path.reverse()
+        
+        current = next_b[meeting]
+        while current is not None:
+            path.append(current)
+            current = next_b[current]
+        
+        return path
+    
+    def get_algorithm_name(self) -> str:
+        """返回算法名称"""
+        return "Bidirectional Dijkstra"
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """返回算法统计信息"""
+        return {
+            'nodes_visited': self.nodes_visited,
+            'nodes_expanded': self.nodes_expanded,
+            'forward_settled': self.forward_settled,
+            'backward_settled': self.backward_settled
+        }
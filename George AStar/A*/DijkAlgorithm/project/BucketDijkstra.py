@@ -0,0 +1,274 @@
+"""
+BucketDijkstra.py - 整数优先队列版 Dijkstra
+
+边权为小整数（如全部为1）或两位小数的定点数（gen_metro_graphs 生成的
+travel_time_min）时，把权重换算成整数，用单调整数队列代替 heapq：
+- DialQueue：环形桶队列，适合最大权重很小的图
+- RadixHeap：基数堆，适合放大100倍后的定点权重
+其他权重回退到 heapq
+"""
+
+from project.Interface import ShortestPathInterface
+from project.CSRGraph import CSRGraph
+from array import array
+import heapq
+from typing import Dict, List, Tuple, Optional, Sequence
+
+# 依次尝试的定点放大倍数：1 为整数权重，100 为两位小数
+FIXED_POINT_SCALES = (1, 100)
+# 最大整数权重不超过该值时使用 Dial 桶队列
+DIAL_MAX_WEIGHT = 64
+
+
+class DialQueue:
+    """
+    Dial 桶队列：键为非负整数且单调不减，队列中的键总落在 [当前最小值, 当前最小值 + C] 内，
+    所以 C + 1 个环形桶即可，push / pop 均摊 O(1)
+    """
+    
+    def __init__(self, max_weight: int):
+        self.num_buckets = max_weight + 1
+        self.buckets = [[] for _ in range(self.num_buckets)]
+        self.current = 0
+        self.size = 0
+    
+    def push(self, key: int, item: int):
+        self.buckets[key % self.num_buckets].append(item)
+        self.size += 1
+    
+    def pop(self) -> Tuple[int, int]:
+        while not self.buckets[self.current % self.num_buckets]:
+            self.current += 1
+        self.size -= 1
+        return self.current, self.buckets[self.current % self.num_buckets].pop()
+    
+    def __len__(self) -> int:
+        return self.size
+
+
+class RadixHeap:
+    """
+    基数堆：按键与上次弹出值异或后的最高位分桶
+    弹出时只需把第一个非空桶重新分配到更低的桶，每个元素最多被移动 O(log C) 次
+    """
+    
+    def __init__(self):
+        # 键为非负整数，64位足够覆盖所有整数距离
+        self.buckets = [[] for _ in range(65)]
+        self.last = 0
+        self.size = 0
+    
+    def push(self, key: int, item: int):
+        self.buckets[(key ^ self.last).bit_length()].append((key, item))
+        self.size += 1
+    
+    def pop(self) -> Tuple[int, int]:
+        buckets = self.buckets
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            bucket = buckets[i]
+            buckets[i] = []
+            last = self.last = min(bucket)[0]
+            for entry in bucket:
+                buckets[(entry[0] ^ last).bit_length()].append(entry)
+        self.size -= 1
+        return buckets[0].pop()
+    
+    def __len__(self) -> int:
+        return self.size
+
+
+class BinaryHeapQueue:
+    """heapq 包装成与整数队列相同的接口（浮点权重时使用）"""
+    
+    def __init__(self):
+        self.heap = []
+    
+    def push(self, key: float, item: int):
+        heapq.heappush(self.heap, (key, item))
+    
+    def pop(self) -> Tuple[float, int]:
+        return heapq.heappop(self.heap)
+    
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+def integer_weights(weights: Sequence[float]) -> Tuple[Optional[int], Optional[array]]:
+    """
+    尝试把权重换算成非负整数
+    返回 (放大倍数, 整数权重数组)；无法精确换算时返回 (None, None)
+    """
+    for scale in FIXED_POINT_SCALES:
+        scaled = array('q')
+        for w in weights:
+            r = round(w * scale)
+            if r < 0 or abs(w * scale - r) > 1e-6:
+                break
+            scaled.append(r)
+        else:
+            return scale, scaled
+    return None, None
+
+
+class BucketDijkstraShortestPath(ShortestPathInterface):
+    """整数优先队列 Dijkstra 实现类"""
+    
+    QUEUES = ('auto', 'dial', 'radix', 'heap')
+    
+    def __init__(self, queue: str = 'auto'):
+        """
+        queue: 'auto' 按权重自动选择，或强制使用 'dial' / 'radix' / 'heap'
+        """
+        if queue not in self.QUEUES:
+            raise ValueError(f"Unknown queue type: {queue}")
+        self.queue = queue
+        self.queue_type = None
+        self.scale = None
+        self.nodes_visited = 0
+        self.nodes_expanded = 0
+        self._csr = None
+        self._int_weights = None
+        self._max_weight = 0
+        self._preprocessed_graph = None
+    
+    def preprocess(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        landmarks: Optional[List[str]] = None
+    ) -> None:
+        """
+        预处理：转换为CSR并检查权重能否换算为整数，据此选择队列（同一张图只做一次）
+        """
+        if self._preprocessed_graph is graph:
+            return
+        
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adjacency(graph)
+        scale, int_weights = integer_weights(csr.weights)
+        
+        queue = self.queue
+        if queue == 'auto':
+            if scale is None:
+                queue = 'heap'
+            elif scale == 1 and max(int_weights, default=0) <= DIAL_MAX_WEIGHT:
+                queue = 'dial'
+            else:
+                queue = 'radix'
+        elif queue != 'heap' and scale is None:
+            raise ValueError(f"Queue '{queue}' requires integer or fixed-point weights")
+        
+        self._csr = csr
+        self.queue_type = queue
+        self.scale = scale if queue != 'heap' else None
+        self._int_weights = int_weights if queue != 'heap' else csr.weights
+        self._max_weight = max(int_weights, default=0) if queue == 'dial' else 0
+        self._preprocessed_graph = graph
+    
+    def _make_queue(self):
+        """创建一个空的优先队列"""
+        if self.queue_type == 'dial':
+            return DialQueue(self._max_weight)
+        if self.queue_type == 'radix':
+            return RadixHeap()
+        return BinaryHeapQueue()
+    
+    def compute_shortest_path(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        end: str,
+        landmarks: Optional[List[str]] = None
+    ) -> Tuple[float, List[str]]:
+        """
+        使用整数队列计算从 start 到 end 的最短路径
+        
+        队列键为整数距离；找到终点后沿路径按原始浮点权重累加出距离，与 DijkstraShortestPath 一致
+        """
+        # 重置统计信息
+        self.nodes_visited = 0
+        self.nodes_expanded = 0
+        
+        self.preprocess(graph)
+        csr = self._csr
+        offsets, targets = csr.offsets, csr.targets
+        keys_weights = self._int_weights
+        
+        if start not in csr or end not in csr:
+            # 图中没有的站点不可达，与 DijkstraShortestPath 一致
+            return float('inf'), []
+        if not self._may_reach(csr, start, end):
+            # 不在同一连通分量，不必搜索
+            return float('inf'), []
+        source = csr.node_index[start]
+        target = csr.node_index[end]
+        
+        # key 为整数距离（浮点回退时即为浮点距离）
+        key = [float('inf')] * csr.num_nodes
+        prev = [-1] * csr.num_nodes
+        visited = bytearray(csr.num_nodes)
+        key[source] = 0
+        
+        queue = self._make_queue()
+        queue.push(0, source)
+        
+        while queue:
+            current_key, u = queue.pop()
+            
+            if visited[u]:
+                continue
+            
+            visited[u] = 1
+            self.nodes_visited += 1
+            
+            if u == target:
+                return self._path_length(key, prev, target), csr.reconstruct_path(prev, source, target)
+            
+            self.nodes_expanded += 1
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                new_key = current_key + keys_weights[i]
+                
+                if new_key < key[v]:
+                    key[v] = new_key
+                    prev[v] = u
+                    queue.push(new_key, v)
+        
+        # 没有找到路径
+        return float('inf'), []
+    
+    def _path_length(self, key: List[int], prev: List[int], target: int) -> float:
+        """
+        从起点开始按原始浮点权重依次累加路径长度
+        """
+        offsets, targets, weights = self._csr.offsets, self._csr.targets, self._csr.weights
+        keys_weights = self._int_weights
+        
+        nodes = []
+        current = target
+        while current != -1:
+            nodes.append(current)
+            current = prev[current]
+        nodes.reverse()
+        
+        length = 0
+        for u, v in zip(nodes, nodes[1:]):
+            # 平行边中取整数权重与前驱关系吻合的那条
+            for i in range(offsets[u], offsets[u + 1]):
+                if targets[i] == v and key[u] + keys_weights[i] == key[v]:
+                    length += weights[i]
+                    break
+        return length
+    
+    def get_algorithm_name(self) -> str:
+        """返回算法名称"""
+        return "Bucket Dijkstra"
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """返回算法统计信息"""
+        return {
+            'nodes_visited': self.nodes_visited,
+            'nodes_expanded': self.nodes_expanded,
+            'queue': self.queue_type
+        }
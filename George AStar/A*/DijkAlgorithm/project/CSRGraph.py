@@ -0,0 +1,202 @@
+"""
+CSRGraph.py - 压缩稀疏行（CSR）图表示
+
+节点名映射为连续整数ID，邻接表存放在 offsets / targets / weights 三个紧凑数组中
+"""
+
+from array import array
+from collections.abc import Mapping
+from typing import Dict, List, Tuple, Iterator, Optional, Sequence
+
+from project.Components import ComponentIndex
+
+
+class CSRGraph(Mapping):
+    """
+    只读的CSR图
+    
+    节点 i 的出边为 targets[offsets[i]:offsets[i + 1]]，权重位于 weights 的同一区间
+    同时实现只读 Mapping 接口（graph[name] -> [(neighbor, weight), ...]），
+    所以也能传给只认识邻接表字典的代码
+    """
+    
+    __slots__ = ('node_names', 'node_index', 'offsets', 'targets', 'weights', '_components')
+    
+    def __init__(
+        self,
+        node_names: Sequence[str],
+        offsets: Sequence[int],
+        targets: Sequence[int],
+        weights: Sequence[float],
+        component_labels: Optional[Sequence[int]] = None
+    ):
+        """
+        初始化CSR图（一般通过 from_adjacency 构建）
+        component_labels: 预先算好的每个节点的连通分量编号（如从缓存文件读出），可省略
+        """
+        if len(offsets) != len(node_names) + 1:
+            raise ValueError("offsets must have exactly one more entry than node_names")
+        if len(targets) != len(weights) or offsets[-1] != len(targets):
+            raise ValueError("targets/weights do not match offsets")
+        
+        # ID -> 节点名 与 节点名 -> ID 的双向映射
+        object.__setattr__(self, 'node_names', tuple(node_names))
+        object.__setattr__(self, 'node_index', {name: i for i, name in enumerate(self.node_names)})
+        object.__setattr__(self, 'offsets', offsets)
+        object.__setattr__(self, 'targets', targets)
+        object.__setattr__(self, 'weights', weights)
+        object.__setattr__(
+            self, '_components',
+            ComponentIndex(self.node_index, component_labels) if component_labels is not None else None
+        )
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("CSRGraph is immutable")
+    
+    @classmethod
+    def from_adjacency(
+        cls,
+        graph: Dict[str, List[Tuple[str, float]]]
+    ) -> 'CSRGraph':
+        """
+        从邻接表字典构建CSR图（保持节点顺序和每个节点的邻居顺序）
+        """
+        node_names = list(graph.keys())
+        node_index = {name: i for i, name in enumerate(node_names)}
+        
+        # 只出现在边里的节点也要分配ID
+        for neighbors in graph.values():
+            for neighbor, _ in neighbors:
+                if neighbor not in node_index:
+                    node_index[neighbor] = len(node_names)
+                    node_names.append(neighbor)
+        
+        offsets = array('i', [0])
+        targets = array('i')
+        weights = array('d')
+        for name in node_names:
+            for neighbor, weight in graph.get(name, ()):
+                targets.append(node_index[neighbor])
+                weights.append(weight)
+            offsets.append(len(targets))
+        
+        return cls(node_names, offsets, targets, weights)
+    
+    def permute(self, order: Sequence[int]) -> 'CSRGraph':
+        """
+        按新顺序重新编号节点：order[新ID] = 旧ID
+        节点名不变（node_index 指向新ID），边数组按新顺序重排，每个节点的邻居顺序保持不变；
+        已经算好的连通分量标签随节点一起重排
+        """
+        if sorted(order) != list(range(self.num_nodes)):
+            raise ValueError("order must be a permutation of the node IDs")
+        
+        new_id = array('i', [0]) * len(order)
+        for new, old in enumerate(order):
+            new_id[old] = new
+        
+        offsets = array('i', [0])
+        targets = array('i')
+        weights = array('d')
+        for old in order:
+            lo, hi = self.offsets[old], self.offsets[old + 1]
+            targets.extend(new_id[v] for v in self.targets[lo:hi])
+            weights.extend(self.weights[lo:hi])
+            offsets.append(len(targets))
+        
+        labels = None
+        if self._components is not None:
+            old_labels = self._components.labels
+            labels = array('i', (old_labels[old] for old in order))
+        
+        return CSRGraph([self.node_names[old] for old in order], offsets, targets, weights, labels)
+    
+    @property
+    def num_nodes(self) -> int:
+        """节点数"""
+        return len(self.node_names)
+    
+    @property
+    def num_edges(self) -> int:
+        """有向边数（双向边计两次）"""
+        return len(self.targets)
+    
+    @property
+    def components(self) -> ComponentIndex:
+        """连通分量索引：构造时给出了标签就直接使用，否则第一次访问时计算并保存"""
+        if self._components is None:
+            object.__setattr__(self, '_components', ComponentIndex.from_csr(self.node_index, self.offsets, self.targets))
+        return self._components
+    
+    def id_of(self, name: str) -> int:
+        """节点名 -> 整数ID"""
+        return self.node_index[name]
+    
+    def name_of(self, node_id: int) -> str:
+        """整数ID -> 节点名"""
+        return self.node_names[node_id]
+    
+    def neighbor_ids(self, node_id: int) -> List[Tuple[int, float]]:
+        """返回节点的 (邻居ID, 权重) 列表"""
+        lo, hi = self.offsets[node_id], self.offsets[node_id + 1]
+        return list(zip(self.targets[lo:hi], self.weights[lo:hi]))
+    
+    def reconstruct_path(
+        self,
+        prev: Sequence[int],
+        source: int,
+        target: int
+    ) -> List[str]:
+        """
+        从前驱ID数组（-1 表示无前驱）重建 source -> target 的路径，返回节点名列表
+        """
+        path = []
+        current = target
+        
+        while current != -1:
+            path.append(self.node_names[current])
+            current = prev[current]
+        
+        path.reverse()
+        
+        if path and path[0] == self.node_names[source]:
+            return path
+        else:
+            return []
+    
+    def to_adjacency(self) -> Dict[str, List[Tuple[str, float]]]:
+        """转换回邻接表字典"""
+        names = self.node_names
+        offsets = self.offsets
+        edges = list(zip([names[v] for v in self.targets], self.weights))
+        return {name: edges[offsets[i]:offsets[i + 1]] for i, name in enumerate(names)}
+    
+    def memory_bytes(self) -> int:
+        """三个CSR数组占用的字节数（不含节点名映射）"""
+        total = 0
+        for arr in (self.offsets, self.targets, self.weights):
+            if isinstance(arr, array):
+                total += arr.itemsize * len(arr)
+            else:
+                total += memoryview(arr).nbytes
+        return total
+    
+    # ---- Mapping 接口 ----
+    
+    def __getitem__(self, name: str) -> List[Tuple[str, float]]:
+        node_id = self.node_index[name]
+        lo, hi = self.offsets[node_id], self.offsets[node_id + 1]
+        names = self.node_names
+        return [(names[v], w) for v, w in zip(self.targets[lo:hi], self.weights[lo:hi])]
+    
+    def __contains__(self, name) -> bool:
+        return name in self.node_index
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.node_names)
+    
+    def __len__(self) -> int:
+        return len(self.node_names)
+    
+    def __repr__(self) -> str:
+        return f"CSRGraph(nodes={self.num_nodes}, edges={self.num_edges})"
@@ -0,0 +1,293 @@
+"""
+ChainContraction.py - 度为2的链收缩
+
+地铁图大部分是换乘站之间一串度为2的普通站。预处理把每条这样的链收缩成
+两个端点（hub）之间的一条带权捷径，并保留链内部的站点序列用于展开路径；
+收缩后的核心图只剩换乘站和线路端点，任何算法都可以直接在核心图上运行
+查询的端点在链内部时，分别挂到链的两个端点上，再在核心图中查询
+"""
+
+from project.Interface import ShortestPathInterface, QueryResult
+from project.CSRGraph import CSRGraph
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class Chain(NamedTuple):
+    """
+    一条被收缩的链：nodes 为 端点hub, 内部站..., 端点hub
+    offsets[i] 为 nodes[0] 沿链到 nodes[i] 的距离
+    两端是同一个hub时为一个环
+    """
+    nodes: Tuple[str, ...]
+    offsets: Tuple[float, ...]
+    
+    @property
+    def length(self) -> float:
+        return self.offsets[-1]
+
+
+class ChainContraction:
+    """
+    收缩结果：核心图 + 链表
+    
+    只收缩“对称的度为2”节点：恰好两个不同的邻居，且出边和入边完全相同（双向、同权重），
+    所以链可以双向行走；单向边和度不为2的节点都留在核心图中
+    """
+    
+    def __init__(
+        self,
+        core: Dict[str, List[Tuple[str, float]]],
+        chains: List[Chain],
+        position: Dict[str, Tuple[int, int]],
+        shortcuts: Dict[Tuple[str, str], int]
+    ):
+        """
+        core: 核心图（输入为CSR图时也是CSR图）
+        position: 内部站 -> (链号, 在链中的下标)
+        shortcuts: 由链产生的核心边 (u, v) -> 链号（原有的直接边不在其中）
+        """
+        self.core = core
+        self.chains = chains
+        self.position = position
+        self.shortcuts = shortcuts
+    
+    @property
+    def num_contracted(self) -> int:
+        """被收缩掉的节点数"""
+        return len(self.position)
+    
+    def attachments(self, node: str) -> List[Tuple[str, float, List[str]]]:
+        """
+        node 在核心图上的挂接点：[(hub, node 到 hub 的距离, node -> hub 的路径)]
+        核心节点（或图中没有的节点）挂接到自己
+        """
+        pos = self.position.get(node)
+        if pos is None:
+            return [(node, 0, [node])]
+        chain_id, i = pos
+        nodes, offsets = self.chains[chain_id]
+        return [
+            (nodes[0], offsets[i], list(nodes[i::-1])),
+            (nodes[-1], offsets[-1] - offsets[i], list(nodes[i:]))
+        ]
+    
+    def along_chain(self, start: str, end: str) -> Optional[Tuple[float, List[str]]]:
+        """start 和 end 在同一条链内部时，沿链直接走的 (距离, 路径)；否则 None"""
+        pos_start = self.position.get(start)
+        pos_end = self.position.get(end)
+        if pos_start is None or pos_end is None or pos_start[0] != pos_end[0]:
+            return None
+        nodes, offsets = self.chains[pos_start[0]]
+        i, j = pos_start[1], pos_end[1]
+        if i <= j:
+            return offsets[j] - offsets[i], list(nodes[i:j + 1])
+        return offsets[i] - offsets[j], list(nodes[j:i + 1])[::-1]
+    
+    def expand(self, core_path: List[str]) -> List[str]:
+        """把核心图上的路径展开为原图路径（捷径换回链内部的站点）"""
+        if not core_path:
+            return []
+        path = [core_path[0]]
+        for u, v in zip(core_path, core_path[1:]):
+            chain_id = self.shortcuts.get((u, v))
+            if chain_id is not None:
+                nodes = self.chains[chain_id].nodes
+                path.extend(nodes[1:-1] if nodes[0] == u else nodes[-2:0:-1])
+            path.append(v)
+        return path
+    
+    def core_landmarks(self, landmarks: Optional[List[str]]) -> Optional[List[str]]:
+        """把落在链内部的地标换成链的第一个端点（去重，保持顺序）"""
+        if landmarks is None:
+            return None
+        mapped = {}
+        for landmark in landmarks:
+            pos = self.position.get(landmark)
+            mapped[landmark if pos is None else self.chains[pos[0]].nodes[0]] = None
+        return list(mapped)
+
+
+def contract_chains(graph: Dict[str, List[Tuple[str, float]]]) -> ChainContraction:
+    """
+    收缩图中所有对称的度为2的链，O(V + E)
+    """
+    # 每对节点只保留最短的一条边
+    out_edges: Dict[str, Dict[str, float]] = {}
+    in_edges: Dict[str, Dict[str, float]] = {}
+    for u, neighbors in graph.items():
+        out_edges.setdefault(u, {})
+        in_edges.setdefault(u, {})
+        for v, w in neighbors:
+            out_edges.setdefault(v, {})
+            in_edges.setdefault(v, {})
+            if w < out_edges[u].get(v, float('inf')):
+                out_edges[u][v] = w
+                in_edges[v][u] = w
+    
+    hubs = {
+        v for v, neighbors in out_edges.items()
+        if len(neighbors) != 2 or v in neighbors or neighbors != in_edges[v]
+    }
+    
+    def walk(prev: str, current: str, origin: str) -> Tuple[List[str], str]:
+        """从 prev 经 current 沿链走到第一个hub（或绕回 origin），返回 (经过的内部站, 终点)"""
+        interior = []
+        while current not in hubs and current != origin:
+            interior.append(current)
+            a, b = out_edges[current]
+            prev, current = current, (b if a == prev else a)
+        return interior, current
+    
+    chains: List[Chain] = []
+    position: Dict[str, Tuple[int, int]] = {}
+    for v in out_edges:
+        if v in hubs or v in position:
+            continue
+        a, b = out_edges[v]
+        left, left_end = walk(v, a, v)
+        if left_end == v:
+            # 整个环都是度为2的节点：把 v 当作hub
+            hubs.add(v)
+            nodes = [v] + left + [v]
+        else:
+            right, right_end = walk(v, b, v)
+            nodes = [left_end] + left[::-1] + [v] + right + [right_end]
+        
+        offsets = [0]
+        for x, y in zip(nodes, nodes[1:]):
+            offsets.append(offsets[-1] + out_edges[x][y])
+        
+        chain_id = len(chains)
+        chains.append(Chain(tuple(nodes), tuple(offsets)))
+        for i in range(1, len(nodes) - 1):
+            position[nodes[i]] = (chain_id, i)
+    
+    # 核心图：hub之间的直接边 + 每条链的捷径（平行边保留较短的）
+    core_edges = {
+        u: {v: w for v, w in out_edges[u].items() if v in hubs}
+        for u in out_edges if u in hubs
+    }
+    shortcuts: Dict[Tuple[str, str], int] = {}
+    for chain_id, chain in enumerate(chains):
+        first, last = chain.nodes[0], chain.nodes[-1]
+        if first == last:
+            continue
+        for u, v in ((first, last), (last, first)):
+            if chain.length < core_edges[u].get(v, float('inf')):
+                core_edges[u][v] = chain.length
+                shortcuts[(u, v)] = chain_id
+    
+    core = {u: list(neighbors.items()) for u, neighbors in core_edges.items()}
+    if isinstance(graph, CSRGraph):
+        core = CSRGraph.from_adjacency(core)
+    
+    return ChainContraction(core, chains, position, shortcuts)
+
+
+class ChainContractedShortestPath(ShortestPathInterface):
+    """
+    在收缩后的核心图上运行任意算法
+    
+    端点在链内部时最多挂接 2 x 2 个 (起点hub, 终点hub) 组合，
+    通过内部算法的 compute_many 一次批量查询（支持多目标的算法只需两次搜索）
+    """
+    
+    def __init__(self, algorithm: ShortestPathInterface):
+        """algorithm: 在核心图上使用的算法实例"""
+        self.algorithm = algorithm
+        self.nodes_visited = 0
+        self.nodes_expanded = 0
+        self._contraction_cache = None
+    
+    def contraction(self, graph: Dict[str, List[Tuple[str, float]]]) -> ChainContraction:
+        """图的收缩结果，每个实例按图缓存一份"""
+        cached = self._contraction_cache
+        if cached is not None and cached[0] is graph:
+            return cached[1]
+        contraction = contract_chains(graph)
+        self._contraction_cache = (graph, contraction)
+        return contraction
+    
+    def preprocess(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        landmarks: Optional[List[str]] = None
+    ) -> None:
+        """收缩图，再让内部算法在核心图上预处理"""
+        contraction = self.contraction(graph)
+        self.algorithm.preprocess(contraction.core, contraction.core_landmarks(landmarks))
+    
+    def query(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        end: str,
+        landmarks: Optional[List[str]] = None
+    ) -> QueryResult:
+        """
+        挂接起点和终点，在核心图上查询所有 hub 组合，取最短的一条并展开
+        """
+        contraction = self.contraction(graph)
+        if start == end:
+            return QueryResult(0, [start], self._statistics(0, 0, contraction))
+        
+        best_dist = float('inf')
+        best_path = []
+        direct = contraction.along_chain(start, end)
+        if direct is not None:
+            best_dist, best_path = direct
+        
+        sources = contraction.attachments(start)
+        targets = contraction.attachments(end)
+        pairs = [(s_hub, t_hub) for s_hub, _, _ in sources for t_hub, _, _ in targets]
+        results = self.algorithm.compute_many(
+            contraction.core, pairs, contraction.core_landmarks(landmarks)
+        )
+        
+        visited = expanded = 0
+        for row, (_, s_dist, s_path) in enumerate(sources):
+            row_results = results[row * len(targets):(row + 1) * len(targets)]
+            # 同一起点hub的多个终点通常由一次多目标搜索得到，统计是累计值，取最大的一个
+            visited += max(result.nodes_visited for result in row_results)
+            expanded += max(result.nodes_expanded for result in row_results)
+            
+            for (_, t_dist, t_path), result in zip(targets, row_results):
+                total = s_dist + result.distance + t_dist
+                if total < best_dist and result.path:
+                    best_dist = total
+                    best_path = s_path[:-1] + contraction.expand(result.path) + t_path[-2::-1]
+        
+        return QueryResult(best_dist, best_path, self._statistics(visited, expanded, contraction))
+    
+    def compute_shortest_path(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        end: str,
+        landmarks: Optional[List[str]] = None
+    ) -> Tuple[float, List[str]]:
+        """
+        计算从 start 到 end 的最短路径（结果路径为原图上的完整路径）
+        """
+        return self._record_result(self.query(graph, start, end, landmarks))
+    
+    def _statistics(self, visited: int, expanded: int, contraction: ChainContraction) -> Dict[str, Any]:
+        """一次查询的统计"""
+        return {
+            'nodes_visited': visited,
+            'nodes_expanded': expanded,
+            'core_nodes': len(contraction.core)
+        }
+    
+    def get_algorithm_name(self) -> str:
+        """返回算法名称"""
+        return f"{self.algorithm.get_algorithm_name()} + Chain Contraction"
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """返回算法统计信息"""
+        cached = self._contraction_cache
+        return {
+            'nodes_visited': self.nodes_visited,
+            'nodes_expanded': self.nodes_expanded,
+            'core_nodes': len(cached[1].core) if cached else 0
+        }
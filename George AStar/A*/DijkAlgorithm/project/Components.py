@@ -0,0 +1,108 @@
+"""
+Components.py - 连通分量索引
+
+用并查集把节点划分为（弱）连通分量：两个节点不在同一分量时一定互不可达，
+查询前 O(1) 判断一次，就不必为了返回 (inf, []) 把起点所在分量整个搜索一遍。
+地铁图的边基本都是双向的，弱连通分量就是连通分量；对单向边它仍是可达性的必要条件
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+
+def component_labels(num_nodes: int, edges: Iterable[Tuple[int, int]]) -> array:
+    """
+    并查集计算每个节点的分量编号（按节点ID第一次出现的分量依次编号为 0, 1, 2, ...）
+    edges 为 (u, v) 整数ID对，方向被忽略
+    """
+    parent = list(range(num_nodes))
+    
+    for u, v in edges:
+        # 路径减半
+        while parent[u] != u:
+            parent[u] = u = parent[parent[u]]
+        while parent[v] != v:
+            parent[v] = v = parent[parent[v]]
+        if u != v:
+            # 较大的根挂到较小的根下
+            if u < v:
+                parent[v] = u
+            else:
+                parent[u] = v
+    
+    labels = array('i', [0]) * num_nodes
+    root_label = {}
+    for node in range(num_nodes):
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        label = root_label.get(root)
+        if label is None:
+            label = root_label[root] = len(root_label)
+        labels[node] = label
+    return labels
+
+
+class ComponentIndex:
+    """
+    节点 -> 分量编号
+    
+    may_reach 只在两个节点确定不在同一分量时返回 False；
+    不认识的节点交给搜索本身处理，返回 True
+    """
+    
+    __slots__ = ('node_index', 'labels', 'num_components')
+    
+    def __init__(self, node_index: Mapping[str, int], labels: Sequence[int]):
+        self.node_index = node_index
+        self.labels = labels
+        self.num_components = max(labels) + 1 if len(labels) else 0
+    
+    @classmethod
+    def from_adjacency(cls, graph: Dict[str, List[Tuple[str, float]]]) -> 'ComponentIndex':
+        """从邻接表字典构建（只出现在边里的节点也会分配编号）"""
+        node_index = {name: i for i, name in enumerate(graph)}
+        edges = []
+        for name, neighbors in graph.items():
+            u = node_index[name]
+            for neighbor, _ in neighbors:
+                v = node_index.get(neighbor)
+                if v is None:
+                    v = node_index[neighbor] = len(node_index)
+                edges.append((u, v))
+        return cls(node_index, component_labels(len(node_index), edges))
+    
+    @classmethod
+    def from_csr(
+        cls,
+        node_index: Mapping[str, int],
+        offsets: Sequence[int],
+        targets: Sequence[int]
+    ) -> 'ComponentIndex':
+        """从CSR数组构建"""
+        num_nodes = len(offsets) - 1
+        edges = (
+            (u, targets[i])
+            for u in range(num_nodes)
+            for i in range(offsets[u], offsets[u + 1])
+        )
+        return cls(node_index, component_labels(num_nodes, edges))
+    
+    def component_of(self, node: str) -> int:
+        """节点所在分量的编号"""
+        return self.labels[self.node_index[node]]
+    
+    def may_reach(self, start: str, end: str) -> bool:
+        """start 是否可能到达 end（不同分量时一定不可达）"""
+        u = self.node_index.get(start)
+        v = self.node_index.get(end)
+        if u is None or v is None:
+            return True
+        return self.labels[u] == self.labels[v]
+    
+    def component_sizes(self) -> List[int]:
+        """各分量的节点数"""
+        sizes = [0] * self.num_components
+        for label in self.labels:
+            sizes[label] += 1
+        return sizes
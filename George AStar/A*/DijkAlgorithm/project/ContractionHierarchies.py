@@ -0,0 +1,523 @@
+"""
+ContractionHierarchies.py - 收缩层次（Contraction Hierarchies）算法实现
+
+预处理：按边差（edge difference）优先级依次收缩节点并添加捷径边
+查询：在上行图中做双向Dijkstra，最后把捷径展开成完整的站点路径
+"""
+
+from project.Interface import ShortestPathInterface, QueryResult
+from project.Storage import save_arrays, load_arrays, graph_signature
+from array import array
+import heapq
+import os
+from typing import Dict, List, Tuple, Optional
+
+
+class ContractionHierarchyShortestPath(ShortestPathInterface):
+    """收缩层次算法实现类"""
+    
+    def __init__(
+        self,
+        hierarchy_file: Optional[str] = None,
+        witness_settle_limit: int = 500
+    ):
+        """
+        初始化CH算法
+        hierarchy_file: 层次结构缓存文件，存在且匹配时直接加载，否则预处理后写入
+        witness_settle_limit: 见证路径搜索最多确定的节点数
+        """
+        self.hierarchy_file = hierarchy_file
+        self.witness_settle_limit = witness_settle_limit
+        self.nodes_visited = 0
+        self.nodes_expanded = 0
+        self.num_shortcuts = 0
+        self._preprocessed_graph = None
+        # 层次结构（整数节点ID）
+        self.node_names = []
+        self.node_index = {}
+        self.rank = array('i')
+        self._up = None
+        self._down = None
+        self._middle = {}
+        self._num_original_edges = 0
+        self._signature = None
+    
+    def preprocess(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        landmarks: Optional[List[str]] = None
+    ) -> None:
+        """
+        预处理：收缩所有节点，构建上行/下行搜索图（同一张图只执行一次）
+        """
+        if self._preprocessed_graph is graph:
+            return
+        
+        if self.hierarchy_file and os.path.exists(self.hierarchy_file):
+            try:
+                self.load_hierarchy(self.hierarchy_file, graph)
+                return
+            except ValueError:
+                # 缓存与当前图不匹配，重新预处理
+                pass
+        
+        self._contract_graph(graph)
+        self._preprocessed_graph = graph
+        self._signature = None
+        
+        if self.hierarchy_file:
+            self.save_hierarchy(self.hierarchy_file)
+    
+    def _contract_graph(self, graph: Dict[str, List[Tuple[str, float]]]):
+        """
+        按优先级收缩所有节点
+        """
+        self.node_names = list(graph.keys())
+        self.node_index = {name: i for i, name in enumerate(self.node_names)}
+        n = len(self.node_names)
+        
+        # 当前（未收缩部分的）出边/入边：{邻居: (权重, 中间节点)}，中间节点 -1 表示原始边
+        out_edges = [dict() for _ in range(n)]
+        in_edges = [dict() for _ in range(n)]
+        self._num_original_edges = 0
+        for name, neighbors in graph.items():
+            u = self.node_index[name]
+            for neighbor, weight in neighbors:
+                self._num_original_edges += 1
+                v = self.node_index[neighbor]
+                if u == v:
+                    continue
+                if v not in out_edges[u] or weight < out_edges[u][v][0]:
+                    out_edges[u][v] = (weight, -1)
+                    in_edges[v][u] = (weight, -1)
+        
+        deleted_neighbors = [0] * n
+        
+        # 初始优先级
+        pq = []
+        for v in range(n):
+            priority = self._priority(v, out_edges, in_edges, deleted_neighbors)
+            pq.append((priority, v))
+        heapq.heapify(pq)
+        
+        rank = array('i', [0]) * n
+        up = [None] * n
+        down = [None] * n
+        self._middle = {}
+        self.num_shortcuts = 0
+        order = 0
+        
+        while pq:
+            _, v = heapq.heappop(pq)
+            
+            # 懒更新：重新计算优先级，若不再是最小则放回队列
+            priority = self._priority(v, out_edges, in_edges, deleted_neighbors)
+            if pq and priority > pq[0][0]:
+                heapq.heappush(pq, (priority, v))
+                continue
+            
+            # 添加捷径边
+            for u, x, weight in self._find_shortcuts(v, out_edges, in_edges):
+                if x not in out_edges[u] or weight < out_edges[u][x][0]:
+                    out_edges[u][x] = (weight, v)
+                    in_edges[x][u] = (weight, v)
+                    self.num_shortcuts += 1
+            
+            # v 剩余的边都连向更高层的节点：分别记为上行（正向）和下行（反向）边
+            up[v] = [(x, weight, mid) for x, (weight, mid) in out_edges[v].items()]
+            down[v] = [(u, weight, mid) for u, (weight, mid) in in_edges[v].items()]
+            for x, (_, mid) in out_edges[v].items():
+                self._middle[(v, x)] = mid
+            for u, (_, mid) in in_edges[v].items():
+                self._middle[(u, v)] = mid
+            
+            # 从剩余图中删除 v
+            for x in out_edges[v]:
+                del in_edges[x][v]
+                deleted_neighbors[x] += 1
+            for u in in_edges[v]:
+                del out_edges[u][v]
+                deleted_neighbors[u] += 1
+            
+            rank[v] = order
+            order += 1
+        
+        self.rank = rank
+        self._up = self._to_csr(up)
+        self._down = self._to_csr(down)
+    
+    def _priority(
+        self,
+        v: int,
+        out_edges: List[dict],
+        in_edges: List[dict],
+        deleted_neighbors: List[int]
+    ) -> int:
+        """
+        节点优先级 = 边差（新增捷径数 - 删除的边数）+ 已收缩的邻居数
+        """
+        shortcuts = len(self._find_shortcuts(v, out_edges, in_edges))
+        edge_difference = shortcuts - len(out_edges[v]) - len(in_edges[v])
+        return edge_difference + deleted_neighbors[v]
+    
+    def _find_shortcuts(
+        self,
+        v: int,
+        out_edges: List[dict],
+        in_edges: List[dict]
+    ) -> List[Tuple[int, int, float]]:
+        """
+        收缩 v 时需要添加的捷径 (u, x, 权重)：u -> v -> x 没有不经过 v 的更短见证路径
+        """
+        shortcuts = []
+        if not out_edges[v] or not in_edges[v]:
+            return shortcuts
+        
+        max_out = max(weight for weight, _ in out_edges[v].values())
+        for u, (weight_uv, _) in in_edges[v].items():
+            witness = self._witness_search(u, v, weight_uv + max_out, out_edges)
+            for x, (weight_vx, _) in out_edges[v].items():
+                if x == u:
+                    continue
+                via = weight_uv + weight_vx
+                if witness.get(x, float('inf')) > via:
+                    shortcuts.append((u, x, via))
+        
+        return shortcuts
+    
+    def _witness_search(
+        self,
+        source: int,
+        excluded: int,
+        max_dist: float,
+        out_edges: List[dict]
+    ) -> Dict[int, float]:
+        """
+        见证路径搜索：在剩余图中不经过 excluded 的有界Dijkstra
+        """
+        dist = {source: 0}
+        pq = [(0, source)]
+        settled = 0
+        
+        while pq:
+            current_dist, u = heapq.heappop(pq)
+            if current_dist > dist[u]:
+                continue
+            if current_dist > max_dist or settled >= self.witness_settle_limit:
+                break
+            settled += 1
+            
+            for x, (weight, _) in out_edges[u].items():
+                if x == excluded:
+                    continue
+                distance = current_dist + weight
+                if distance < dist.get(x, float('inf')):
+                    dist[x] = distance
+                    heapq.heappush(pq, (distance, x))
+        
+        return dist
+    
+    def _to_csr(self, edges: List[List[Tuple[int, float, int]]]) -> Tuple[array, array, array, array]:
+        """
+        把每个节点的边列表压成 (offsets, targets, weights, middles) 数组
+        """
+        offsets = array('i', [0])
+        targets = array('i')
+        weights = array('d')
+        middles = array('i')
+        for node_edges in edges:
+            for x, weight, mid in node_edges:
+                targets.append(x)
+                weights.append(weight)
+                middles.append(mid)
+            offsets.append(len(targets))
+        return offsets, targets, weights, middles
+    
+    def save_hierarchy(self, filepath: str):
+        """
+        将层次结构写入二进制文件
+        """
+        if self._preprocessed_graph is None:
+            raise ValueError("No hierarchy to save, call preprocess() first")
+        
+        if self._signature is None:
+            self._signature = graph_signature(self._preprocessed_graph)
+        meta = {
+            'node_names': self.node_names,
+            'num_original_edges': self._num_original_edges,
+            'num_shortcuts': self.num_shortcuts,
+            'signature': self._signature
+        }
+        arrays = {'rank': self.rank}
+        for prefix, (offsets, targets, weights, middles) in (('up', self._up), ('down', self._down)):
+            arrays[f'{prefix}_offsets'] = offsets
+            arrays[f'{prefix}_targets'] = targets
+            arrays[f'{prefix}_weights'] = weights
+            arrays[f'{prefix}_middles'] = middles
+        
+        save_arrays(filepath, meta, arrays)
+    
+    def load_hierarchy(
+        self,
+        filepath: str,
+        graph: Dict[str, List[Tuple[str, float]]]
+    ):
+        """
+        从二进制文件加载层次结构，并绑定到指定的图
+        文件中的图摘要（节点、边和权重）必须与 graph 一致，否则抛出 ValueError
+        """
+        meta, arrays = load_arrays(filepath)
+        
+        num_edges = sum(len(neighbors) for neighbors in graph.values())
+        signature = graph_signature(graph)
+        if (len(meta['node_names']) != len(graph)
+                or meta['num_original_edges'] != num_edges
+                or meta.get('signature') != signature
+                or any(name not in graph for name in meta['node_names'])):
+            raise ValueError(f"Hierarchy file {filepath} does not match the graph")
+        
+        self.node_names = meta['node_names']
+        self.node_index = {name: i for i, name in enumerate(self.node_names)}
+        self.num_shortcuts = meta['num_shortcuts']
+        self._num_original_edges = num_edges
+        self._signature = signature
+        self.rank = arrays['rank']
+        self._up = tuple(arrays[f'up_{key}'] for key in ('offsets', 'targets', 'weights', 'middles'))
+        self._down = tuple(arrays[f'down_{key}'] for key in ('offsets', 'targets', 'weights', 'middles'))
+        
+        # 重建捷径的中间节点索引
+        self._middle = {}
+        for v in range(len(self.node_names)):
+            for prefix, (offsets, targets, _, middles) in (('up', self._up), ('down', self._down)):
+                for i in range(offsets[v], offsets[v + 1]):
+                    x = targets[i]
+                    key = (v, x) if prefix == 'up' else (x, v)
+                    self._middle[key] = middles[i]
+        
+        self._preprocessed_graph = graph
+    
+    def compute_shortest_path(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        end: str,
+        landmarks: Optional[List[str]] = None
+    ) -> Tuple[float, List[str]]:
+        """
+        使用 CH 计算从 start 到 end 的最短路径
+        正向只沿上行边搜索，反向只沿下行边（反向）搜索
+        """
+        # 重置统计信息
+        self.nodes_visited = 0
+        self.nodes_expanded = 0
+        
+        self.preprocess(graph)
+        
+        source = self.node_index.get(start)
+        target = self.node_index.get(end)
+        if source is None or target is None:
+            # 图中没有的站点不可达，与 DijkstraShortestPath 一致
+            return float('inf'), []
+        
+        if not self._may_reach(graph, start, end):
+            # 不在同一连通分量，不必搜索
+            return float('inf'), []
+        
+        searches = (
+            # (上行图, 距离, 前驱, 队列)
+            (self._up, {source: 0}, {source: -1}, [(0, source)]),
+            (self._down, {target: 0}, {target: -1}, [(0, target)])
+        )
+        settled = (set(), set())
+        
+        best = float('inf')
+        meeting = -1
+        
+        while True:
+            active = False
+            for side in (0, 1):
+                (offsets, targets, weights, _), dist, pred, pq = searches[side]
+                # 队首距离不小于当前最优值时，该方向停止
+                if not pq or pq[0][0] >= best:
+                    continue
+                active = True
+                
+                current_dist, u = heapq.heappop(pq)
+                if u in settled[side]:
+                    continue
+                settled[side].add(u)
+                self.nodes_visited += 1
+                
+                other_dist = searches[1 - side][1]
+                if u in other_dist and current_dist + other_dist[u] < best:
+                    best = current_dist + other_dist[u]
+                    meeting = u
+                
+                self.nodes_expanded += 1
+                for i in range(offsets[u], offsets[u + 1]):
+                    x = targets[i]
+                    distance = current_dist + weights[i]
+                    if distance < dist.get(x, float('inf')):
+                        dist[x] = distance
+                        pred[x] = u
+                        heapq.heappush(pq, (distance, x))
+            
+            if not active:
+                break
+        
+        if meeting == -1:
+            # 没有找到路径
+            return float('inf'), []
+        
+        return best, self._reconstruct_path(searches[0][2], searches[1][2], meeting)
+    
+    def compute_many(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        pairs: List[Tuple[str, str]],
+        landmarks: Optional[List[str]] = None
+    ) -> List[QueryResult]:
+        """
+        批量查询：基于桶的多对多距离表
+        
+        每个不同的终点 t 在下行图上做一次完整的反向搜索，把 (t, d(v, t)) 放进所经节点 v 的桶；
+        每个不同的起点 s 在上行图上做一次完整的正向搜索，在所经节点的桶中取 d(s, v) + d(v, t) 的最小值。
+        搜索次数为 不同起点数 + 不同终点数，而不是 pairs 的数量
+        """
+        self.preprocess(graph)
+        
+        targets = list(dict.fromkeys(end for _, end in pairs))
+        target_index = {end: t for t, end in enumerate(targets)}
+        groups = {}
+        for start, end in pairs:
+            groups.setdefault(start, {})[end] = None
+        
+        # 反向搜索：桶[v] = [(终点序号, d(v, 终点))]
+        buckets = {}
+        backward = []
+        for t, end in enumerate(targets):
+            if end not in self.node_index:
+                # 图中没有的终点不可达，桶中不放任何条目
+                backward.append(({}, 0))
+                continue
+            dist, pred, settled = self._upward_search(self._down, self.node_index[end])
+            backward.append((pred, settled))
+            for v, d in dist.items():
+                buckets.setdefault(v, []).append((t, d))
+        
+        answers = {}
+        for start, ends in groups.items():
+            if start in self.node_index:
+                dist, pred, settled = self._upward_search(self._up, self.node_index[start])
+            else:
+                dist, pred, settled = {}, {}, 0
+            
+            best = [float('inf')] * len(targets)
+            meeting = [-1] * len(targets)
+            for v, d in dist.items():
+                for t, d_target in buckets.get(v, ()):
+                    if d + d_target < best[t]:
+                        best[t] = d + d_target
+                        meeting[t] = v
+            
+            for end in ends:
+                t = target_index[end]
+                pred_down, settled_down = backward[t]
+                statistics = {
+                    'nodes_visited': settled + settled_down,
+                    'nodes_expanded': settled + settled_down,
+                    'shortcuts': self.num_shortcuts
+                }
+                if meeting[t] == -1:
+                    answers[(start, end)] = QueryResult(float('inf'), [], statistics)
+                else:
+                    path = self._reconstruct_path(pred, pred_down, meeting[t])
+                    answers[(start, end)] = QueryResult(best[t], path, statistics)
+        
+        return [answers[pair] for pair in pairs]
+    
+    def _upward_search(
+        self,
+        search_graph: Tuple[array, array, array, array],
+        origin: int
+    ) -> Tuple[Dict[int, float], Dict[int, int], int]:
+        """
+        在上行（或下行）图上从 origin 做完整的Dijkstra，返回 (距离, 前驱, 确定的节点数)
+        """
+        offsets, targets, weights, _ = search_graph
+        dist = {origin: 0}
+        pred = {origin: -1}
+        pq = [(0, origin)]
+        settled = set()
+        
+        while pq:
+            current_dist, u = heapq.heappop(pq)
+            if u in settled:
+                continue
+            settled.add(u)
+            
+            for i in range(offsets[u], offsets[u + 1]):
+                x = targets[i]
+                distance = current_dist + weights[i]
+                if distance < dist.get(x, float('inf')):
+                    dist[x] = distance
+                    pred[x] = u
+                    heapq.heappush(pq, (distance, x))
+        
+        return dist, pred, len(settled)
+    
+    def _reconstruct_path(
+        self,
+        prev_up: Dict[int, int],
+        prev_down: Dict[int, int],
+        meeting: int
+    ) -> List[str]:
+        """
+        拼接上行/下行两段路径，并展开所有捷径边
+        """
+        # 层次图中的路径：source -> ... -> meeting -> ... -> target
+        hierarchy_path = []
+        current = meeting
+        while current != -1:
+            hierarchy_path.append(current)
+            current = prev_up[current]
+        hierarchy_path.reverse()
+        current = prev_down[meeting]
+        while current != -1:
+            hierarchy_path.append(current)
+            current = prev_down[current]
+        
+        path = [hierarchy_path[0]]
+        for u, x in zip(hierarchy_path, hierarchy_path[1:]):
+            path.extend(self._unpack_edge(u, x))
+        
+        return [self.node_names[node] for node in path]
+    
+    def _unpack_edge(self, u: int, x: int) -> List[int]:
+        """
+        展开边 u -> x，返回不含 u 的原始节点序列
+        """
+        result = []
+        stack = [(u, x)]
+        while stack:
+            a, b = stack.pop()
+            mid = self._middle[(a, b)]
+            if mid == -1:
+                result.append(b)
+            else:
+                # 先处理 a -> mid，再处理 mid -> b
+                stack.append((mid, b))
+                stack.append((a, mid))
+        return result
+    
+    def get_algorithm_name(self) -> str:
+        """返回算法名称"""
+        return "Contraction Hierarchies"
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """返回算法统计信息"""
+        return {
+            'nodes_visited': self.nodes_visited,
+            'nodes_expanded': self.nodes_expanded,
+            'shortcuts': self.num_shortcuts
+        }
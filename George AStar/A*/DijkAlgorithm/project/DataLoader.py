@@ -1,47 +1,440 @@
 """
 DataLoader.py - 地铁图数据加载器
+
+数据目录中有图集合文件（graphs.collection，由 gen_metro_graphs.py 或
+build_collection 生成）时，所有图都从这个内存映射文件中零拷贝读取；
+否则第一次加载某张图时在CSV旁边写一份二进制缓存（{graph_id}.graph），
+之后只要两个CSV的修改时间和大小不变，就直接从缓存加载；
+已加载的图另外保存在进程内的LRU缓存中，总大小不超过给定的字节预算；
+两种文件都带有每个节点的连通分量编号，读出的CSR图不需要再计算分量
 """
 
 import csv
 import os
-from typing import Dict, List, Tuple, Optional
+import sys
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional, Union
 import random
 
+from project.CSRGraph import CSRGraph
+from project.Reordering import reorder_graph
+from project.AStarShortestPath import max_speed_bound
+from project.Storage import save_arrays, load_arrays, MappedArrays
+
+# 缓存格式变化时递增，旧缓存会被自动重建
+GRAPH_CACHE_VERSION = 2
+# 图集合文件名：所有图的CSR数组和坐标打包在一个文件中
+COLLECTION_FILE = "graphs.collection"
+# 进程内图缓存的默认字节预算
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+
+def deep_sizeof(obj) -> int:
+    """
+    估算对象及其引用的所有对象占用的字节数（同一对象只计一次）
+    支持 dict / list / tuple / set / array / CSRGraph 及其中的标量
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+    
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif isinstance(current, CSRGraph):
+            stack.extend(getattr(current, name) for name in CSRGraph.__slots__)
+    
+    return total
+
+
+# 邻接表中每条边 (邻居, 权重) 的元组和浮点数大小，坐标表中每个 (lat, lon) 同理
+_PAIR_BYTES = sys.getsizeof((None, None)) + sys.getsizeof(0.0)
+
+
+def estimate_graph_bytes(graph, coordinates: Optional[Dict[str, Tuple[float, float]]] = None) -> int:
+    """
+    估算图和坐标表占用的字节数
+    
+    邻接表字典、CSR图和坐标表结构固定，按结构累加（节点名与坐标表共享，只计一次），
+    比逐个对象遍历的 deep_sizeof 快得多；其他类型交给 deep_sizeof
+    """
+    if isinstance(graph, dict):
+        num_edges = sum(map(len, graph.values()))
+        total = (sys.getsizeof(graph) + sum(map(sys.getsizeof, graph)) +
+                 sum(map(sys.getsizeof, graph.values())) + num_edges * (_PAIR_BYTES + sys.getsizeof(0.0)))
+    elif isinstance(graph, CSRGraph):
+        # 节点名元组 + 名字 -> ID 字典（ID为int）+ 三个CSR数组
+        names = graph.node_names
+        total = (sys.getsizeof(names) + sum(map(sys.getsizeof, names)) +
+                 sys.getsizeof(graph.node_index) + len(names) * sys.getsizeof(2 ** 30) +
+                 graph.memory_bytes())
+    else:
+        total = deep_sizeof(graph)
+    
+    if coordinates:
+        total += sys.getsizeof(coordinates) + len(coordinates) * (_PAIR_BYTES + sys.getsizeof(0.0))
+    return total
+
 
 class MetroDataLoader:
     """地铁网络数据加载器"""
     
-    def __init__(self, data_dir: str = "metro_graphs"):
+    def __init__(
+        self,
+        data_dir: str = "metro_graphs",
+        use_cache: bool = True,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET
+    ):
         """
         初始化数据加载器
+        use_cache: 是否读写CSV旁边的二进制缓存
+        memory_budget: 进程内图缓存的字节预算（0 表示不缓存）
         """
         self.data_dir = data_dir
-        self.graphs_data = {}
+        self.use_cache = use_cache
+        self.memory_budget = memory_budget
+        # LRU缓存：(图ID, 是否compact, 重排方法) -> (图, 估算字节数)，最近使用的在末尾
+        self.graphs_data = OrderedDict()
+        self.cached_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        self._uncached_id = None
+        # 图集合文件（第一次需要时打开）
+        self._collection = None
+        self._collection_checked = False
         self.coordinates = {}
+        self.max_speeds = {}
     
-    def load_graph(self, graph_id: str) -> Dict[str, List[Tuple[str, float]]]:
+    def load_graph(
+        self,
+        graph_id: str,
+        compact: bool = False,
+        reorder: Optional[str] = None
+    ) -> Union[Dict[str, List[Tuple[str, float]]], CSRGraph]:
         """
         加载指定的地铁图
+        compact=True 时返回紧凑的 CSRGraph（整数节点ID + 数组存储）
+        reorder: 'bfs' / 'rcm' / 'hilbert'，按该顺序重排CSR图的节点ID以改善访存局部性
+        （只用于 compact=True；节点名不变，查询方式不受影响）
+        
+        命中进程内缓存时返回的是同一个图对象，调用方不应修改它
+        """
+        if reorder is not None and not compact:
+            raise ValueError("reorder only applies to compact (CSR) graphs")
+        
+        key = (graph_id, compact, reorder)
+        entry = self.graphs_data.get(key)
+        if entry is not None and graph_id in self.coordinates:
+            self.cache_hits += 1
+            self.graphs_data.move_to_end(key)
+            return entry[0]
+        
+        self.cache_misses += 1
+        graph = self._read_graph(graph_id, compact)
+        if reorder is not None:
+            graph, _ = reorder_graph(graph, reorder, self.coordinates[graph_id])
+        self._remember(key, graph)
+        return graph
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """进程内图缓存的统计信息"""
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'evictions': self.cache_evictions,
+            'entries': len(self.graphs_data),
+            'bytes': self.cached_bytes,
+            'budget': self.memory_budget
+        }
+    
+    def clear_cache(self):
+        """清空进程内图缓存（不删除磁盘上的二进制缓存）"""
+        self.graphs_data.clear()
+        self.coordinates.clear()
+        self.max_speeds.clear()
+        self.cached_bytes = 0
+        self._uncached_id = None
+    
+    def _remember(self, key: Tuple[str, bool, Optional[str]], graph):
+        """
+        把图放进LRU缓存，超出预算时从最久未使用的一端淘汰
+        坐标和速度上界随该图一起计入大小、一起淘汰
+        """
+        graph_id = key[0]
+        if self.memory_budget <= 0:
+            size = 1
+        elif any(k[0] == graph_id for k in self.graphs_data):
+            size = estimate_graph_bytes(graph)
+        else:
+            size = estimate_graph_bytes(graph, self.coordinates.get(graph_id))
+        
+        if size > self.memory_budget:
+            # 单张图就超出预算：不缓存，只保留最近一张这样的图的坐标
+            previous = self._uncached_id
+            if previous is not None and previous != graph_id and \
+                    not any(k[0] == previous for k in self.graphs_data):
+                self.coordinates.pop(previous, None)
+                self.max_speeds.pop(previous, None)
+            self._uncached_id = graph_id
+            return
+        
+        self.graphs_data[key] = (graph, size)
+        self.cached_bytes += size
+        
+        while self.cached_bytes > self.memory_budget:
+            (evicted_id, *_), (_, evicted_size) = self.graphs_data.popitem(last=False)
+            self.cached_bytes -= evicted_size
+            self.cache_evictions += 1
+            if not any(k[0] == evicted_id for k in self.graphs_data):
+                self.coordinates.pop(evicted_id, None)
+                self.max_speeds.pop(evicted_id, None)
+    
+    def _read_graph(
+        self,
+        graph_id: str,
+        compact: bool = False
+    ) -> Union[Dict[str, List[Tuple[str, float]]], CSRGraph]:
+        """
+        从图集合文件、二进制缓存或CSV读取图（同时记录坐标和速度上界）
         """
         stations_file = os.path.join(self.data_dir, f"{graph_id}_stations.csv")
         edges_file = os.path.join(self.data_dir, f"{graph_id}_edges.csv")
         
+        collected = self._read_from_collection(graph_id, stations_file, edges_file)
+        if collected is not None:
+            csr, coordinates, max_speed = collected
+            self.coordinates[graph_id] = coordinates
+            self.max_speeds[graph_id] = max_speed
+            return csr if compact else csr.to_adjacency()
+        
         # 检查文件是否存在
         if not os.path.exists(stations_file) or not os.path.exists(edges_file):
             raise FileNotFoundError(f"Graph files not found for {graph_id}")
         
+        cache_file = self.get_cache_path(graph_id)
+        source = self._source_signature(stations_file, edges_file)
+        
+        if self.use_cache:
+            cached = self._load_cache(cache_file, source)
+            if cached is not None:
+                csr, coordinates, max_speed = cached
+                self.coordinates[graph_id] = coordinates
+                self.max_speeds[graph_id] = max_speed
+                return csr if compact else csr.to_adjacency()
+        
+        graph, self.coordinates[graph_id] = self._parse_graph_files(stations_file, edges_file)
+        
+        # 速度上界（km/分钟），供A*把球面距离换算成行程时间下界
+        self.max_speeds[graph_id] = max_speed_bound(graph, self.coordinates[graph_id])
+        
+        csr = CSRGraph.from_adjacency(graph) if compact or self.use_cache else None
+        if self.use_cache:
+            self._save_cache(cache_file, source, csr, self.coordinates[graph_id], self.max_speeds[graph_id])
+        
+        if compact:
+            return csr
+        
+        return graph
+    
+    def _parse_graph_files(
+        self,
+        stations_file: str,
+        edges_file: str
+    ) -> Tuple[Dict[str, List[Tuple[str, float]]], Dict[str, Tuple[float, float]]]:
+        """
+        解析站点和边CSV，返回 (邻接表, 坐标)
+        """
         # 加载站点信息
         stations = self._load_stations(stations_file)
         
         # 加载边信息并构建图
         graph = self._load_edges(edges_file, stations)
         
-        # 保存坐标信息
-        self.coordinates[graph_id] = {
+        coordinates = {
             sid: (s['lat'], s['lon']) for sid, s in stations.items()
         }
         
-        return graph
+        return graph, coordinates
+    
+    def get_collection_path(self) -> str:
+        """图集合文件路径"""
+        return os.path.join(self.data_dir, COLLECTION_FILE)
+    
+    def build_collection(self, graph_ids: Optional[List[str]] = None) -> str:
+        """
+        把数据目录中的图（默认全部CSV图）打包成一个图集合文件，返回文件路径
+        
+        每张图占 {graph_id}/offsets|targets|weights|components|lat|lon|names 七个数组，
+        文件头部记录各数组的偏移以及每张图的源文件签名和速度上界
+        """
+        if graph_ids is None:
+            graph_ids = self._list_csv_graphs()
+        
+        arrays = {}
+        graphs = {}
+        for graph_id in graph_ids:
+            stations_file = os.path.join(self.data_dir, f"{graph_id}_stations.csv")
+            edges_file = os.path.join(self.data_dir, f"{graph_id}_edges.csv")
+            graph, coordinates = self._parse_graph_files(stations_file, edges_file)
+            csr = CSRGraph.from_adjacency(graph)
+            
+            prefix = f"{graph_id}/"
+            arrays[prefix + 'offsets'] = csr.offsets
+            arrays[prefix + 'targets'] = csr.targets
+            arrays[prefix + 'weights'] = csr.weights
+            arrays[prefix + 'components'] = csr.components.labels
+            arrays[prefix + 'lat'] = array('d', (coordinates[name][0] for name in csr.node_names))
+            arrays[prefix + 'lon'] = array('d', (coordinates[name][1] for name in csr.node_names))
+            # 节点名用换行拼接成一段UTF-8字节
+            arrays[prefix + 'names'] = array('B', '\n'.join(csr.node_names).encode('utf-8'))
+            graphs[graph_id] = {
+                'source': self._source_signature(stations_file, edges_file),
+                'max_speed': max_speed_bound(graph, coordinates)
+            }
+        
+        filepath = self.get_collection_path()
+        temp_file = f"{filepath}.{os.getpid()}.tmp"
+        save_arrays(temp_file, {'version': GRAPH_CACHE_VERSION, 'graphs': graphs}, arrays)
+        os.replace(temp_file, filepath)
+        
+        # 下次读取时重新打开新文件
+        self._collection = None
+        self._collection_checked = False
+        return filepath
+    
+    def _get_collection(self) -> Optional[MappedArrays]:
+        """打开（并记住）图集合文件，不存在或格式不符时返回 None"""
+        if not self._collection_checked:
+            self._collection_checked = True
+            filepath = self.get_collection_path()
+            if os.path.exists(filepath):
+                try:
+                    collection = MappedArrays(filepath)
+                    if collection.meta.get('version') == GRAPH_CACHE_VERSION:
+                        self._collection = collection
+                except (OSError, ValueError):
+                    self._collection = None
+        return self._collection
+    
+    def _read_from_collection(
+        self,
+        graph_id: str,
+        stations_file: str,
+        edges_file: str
+    ) -> Optional[Tuple[CSRGraph, Dict[str, Tuple[float, float]], float]]:
+        """
+        从图集合文件读取图，返回 (CSR图, 坐标, 最大速度)
+        CSR数组直接指向内存映射区（零拷贝）；集合中没有该图，
+        或CSV仍在且已比集合新时返回 None
+        """
+        collection = self._get_collection()
+        if collection is None:
+            return None
+        
+        info = collection.meta['graphs'].get(graph_id)
+        if info is None:
+            return None
+        
+        if os.path.exists(stations_file) and os.path.exists(edges_file) and \
+                self._source_signature(stations_file, edges_file) != info['source']:
+            return None
+        
+        prefix = f"{graph_id}/"
+        text = bytes(collection[prefix + 'names']).decode('utf-8')
+        node_names = text.split('\n') if text else []
+        csr = CSRGraph(
+            node_names,
+            collection[prefix + 'offsets'],
+            collection[prefix + 'targets'],
+            collection[prefix + 'weights'],
+            collection[prefix + 'components']
+        )
+        coordinates = dict(zip(node_names, zip(collection[prefix + 'lat'], collection[prefix + 'lon'])))
+        return csr, coordinates, info['max_speed']
+    
+    def get_cache_path(self, graph_id: str) -> str:
+        """指定图的二进制缓存文件路径"""
+        return os.path.join(self.data_dir, f"{graph_id}.graph")
+    
+    def _source_signature(self, *filepaths: str) -> List[List[int]]:
+        """源CSV文件的 [修改时间(ns), 大小] 列表，用于判断缓存是否过期"""
+        signature = []
+        for filepath in filepaths:
+            stat = os.stat(filepath)
+            signature.append([stat.st_mtime_ns, stat.st_size])
+        return signature
+    
+    def _load_cache(
+        self,
+        cache_file: str,
+        source: List[List[int]]
+    ) -> Optional[Tuple[CSRGraph, Dict[str, Tuple[float, float]], float]]:
+        """
+        读取二进制缓存，返回 (CSR图, 坐标, 最大速度)
+        缓存不存在、已过期或损坏时返回 None
+        """
+        if not os.path.exists(cache_file):
+            return None
+        
+        try:
+            meta, arrays = load_arrays(cache_file)
+            if meta.get('version') != GRAPH_CACHE_VERSION or meta.get('source') != source:
+                return None
+            
+            node_names = meta['node_names']
+            csr = CSRGraph(
+                node_names, arrays['offsets'], arrays['targets'], arrays['weights'], arrays['components']
+            )
+            coordinates = dict(zip(node_names, zip(arrays['lat'], arrays['lon'])))
+            return csr, coordinates, meta['max_speed']
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _save_cache(
+        self,
+        cache_file: str,
+        source: List[List[int]],
+        csr: CSRGraph,
+        coordinates: Dict[str, Tuple[float, float]],
+        max_speed: float
+    ):
+        """
+        写入二进制缓存（先写临时文件再替换，并发加载同一张图时不会读到半个文件）
+        数据目录不可写时跳过
+        """
+        meta = {
+            'version': GRAPH_CACHE_VERSION,
+            'source': source,
+            'node_names': list(csr.node_names),
+            'max_speed': max_speed
+        }
+        arrays = {
+            'offsets': csr.offsets,
+            'targets': csr.targets,
+            'weights': csr.weights,
+            'components': csr.components.labels,
+            'lat': array('d', (coordinates[name][0] for name in csr.node_names)),
+            'lon': array('d', (coordinates[name][1] for name in csr.node_names))
+        }
+        
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            save_arrays(temp_file, meta, arrays)
+            os.replace(temp_file, cache_file)
+        except OSError:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
     
     def _load_stations(self, filepath: str) -> Dict[str, dict]:
         """
@@ -101,10 +494,30 @@ class MetroDataLoader:
         
         return self.coordinates[graph_id]
     
+    def get_max_speed(self, graph_id: str) -> float:
+        """
+        获取指定图的最大速度（km/分钟）：所有边上 站点球面距离 / travel_time_min 的最大值
+        
+        这里用站点坐标而不是 distance_km 列：distance_km 只保留到米，
+        有的边会比坐标间的球面距离略短，按它算出的速度不能保证启发值可采纳
+        """
+        if graph_id not in self.max_speeds:
+            self.load_graph(graph_id)
+        
+        return self.max_speeds[graph_id]
+    
     def list_available_graphs(self) -> List[str]:
         """
-        列出所有可用的图ID
+        列出所有可用的图ID（有图集合文件时直接读它的索引，不扫描目录）
         """
+        collection = self._get_collection()
+        if collection is not None:
+            return sorted(collection.meta['graphs'])
+        
+        return self._list_csv_graphs()
+    
+    def _list_csv_graphs(self) -> List[str]:
+        """扫描数据目录，列出所有有CSV文件的图ID"""
         if not os.path.exists(self.data_dir):
             return []
         
@@ -144,7 +557,10 @@ class MetroDataLoader:
         获取图的统计信息
         """
         num_nodes = len(graph)
-        num_edges = sum(len(neighbors) for neighbors in graph.values()) // 2
+        if isinstance(graph, CSRGraph):
+            num_edges = graph.num_edges // 2
+        else:
+            num_edges = sum(len(neighbors) for neighbors in graph.values()) // 2
         
         return {
             'num_nodes': num_nodes,
@@ -2,16 +2,26 @@
 Dijkstra.py - Dijkstra最短路径算法实现
 """
 
-from project.Interface import ShortestPathInterface
+from project.Interface import ShortestPathInterface, QueryResult
+from project.CSRGraph import CSRGraph
+from project.SearchWorkspace import WorkspacePool, INF
+from project.SearchSession import SessionCache
 import heapq
 from typing import Dict, List, Tuple, Optional
 
 
 class DijkstraShortestPath(ShortestPathInterface):
     
-    def __init__(self):
+    def __init__(self, max_sessions: int = 0):
+        """
+        max_sessions: 保留的单源搜索会话数（见 project.SearchSession），0 表示每次查询从头搜索
+        启用后同一起点的后续查询从上次的边界继续搜索，终点已确定时直接返回
+        """
         self.nodes_visited = 0
         self.nodes_expanded = 0
+        # CSR查询复用的 dist/prev/visited 数组，每个并发查询借用一份
+        self._workspaces = WorkspacePool()
+        self._sessions = SessionCache(max_sessions) if max_sessions > 0 else None
     
     def compute_shortest_path(
         self,
@@ -23,20 +33,52 @@ class DijkstraShortestPath(ShortestPathInterface):
         """
         使用 Dijkstra 算法计算从 start 到 end 的最短路径
         """
-        # 重置统计信息
-        self.nodes_visited = 0
-        self.nodes_expanded = 0
+        return self._record_result(self.query(graph, start, end, landmarks))
+    
+    def query(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        end: str,
+        landmarks: Optional[List[str]] = None
+    ) -> QueryResult:
+        """
+        可重入的查询：统计信息只保存在局部变量中，多个线程可以共享同一个实例
+        """
+        return self.query_targets(graph, start, [end])[0]
+    
+    def query_targets(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        targets: List[str],
+        landmarks: Optional[List[str]] = None
+    ) -> List[QueryResult]:
+        """
+        单源多目标查询：一次从 start 出发的搜索，所有终点都确定后停止
+        每个终点的统计为确定该终点时已访问/扩展的节点数
+        """
+        if self._sessions is not None:
+            return self._query_targets_session(graph, start, targets)
+        
+        if isinstance(graph, CSRGraph):
+            return self._query_targets_csr(graph, start, targets)
+        
+        nodes_visited = 0
+        nodes_expanded = 0
+        results = {}
+        # 与起点不在同一连通分量的终点直接判为不可达，全部不可达时不做搜索
+        remaining = {end for end in targets if self._may_reach(graph, start, end)}
         
-        # 初始化距离字典和前驱字典
-        dist = {node: float('inf') for node in graph}
-        dist[start] = 0
-        prev = {node: None for node in graph}
+        # 距离/前驱只记录搜索到的节点，初始化不随图的规模增长
+        dist = {start: 0}
+        prev = {start: None}
         
         # 优先队列：(距离, 节点)
         pq = [(0, start)]
         visited = set()
         
-        while pq:
+        while pq and remaining:
             current_dist, current_node = heapq.heappop(pq)
             
             # 如果已经访问过，跳过
@@ -44,29 +86,138 @@ class DijkstraShortestPath(ShortestPathInterface):
                 continue
             
             visited.add(current_node)
-            self.nodes_visited += 1
+            nodes_visited += 1
             
-            # 如果到达终点，重建路径
-            if current_node == end:
-                path = self._reconstruct_path(prev, start, end)
-                return current_dist, path
+            # 如果到达某个终点，重建路径；所有终点都确定后停止
+            if current_node in remaining:
+                remaining.discard(current_node)
+                path = self._reconstruct_path(prev, start, current_node)
+                results[current_node] = QueryResult(current_dist, path, self._statistics(nodes_visited, nodes_expanded))
+                if not remaining:
+                    break
             
             # 如果当前距离大于已知距离，跳过
             if current_dist > dist[current_node]:
                 continue
             
             # 扩展邻居节点
-            self.nodes_expanded += 1
+            nodes_expanded += 1
             for neighbor, weight in graph[current_node]:
                 distance = current_dist + weight
                 
-                if distance < dist[neighbor]:
+                if distance < dist.get(neighbor, INF):
                     dist[neighbor] = distance
                     prev[neighbor] = current_node
                     heapq.heappush(pq, (distance, neighbor))
         
-        # 没有找到路径
-        return float('inf'), []
+        # 没有找到路径的终点
+        unreachable = QueryResult(float('inf'), [], self._statistics(nodes_visited, nodes_expanded))
+        return [results.get(end, unreachable) for end in targets]
+    
+    def _query_targets_csr(
+        self,
+        graph: CSRGraph,
+        start: str,
+        targets: List[str]
+    ) -> List[QueryResult]:
+        """
+        CSR图上的Dijkstra：节点用整数ID，距离/前驱使用工作区中预分配的数组
+        图中没有的终点（ID记为 -1）与邻接表字典一样返回不可达
+        """
+        offsets, targets_array, weights = graph.offsets, graph.targets, graph.weights
+        source = graph.node_index[start]
+        target_ids = [graph.node_index.get(end, -1) for end in targets]
+        remaining = {
+            target for end, target in zip(targets, target_ids)
+            if target != -1 and self._may_reach(graph, start, end)
+        }
+        results = {}
+        nodes_visited = 0
+        nodes_expanded = 0
+        
+        with self._workspaces.borrow(graph.num_nodes) as workspace:
+            dist, prev, visited = workspace.dist, workspace.prev, workspace.visited
+            touched = workspace.touched
+            dist[source] = 0
+            touched.append(source)
+            
+            pq = [(0, source)]
+            
+            while pq and remaining:
+                current_dist, u = heapq.heappop(pq)
+                
+                if visited[u]:
+                    continue
+                
+                visited[u] = 1
+                nodes_visited += 1
+                
+                if u in remaining:
+                    remaining.discard(u)
+                    path = graph.reconstruct_path(prev, source, u)
+                    results[u] = QueryResult(current_dist, path, self._statistics(nodes_visited, nodes_expanded))
+                    if not remaining:
+                        break
+                
+                nodes_expanded += 1
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = targets_array[i]
+                    distance = current_dist + weights[i]
+                    
+                    if distance < dist[v]:
+                        if dist[v] == INF:
+                            touched.append(v)
+                        dist[v] = distance
+                        prev[v] = u
+                        heapq.heappush(pq, (distance, v))
+        
+        unreachable = QueryResult(float('inf'), [], self._statistics(nodes_visited, nodes_expanded))
+        return [results.get(target, unreachable) for target in target_ids]
+    
+    def _query_targets_session(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        targets: List[str]
+    ) -> List[QueryResult]:
+        """
+        在 start 的会话上依次确定各个终点
+        nodes_visited / nodes_expanded 与普通查询含义相同，只计本次调用中的工作
+        （终点已确定时为 0）；会话累计的数目放在 session_nodes_visited / session_nodes_expanded
+        """
+        session = self._sessions.session(graph, start)
+        results = []
+        with session.lock:
+            visited_before = session.nodes_visited
+            expanded_before = session.nodes_expanded
+            for end in targets:
+                if self._may_reach(graph, start, end):
+                    distance, path = session.settle(end)
+                else:
+                    distance, path = float('inf'), []
+                statistics = self._statistics(
+                    session.nodes_visited - visited_before, session.nodes_expanded - expanded_before
+                )
+                statistics['session_nodes_visited'] = session.nodes_visited
+                statistics['session_nodes_expanded'] = session.nodes_expanded
+                results.append(QueryResult(distance, path, statistics))
+        return results
+    
+    def invalidate_sessions(self, graph: Optional[Dict[str, List[Tuple[str, float]]]] = None):
+        """原地修改邻接表字典后丢弃该图上的会话（graph 为 None 时全部丢弃）"""
+        if self._sessions is not None:
+            self._sessions.invalidate(graph)
+    
+    def get_session_stats(self) -> Dict[str, int]:
+        """会话缓存的命中/未命中/淘汰统计；未启用会话时为空"""
+        return self._sessions.get_stats() if self._sessions is not None else {}
+    
+    def _statistics(self, nodes_visited: int, nodes_expanded: int) -> Dict[str, int]:
+        """生成一次查询的统计信息"""
+        return {
+            'nodes_visited': nodes_visited,
+            'nodes_expanded': nodes_expanded
+        }
     
     def _reconstruct_path(
         self,
@@ -99,7 +250,4 @@ class DijkstraShortestPath(ShortestPathInterface):
     
     def get_statistics(self) -> Dict[str, int]:
         """返回算法统计信息"""
-        return {
-            'nodes_visited': self.nodes_visited,
-            'nodes_expanded': self.nodes_expanded
-        }
+        return self._statistics(self.nodes_visited, self.nodes_expanded)
@@ -0,0 +1,354 @@
+"""
+HubLabeling.py - 2-hop 距离标签（Hub Labeling）实现
+
+预处理：按节点重要性（度数）依次做剪枝Dijkstra（Pruned Landmark Labeling），
+为每个节点生成按hub排序的出标签/入标签
+查询：合并起点的出标签和终点的入标签，无需在图上搜索
+"""
+
+from project.Interface import ShortestPathInterface
+from project.CSRGraph import CSRGraph
+from project.Storage import save_arrays, load_arrays, graph_signature
+from array import array
+from bisect import bisect_left
+import heapq
+import os
+from typing import Dict, List, Tuple, Optional, Sequence
+
+
+def _neighbor_items(neighbors):
+    """兼容两种邻接格式：[(v, w), ...] 与 ZK 项目的 {v: w, ...}"""
+    return neighbors.items() if isinstance(neighbors, dict) else neighbors
+
+
+class HubLabels:
+    """
+    节点的 2-hop 标签集合
+    
+    出标签 out[v] = [(hub, d(v, hub), 下一跳)]，入标签 in[v] = [(hub, d(hub, v), 前驱)]，
+    hub 用其在处理顺序中的序号表示，每个节点的标签按序号升序存放（CSR数组）
+    """
+    
+    def __init__(
+        self,
+        node_names: Sequence[str],
+        order: Sequence[int],
+        out_labels: Tuple[Sequence, Sequence, Sequence, Sequence],
+        in_labels: Tuple[Sequence, Sequence, Sequence, Sequence]
+    ):
+        """
+        out_labels / in_labels 均为 (offsets, hubs, dists, parents) 四个数组
+        """
+        self.node_names = list(node_names)
+        self.node_index = {name: i for i, name in enumerate(self.node_names)}
+        # order[hub序号] = 节点ID
+        self.order = order
+        self.out_labels = out_labels
+        self.in_labels = in_labels
+    
+    @property
+    def num_entries(self) -> int:
+        """标签条目总数"""
+        return len(self.out_labels[1]) + len(self.in_labels[1])
+    
+    def average_label_size(self) -> float:
+        """每个节点平均的（出+入）标签大小"""
+        return self.num_entries / len(self.node_names) if self.node_names else 0
+    
+    def _best_hub(self, source: int, target: int) -> Tuple[float, int, int, int]:
+        """
+        合并 source 的出标签与 target 的入标签
+        返回 (距离, 出标签下标, 入标签下标, 比较次数)
+        """
+        out_offsets, out_hubs, out_dists, _ = self.out_labels
+        in_offsets, in_hubs, in_dists, _ = self.in_labels
+        
+        i, i_end = out_offsets[source], out_offsets[source + 1]
+        j, j_end = in_offsets[target], in_offsets[target + 1]
+        steps = 0
+        best = float('inf')
+        best_i = best_j = -1
+        
+        while i < i_end and j < j_end:
+            steps += 1
+            hub_out = out_hubs[i]
+            hub_in = in_hubs[j]
+            if hub_out == hub_in:
+                d = out_dists[i] + in_dists[j]
+                if d < best:
+                    best, best_i, best_j = d, i, j
+                i += 1
+                j += 1
+            elif hub_out < hub_in:
+                i += 1
+            else:
+                j += 1
+        
+        return best, best_i, best_j, steps
+    
+    def distance(self, start: str, end: str) -> float:
+        """查询 start 到 end 的最短距离（不在标签中的站点不可达）"""
+        if start not in self.node_index or end not in self.node_index:
+            return float('inf')
+        return self._best_hub(self.node_index[start], self.node_index[end])[0]
+    
+    def path(self, start: str, end: str) -> Tuple[float, List[str]]:
+        """查询最短距离并通过标签中的前驱/后继重建路径"""
+        dist, path, _ = self.query(start, end)
+        return dist, path
+    
+    def query(self, start: str, end: str) -> Tuple[float, List[str], int]:
+        """
+        返回 (距离, 路径, 标签比较次数)；不在标签中的站点返回 (inf, [], 0)
+        """
+        source = self.node_index.get(start)
+        target = self.node_index.get(end)
+        if source is None or target is None:
+            return float('inf'), [], 0
+        best, best_i, best_j, steps = self._best_hub(source, target)
+        
+        if best_i == -1:
+            return float('inf'), [], steps
+        
+        hub = self.out_labels[1][best_i]
+        
+        # source -> hub：沿出标签的下一跳走
+        path = [source]
+        current = self.out_labels[3][best_i]
+        while current != -1:
+            path.append(current)
+            current = self.out_labels[3][self._find_entry(self.out_labels, current, hub)]
+        
+        # hub -> target：从 target 沿入标签的前驱倒推
+        tail = []
+        current = self.in_labels[3][best_j]
+        while current != -1:
+            tail.append(current)
+            current = self.in_labels[3][self._find_entry(self.in_labels, current, hub)]
+        # tail 的最后一个节点就是 hub（已在 path 末尾）
+        tail.reverse()
+        path.extend(tail[1:])
+        if target != self.order[hub]:
+            path.append(target)
+        
+        return best, [self.node_names[v] for v in path], steps
+    
+    def _find_entry(self, labels, node: int, hub: int) -> int:
+        """在节点的标签中二分查找指定hub的下标"""
+        offsets, hubs, _, _ = labels
+        lo, hi = offsets[node], offsets[node + 1]
+        i = bisect_left(hubs, hub, lo, hi)
+        if i == hi or hubs[i] != hub:
+            raise ValueError(f"Hub {hub} missing from label of node {node}")
+        return i
+    
+    def save(self, filepath: str, meta: Optional[dict] = None):
+        """
+        保存为紧凑的二进制标签文件（int32 hub/前驱 + float64 距离）
+        """
+        arrays = {'order': array('i', self.order)}
+        for prefix, labels in (('out', self.out_labels), ('in', self.in_labels)):
+            for key, values in zip(('offsets', 'hubs', 'dists', 'parents'), labels):
+                typecode = 'd' if key == 'dists' else 'i'
+                arrays[f'{prefix}_{key}'] = array(typecode, values)
+        
+        file_meta = dict(meta or {})
+        file_meta['node_names'] = self.node_names
+        save_arrays(filepath, file_meta, arrays)
+    
+    @classmethod
+    def load(cls, filepath: str, use_mmap: bool = False) -> Tuple['HubLabels', dict]:
+        """
+        加载标签文件，返回 (HubLabels, 元数据)
+        use_mmap=True 时标签数组直接映射文件，不复制到内存
+        """
+        meta, arrays = load_arrays(filepath, use_mmap=use_mmap)
+        keys = ('offsets', 'hubs', 'dists', 'parents')
+        labels = cls(
+            meta['node_names'],
+            arrays['order'],
+            tuple(arrays[f'out_{key}'] for key in keys),
+            tuple(arrays[f'in_{key}'] for key in keys)
+        )
+        return labels, meta
+
+
+def build_hub_labels(graph: Dict[str, List[Tuple[str, float]]]) -> HubLabels:
+    """
+    剪枝Dijkstra构建 2-hop 标签
+    
+    按度数从大到小依次以每个节点为hub：正向搜索填写入标签，反向搜索填写出标签；
+    若已有标签已能给出不大于当前距离的结果，则剪掉该节点
+    """
+    if isinstance(graph, CSRGraph):
+        node_names = list(graph.node_names)
+    else:
+        node_names = list(graph.keys())
+    node_index = {name: i for i, name in enumerate(node_names)}
+    
+    forward = [[] for _ in node_names]
+    backward = [[] for _ in node_names]
+    for name in list(node_names):
+        u = node_index[name]
+        for neighbor, weight in _neighbor_items(graph[name]):
+            if neighbor not in node_index:
+                node_index[neighbor] = len(node_names)
+                node_names.append(neighbor)
+                forward.append([])
+                backward.append([])
+            v = node_index[neighbor]
+            forward[u].append((v, weight))
+            backward[v].append((u, weight))
+    
+    n = len(node_names)
+    # hub顺序：度数越大越先处理
+    order = sorted(range(n), key=lambda v: -(len(forward[v]) + len(backward[v])))
+    rank = [0] * n
+    for r, v in enumerate(order):
+        rank[v] = r
+    
+    # 构建期间的标签：每个节点一个 [(hub序号, 距离, 前驱/后继)] 列表，自然按hub序号有序
+    out_labels = [[] for _ in range(n)]
+    in_labels = [[] for _ in range(n)]
+    hub_dist = [float('inf')] * n
+    
+    for r, hub in enumerate(order):
+        # 正向：d(hub, v) 写入 v 的入标签；剪枝查询用 hub 的出标签
+        for adjacency, own_labels, fill_labels in (
+            (forward, out_labels, in_labels),
+            (backward, in_labels, out_labels)
+        ):
+            for h, d, _ in own_labels[hub]:
+                hub_dist[h] = d
+            
+            dist = {hub: 0}
+            parent = {hub: -1}
+            pq = [(0, hub)]
+            settled = set()
+            
+            while pq:
+                current_dist, v = heapq.heappop(pq)
+                if v in settled:
+                    continue
+                settled.add(v)
+                
+                # 剪枝：已有标签能覆盖这段距离
+                if any(hub_dist[h] + d <= current_dist for h, d, _ in fill_labels[v]):
+                    continue
+                
+                fill_labels[v].append((r, current_dist, parent[v]))
+                
+                for x, weight in adjacency[v]:
+                    distance = current_dist + weight
+                    if rank[x] > r and distance < dist.get(x, float('inf')):
+                        dist[x] = distance
+                        parent[x] = v
+                        heapq.heappush(pq, (distance, x))
+            
+            for h, _, _ in own_labels[hub]:
+                hub_dist[h] = float('inf')
+    
+    def pack(labels):
+        offsets = array('i', [0])
+        hubs = array('i')
+        dists = array('d')
+        parents = array('i')
+        for entries in labels:
+            for h, d, p in entries:
+                hubs.append(h)
+                dists.append(d)
+                parents.append(p)
+            offsets.append(len(hubs))
+        return offsets, hubs, dists, parents
+    
+    return HubLabels(node_names, array('i', order), pack(out_labels), pack(in_labels))
+
+
+class HubLabelShortestPath(ShortestPathInterface):
+    """基于 2-hop 标签的最短路径查询类"""
+    
+    def __init__(self, label_file: Optional[str] = None, use_mmap: bool = False):
+        """
+        label_file: 标签文件，存在且与图匹配时直接加载，否则构建后写入
+        use_mmap: 以内存映射方式打开标签文件
+        """
+        self.label_file = label_file
+        self.use_mmap = use_mmap
+        self.labels = None
+        self.nodes_visited = 0
+        self.nodes_expanded = 0
+        self._preprocessed_graph = None
+    
+    def preprocess(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        landmarks: Optional[List[str]] = None
+    ) -> None:
+        """
+        预处理：构建（或从文件加载）所有节点的标签
+        """
+        if self._preprocessed_graph is graph:
+            return
+        
+        num_edges = sum(len(neighbors) for neighbors in graph.values())
+        signature = graph_signature(graph)
+        
+        if self.label_file and os.path.exists(self.label_file):
+            try:
+                labels, meta = HubLabels.load(self.label_file, use_mmap=self.use_mmap)
+            except ValueError:
+                # 文件损坏或不完整（例如写入时进程被中断），重新构建标签
+                labels, meta = None, {}
+            # 摘要覆盖节点、边和权重：图重新生成后即使规模相同也会重建标签
+            if (labels is not None
+                    and meta.get('num_edges') == num_edges
+                    and meta.get('signature') == signature
+                    and len(labels.node_names) == len(graph)
+                    and all(name in graph for name in labels.node_names)):
+                self.labels = labels
+                self._preprocessed_graph = graph
+                return
+        
+        self.labels = build_hub_labels(graph)
+        self._preprocessed_graph = graph
+        
+        if self.label_file:
+            self.labels.save(self.label_file, meta={'num_edges': num_edges, 'signature': signature})
+    
+    def compute_shortest_path(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        end: str,
+        landmarks: Optional[List[str]] = None
+    ) -> Tuple[float, List[str]]:
+        """
+        通过合并两个标签计算最短路径（不在图上搜索）
+        """
+        self.preprocess(graph)
+        
+        if not self._may_reach(graph, start, end):
+            # 不在同一连通分量，不必合并标签
+            self.nodes_visited = 0
+            self.nodes_expanded = 0
+            return float('inf'), []
+        
+        dist, path, steps = self.labels.query(start, end)
+        
+        # 标签查询不访问图节点，这里记录标签比较次数
+        self.nodes_visited = steps
+        self.nodes_expanded = 0
+        
+        return dist, path
+    
+    def get_algorithm_name(self) -> str:
+        """返回算法名称"""
+        return "Hub Labeling"
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """返回算法统计信息"""
+        return {
+            'nodes_visited': self.nodes_visited,
+            'nodes_expanded': self.nodes_expanded,
+            'avg_label_size': round(self.labels.average_label_size(), 2) if self.labels else 0
+        }
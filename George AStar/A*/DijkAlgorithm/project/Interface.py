@@ -3,12 +3,112 @@ Interface.py - 最短路径算法接口
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple, Optional
+
+from project.CSRGraph import CSRGraph
+from project.Components import ComponentIndex
+
+
+@dataclass(frozen=True)
+class QueryResult:
+    """一次查询的结果：距离、路径和本次查询的统计信息"""
+    distance: float
+    path: List[str]
+    statistics: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def nodes_visited(self) -> int:
+        return self.statistics.get('nodes_visited', 0)
+    
+    @property
+    def nodes_expanded(self) -> int:
+        return self.statistics.get('nodes_expanded', 0)
 
 
 class ShortestPathInterface(ABC):
     """最短路径算法的抽象基类"""
     
+    def query(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        end: str,
+        landmarks: Optional[List[str]] = None
+    ) -> QueryResult:
+        """
+        计算最短路径并返回本次查询的 QueryResult
+        
+        默认实现调用 compute_shortest_path 再读取实例上的统计，不可重入；
+        可以被多个线程共享的算法会重写这个方法，统计只放在局部变量中
+        """
+        distance, path = self.compute_shortest_path(graph, start, end, landmarks)
+        return QueryResult(distance, path, self.get_statistics())
+    
+    def query_targets(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        start: str,
+        targets: List[str],
+        landmarks: Optional[List[str]] = None
+    ) -> List[QueryResult]:
+        """
+        从 start 到多个终点的查询，结果与 targets 顺序一致
+        默认逐个调用 query；能用一次单源搜索覆盖所有终点的算法会重写这个方法
+        """
+        return [self.query(graph, start, end, landmarks) for end in targets]
+    
+    def compute_many(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        pairs: List[Tuple[str, str]],
+        landmarks: Optional[List[str]] = None
+    ) -> List[QueryResult]:
+        """
+        批量查询多个 (起点, 终点)，结果按输入顺序返回
+        
+        按起点分组，每个不同的起点调用一次 query_targets（重复的终点只算一次），
+        所以支持多目标搜索的算法只需要 O(不同起点数) 次搜索
+        """
+        groups = {}
+        for start, end in pairs:
+            groups.setdefault(start, {})[end] = None
+        
+        answers = {}
+        for start, targets in groups.items():
+            targets = list(targets)
+            for end, result in zip(targets, self.query_targets(graph, start, targets, landmarks)):
+                answers[(start, end)] = result
+        
+        return [answers[pair] for pair in pairs]
+    
+    def _components(self, graph: Dict[str, List[Tuple[str, float]]]) -> ComponentIndex:
+        """
+        图的连通分量索引：CSR图自带（加载时计算）；
+        邻接表字典在每个实例中按图缓存一份，同一张图只计算一次
+        """
+        if isinstance(graph, CSRGraph):
+            return graph.components
+        cached = getattr(self, '_component_cache', None)
+        if cached is not None and cached[0] is graph:
+            return cached[1]
+        index = ComponentIndex.from_adjacency(graph)
+        self._component_cache = (graph, index)
+        return index
+    
+    def _may_reach(self, graph: Dict[str, List[Tuple[str, float]]], start: str, end: str) -> bool:
+        """O(1) 判断 start 是否可能到达 end：不在同一连通分量时不必搜索"""
+        return start == end or self._components(graph).may_reach(start, end)
+    
+    def _record_result(self, result: QueryResult) -> Tuple[float, List[str]]:
+        """
+        把 query 的结果记到实例上（供 get_statistics 兼容旧的用法），返回 (距离, 路径)
+        并发使用时实例上的统计只反映最近一次完成的查询
+        """
+        self.nodes_visited = result.nodes_visited
+        self.nodes_expanded = result.nodes_expanded
+        return result.distance, result.path
+    
     @abstractmethod
     def compute_shortest_path(
         self,
@@ -22,6 +122,17 @@ class ShortestPathInterface(ABC):
         """
         pass
     
+    def preprocess(
+        self,
+        graph: Dict[str, List[Tuple[str, float]]],
+        landmarks: Optional[List[str]] = None
+    ) -> None:
+        """
+        预处理（可选）：同一张图只需执行一次，之后的查询复用结果
+        默认无需预处理
+        """
+        pass
+    
     @abstractmethod
     def get_algorithm_name(self) -> str:
         """返回算法名称"""
@@ -0,0 +1,90 @@
+"""
+LandmarkStore.py - 量化的地标距离文件
+
+float64 的 (V, k) 地标矩阵每个节点占 8k 字节，地标多、图大时比图本身还大。
+这里把距离存成定点整数：code = floor(d / step)，step = 最大有限距离 / (2^bits - 2)，
+2^bits - 1 表示不可达。因为 code * step <= d < (code + 1) * step，
+|code_t - code_v| - 1 个 step 仍是 |d_L(t) - d_L(v)| 的下界，启发值保持可采纳
+（但不再一致，ALT在量化矩阵上搜索时会重新打开节点）
+文件用 Storage 格式保存，加载时默认内存映射，多个工作进程打开同一文件只占一份物理内存
+"""
+
+import math
+from array import array
+from typing import List, Sequence, Tuple
+
+from project.CSRGraph import CSRGraph
+from project.Storage import save_arrays, load_arrays, graph_signature
+
+# 支持的量化位数 -> array 类型码
+QUANTIZATION_TYPECODES = {8: 'B', 16: 'H', 32: 'I'}
+
+
+def quantize_landmark_matrix(matrix: array, bits: int = 16) -> Tuple[array, float]:
+    """
+    把 float64 地标矩阵量化为 bits 位无符号整数，返回 (编码数组, step)
+    距离向下取整，不可达记为 2^bits - 1
+    """
+    if bits not in QUANTIZATION_TYPECODES:
+        raise ValueError(f"Unsupported quantization {bits} bits, expected one of {sorted(QUANTIZATION_TYPECODES)}")
+    
+    sentinel = (1 << bits) - 1
+    max_dist = max((d for d in matrix if d != math.inf), default=0.0)
+    step = max_dist / (sentinel - 1) or 1.0
+    
+    codes = array(QUANTIZATION_TYPECODES[bits], [sentinel]) * len(matrix)
+    for i, d in enumerate(matrix):
+        if d == math.inf:
+            continue
+        code = int(d / step)
+        # 浮点除法可能向上舍入到下一个整数，保证 code * step <= d
+        if code * step > d:
+            code -= 1
+        codes[i] = min(code, sentinel - 1)
+    
+    return codes, step
+
+
+def save_landmark_store(
+    filepath: str,
+    graph: CSRGraph,
+    landmarks: List[str],
+    matrix: array,
+    bits: int = 16
+) -> None:
+    """
+    把CSR图上的 float64 地标矩阵量化后写入文件
+    """
+    codes, step = quantize_landmark_matrix(matrix, bits)
+    meta = {
+        'node_names': list(graph.node_names),
+        'num_edges': len(graph.targets),
+        'signature': graph_signature(graph),
+        'landmarks': list(landmarks),
+        'bits': bits,
+        'step': step
+    }
+    save_arrays(filepath, meta, {'matrix': codes})
+
+
+def load_landmark_store(
+    filepath: str,
+    graph: CSRGraph,
+    use_mmap: bool = True
+) -> Tuple[List[str], Sequence[int], float]:
+    """
+    加载量化的地标文件并检查它属于 graph，返回 (地标, 编码矩阵, step)
+    图摘要覆盖边权：站点相同但重新生成了权重的图上，旧的下界可能偏大，同样拒绝
+    use_mmap=True 时编码矩阵是指向文件的只读 memoryview
+    """
+    if not isinstance(graph, CSRGraph):
+        raise ValueError("Quantized landmark stores are indexed by node ID and need a CSRGraph")
+    
+    meta, arrays = load_arrays(filepath, use_mmap=use_mmap)
+    if (meta['node_names'] != list(graph.node_names)
+            or meta['num_edges'] != len(graph.targets)
+            or meta.get('signature') != graph_signature(graph)):
+        raise ValueError(f"Landmark store {filepath} was built for a different graph")
+    
+    return meta['landmarks'], arrays['matrix'], meta['step']
+
@@ -0,0 +1,263 @@
+"""
+Landmarks.py - ALT的地标选择策略
+
+随机地标给出的三角不等式下界很弱，ALT几乎退化成Dijkstra。这里实现几种常用的选择方法：
+- random：均匀随机（对照组）
+- farthest：每次选离已选地标最远的节点
+- planar：以图的中心把平面按角度分成 k 个扇区，每个扇区取离中心最远的站点（需要坐标）
+- avoid：Goldberg-Harrelson 的 avoid，在随机根的最短路树中找下界最差、且不经过已有地标的子树，取其叶子
+- maxcover：用 avoid 生成约 4k 个候选，再选出让最多边“紧”（下界等于边权）的 k 个
+"""
+
+import heapq
+import math
+import random
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from project.CSRGraph import CSRGraph
+
+# select_landmarks 支持的策略
+LANDMARK_STRATEGIES = ('random', 'farthest', 'planar', 'avoid', 'maxcover')
+
+
+def _shortest_path_tree(graph: CSRGraph, source: int) -> Tuple[array, array, List[int]]:
+    """
+    从 source 出发的Dijkstra，返回 (距离数组, 前驱数组, 按出队顺序排列的可达节点)
+    """
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = array('d', [math.inf]) * graph.num_nodes
+    parent = array('i', [-1]) * graph.num_nodes
+    settled = []
+    dist[source] = 0
+    pq = [(0, source)]
+    
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        settled.append(u)
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            nd = d + weights[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                heapq.heappush(pq, (nd, v))
+    
+    return dist, parent, settled
+
+
+def _farthest_fill(
+    graph: CSRGraph,
+    chosen: List[int],
+    k: int,
+    rng: random.Random
+) -> List[int]:
+    """
+    在已选地标的基础上反复加入离所有已选地标最远的节点，直到 k 个
+    到不了的节点视为无穷远，所以先覆盖其他连通分量
+    """
+    n = graph.num_nodes
+    chosen = list(chosen)
+    min_dist = [math.inf] * n
+    
+    if not chosen:
+        # 从随机节点出发最远的节点作为第一个地标
+        dist, _, _ = _shortest_path_tree(graph, rng.randrange(n))
+        chosen.append(max(range(n), key=lambda v: (dist[v] != math.inf, dist[v])))
+    
+    for landmark in chosen:
+        dist, _, _ = _shortest_path_tree(graph, landmark)
+        min_dist = [min(a, b) for a, b in zip(min_dist, dist)]
+    
+    while len(chosen) < k:
+        selected = set(chosen)
+        candidate = max((v for v in range(n) if v not in selected), key=lambda v: min_dist[v])
+        chosen.append(candidate)
+        dist, _, _ = _shortest_path_tree(graph, candidate)
+        min_dist = [min(a, b) for a, b in zip(min_dist, dist)]
+    
+    return chosen
+
+
+def _planar(
+    graph: CSRGraph,
+    k: int,
+    coordinates: Dict[str, Tuple[float, float]],
+    rng: random.Random
+) -> List[int]:
+    """
+    按角度把站点分到 k 个扇区，每个扇区取离中心最远的站点；空扇区用 farthest 补齐
+    """
+    names = graph.node_names
+    located = [v for v in range(graph.num_nodes) if names[v] in coordinates]
+    if not located:
+        return _farthest_fill(graph, [], k, rng)
+    
+    center_lat = sum(coordinates[names[v]][0] for v in located) / len(located)
+    center_lon = sum(coordinates[names[v]][1] for v in located) / len(located)
+    # 经度按纬度缩放，使扇区在地面上大致等角
+    lon_scale = math.cos(math.radians(center_lat))
+    
+    best = {}
+    for v in located:
+        lat, lon = coordinates[names[v]]
+        dy, dx = lat - center_lat, (lon - center_lon) * lon_scale
+        sector = int((math.atan2(dy, dx) + math.pi) / (2 * math.pi) * k) % k
+        radius = dx * dx + dy * dy
+        if sector not in best or radius > best[sector][0]:
+            best[sector] = (radius, v)
+    
+    chosen = [v for _, v in (best[s] for s in sorted(best))]
+    return _farthest_fill(graph, chosen, k, rng)
+
+
+def _avoid(graph: CSRGraph, k: int, rng: random.Random) -> Tuple[List[int], List[array]]:
+    """
+    avoid 策略，返回 (地标, 各地标的距离表)
+    
+    每轮取一个随机根 r 的最短路树，节点权重为 d(r, v) 减去当前地标给出的下界，
+    子树权重和（子树中含地标时记为0）最大的节点开始，沿权重最大的孩子走到叶子，叶子即新地标
+    """
+    n = graph.num_nodes
+    landmarks: List[int] = []
+    tables: List[array] = []
+    
+    while len(landmarks) < k:
+        root = rng.randrange(n)
+        dist, parent, settled = _shortest_path_tree(graph, root)
+        root_dists = [table[root] for table in tables]
+        
+        size = [0.0] * n
+        blocked = bytearray(n)
+        for v in landmarks:
+            blocked[v] = 1
+        
+        # 按出队顺序的逆序累加，孩子总是在父节点之前处理
+        for v in reversed(settled):
+            if not blocked[v]:
+                lower = max((abs(table[v] - d) for table, d in zip(tables, root_dists)), default=0)
+                size[v] += dist[v] - lower
+            p = parent[v]
+            if p != -1:
+                if blocked[v]:
+                    blocked[p] = 1
+                else:
+                    size[p] += size[v]
+        
+        for v in settled:
+            if blocked[v]:
+                size[v] = 0.0
+        
+        children: Dict[int, List[int]] = {}
+        for v in settled:
+            if parent[v] != -1 and size[v] > 0:
+                children.setdefault(parent[v], []).append(v)
+        
+        current = max(settled, key=lambda v: size[v])
+        if size[current] <= 0:
+            # 这棵树已经被现有地标完全覆盖，换一个还不是地标的随机节点
+            current = rng.choice([v for v in range(n) if v not in landmarks])
+        else:
+            while current in children:
+                current = max(children[current], key=lambda v: size[v])
+        
+        landmarks.append(current)
+        tables.append(_shortest_path_tree(graph, current)[0])
+    
+    return landmarks, tables
+
+
+def _max_cover(graph: CSRGraph, k: int, rng: random.Random, candidates_per_landmark: int = 4) -> List[int]:
+    """
+    maxcover：avoid 生成候选地标，贪心 + 交换局部搜索，最大化被覆盖的边数
+    边 (u, v) 被地标 L 覆盖指 |d(L, v) - d(L, u)| 等于边权，此时下界在这条边上是精确的
+    """
+    n = graph.num_nodes
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    candidates, tables = _avoid(graph, min(n, candidates_per_landmark * k), rng)
+    
+    # 每个候选覆盖的边集合，用整数位图表示
+    masks = []
+    for table in tables:
+        bits = bytearray(len(targets))
+        for u in range(n):
+            du = table[u]
+            if du == math.inf:
+                continue
+            for i in range(offsets[u], offsets[u + 1]):
+                dv = table[targets[i]]
+                if dv != math.inf and abs(abs(dv - du) - weights[i]) < 1e-9:
+                    bits[i] = 1
+        masks.append(int.from_bytes(bits, 'little'))
+    
+    def coverage(selection: List[int]) -> int:
+        covered = 0
+        for c in selection:
+            covered |= masks[c]
+        return bin(covered).count('1')
+    
+    # 贪心：每次加入新覆盖边最多的候选
+    selected: List[int] = []
+    covered = 0
+    for _ in range(min(k, len(candidates))):
+        best = max(
+            (c for c in range(len(candidates)) if c not in selected),
+            key=lambda c: bin(masks[c] & ~covered).count('1')
+        )
+        selected.append(best)
+        covered |= masks[best]
+    
+    # 交换：用未选的候选替换已选的，覆盖数增加就接受，直到没有改进
+    best_cover = coverage(selected)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(len(selected)):
+            for c in range(len(candidates)):
+                if c in selected:
+                    continue
+                trial = selected[:i] + [c] + selected[i + 1:]
+                cover = coverage(trial)
+                if cover > best_cover:
+                    selected, best_cover, improved = trial, cover, True
+    
+    return [candidates[c] for c in selected]
+
+
+def select_landmarks(
+    graph: Dict[str, List[Tuple[str, float]]],
+    num_landmarks: int,
+    strategy: str = 'avoid',
+    coordinates: Optional[Dict[str, Tuple[float, float]]] = None,
+    seed: Optional[int] = None
+) -> List[str]:
+    """
+    按指定策略为ALT选择地标，返回节点名列表
+    strategy: 见 LANDMARK_STRATEGIES；'planar' 需要站点坐标
+    seed: 随机种子（random / avoid / maxcover 以及 farthest 的起点都用到随机数）
+    """
+    if strategy not in LANDMARK_STRATEGIES:
+        raise ValueError(f"Unknown landmark strategy {strategy!r}, expected one of {LANDMARK_STRATEGIES}")
+    if strategy == 'planar' and coordinates is None:
+        raise ValueError("planar landmark selection needs station coordinates")
+    
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adjacency(graph)
+    k = min(num_landmarks, csr.num_nodes)
+    if k <= 0:
+        return []
+    rng = random.Random(seed)
+    
+    if strategy == 'random':
+        chosen = rng.sample(range(csr.num_nodes), k)
+    elif strategy == 'farthest':
+        chosen = _farthest_fill(csr, [], k, rng)
+    elif strategy == 'planar':
+        chosen = _planar(csr, k, coordinates, rng)
+    elif strategy == 'avoid':
+        chosen, _ = _avoid(csr, k, rng)
+    else:
+        chosen = _max_cover(csr, k, rng)
+    
+    return [csr.node_names[v] for v in chosen]
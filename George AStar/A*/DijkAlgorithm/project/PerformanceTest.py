@@ -24,12 +24,25 @@ class PerformanceTester:
     ) -> Dict[str, Any]:
         """
         测试单个算法的性能
+        
+        预处理（如ALT的地标距离表）单独计时，不计入每次查询的时间
         """
         times = []
         path_length = None
         path = None
         stats = None
         
+        try:
+            preprocess_start = time.perf_counter()
+            algorithm.preprocess(graph, landmarks)
+            preprocess_time = time.perf_counter() - preprocess_start
+        except Exception as e:
+            print(f"Error preprocessing {algorithm.get_algorithm_name()}: {e}")
+            return {
+                'algorithm': algorithm.get_algorithm_name(),
+                'error': str(e)
+            }
+        
         for _ in range(num_runs):
             start_time = time.perf_counter()
             
@@ -61,6 +74,7 @@ class PerformanceTester:
             'avg_time_ms': round(avg_time * 1000, 4),
             'min_time_ms': round(min_time * 1000, 4),
             'max_time_ms': round(max_time * 1000, 4),
+            'preprocess_time_ms': round(preprocess_time * 1000, 4),
             'num_runs': num_runs,
             'statistics': stats or {}
         }
@@ -68,6 +82,54 @@ class PerformanceTester:
         self.results.append(result)
         return result
     
+    def test_many(
+        self,
+        algorithm: ShortestPathInterface,
+        graph: Dict[str, List[Tuple[str, float]]],
+        pairs: List[Tuple[str, str]],
+        landmarks: List[str] = None,
+        num_runs: int = 1
+    ) -> Dict[str, Any]:
+        """
+        测试批量查询 compute_many 的性能（如OD矩阵）
+        
+        预处理单独计时；avg_time_ms 为平均到每个 (起点, 终点) 的时间。
+        结果格式与 test_algorithm 不同，不加入 self.results
+        """
+        times = []
+        results = []
+        
+        try:
+            preprocess_start = time.perf_counter()
+            algorithm.preprocess(graph, landmarks)
+            preprocess_time = time.perf_counter() - preprocess_start
+            
+            for _ in range(num_runs):
+                start_time = time.perf_counter()
+                results = algorithm.compute_many(graph, pairs, landmarks)
+                times.append(time.perf_counter() - start_time)
+        
+        except Exception as e:
+            print(f"Error testing {algorithm.get_algorithm_name()}: {e}")
+            return {
+                'algorithm': algorithm.get_algorithm_name(),
+                'error': str(e)
+            }
+        
+        avg_time = sum(times) / len(times) if times else 0
+        
+        return {
+            'algorithm': algorithm.get_algorithm_name(),
+            'num_pairs': len(pairs),
+            'num_sources': len({start for start, _ in pairs}),
+            'total_time_ms': round(avg_time * 1000, 4),
+            'avg_time_ms': round(avg_time * 1000 / len(pairs), 4) if pairs else 0,
+            'preprocess_time_ms': round(preprocess_time * 1000, 4),
+            'num_runs': num_runs,
+            'unreachable': sum(1 for result in results if result.distance == float('inf')),
+            'distances': [result.distance for result in results]
+        }
+    
     def compare_algorithms(
         self,
         algorithms: List[ShortestPathInterface],
@@ -86,7 +148,7 @@ class PerformanceTester:
             result = self.test_algorithm(
                 algorithm, graph, start, end, landmarks, num_runs
             )
-            
+        
         return self.results
     
     def print_comparison(self):
@@ -95,14 +157,14 @@ class PerformanceTester:
             print("No results to display.")
             return
         
-        print("\n" + "=" * 100)
+        print("\n" + "=" * 115)
         print("ALGORITHM PERFORMANCE COMPARISON")
-        print("=" * 100)
+        print("=" * 115)
         
         # 打印表头
-        header = f"{'Algorithm':<30} {'Path Length':<15} {'Nodes':<8} {'Avg Time (ms)':<15} {'Visited':<10} {'Expanded':<10}"
+        header = f"{'Algorithm':<30} {'Path Length':<15} {'Nodes':<8} {'Avg Time (ms)':<15} {'Preproc (ms)':<14} {'Visited':<10} {'Expanded':<10}"
         print(header)
-        print("-" * 100)
+        print("-" * 115)
         
         # 打印每个算法的结果
         for result in self.results:
@@ -114,14 +176,15 @@ class PerformanceTester:
             path_length = f"{result['path_length']:.2f}" if result['path_length'] != float('inf') else "No path"
             path_nodes = result['path_nodes']
             avg_time = f"{result['avg_time_ms']:.4f}"
+            preprocess_time = f"{result.get('preprocess_time_ms', 0):.4f}"
             
             stats = result.get('statistics', {})
             visited = stats.get('nodes_visited', 'N/A')
             expanded = stats.get('nodes_expanded', 'N/A')
             
-            print(f"{algo_name:<30} {path_length:<15} {path_nodes:<8} {avg_time:<15} {visited:<10} {expanded:<10}")
+            print(f"{algo_name:<30} {path_length:<15} {path_nodes:<8} {avg_time:<15} {preprocess_time:<14} {visited:<10} {expanded:<10}")
         
-        print("=" * 100)
+        print("=" * 115)
         
         # 找出最快的算法
         valid_results = [r for r in self.results if 'error' not in r and r['path_length'] != float('inf')]
@@ -151,3 +214,27 @@ class PerformanceTester:
             return float('inf')
         
         return baseline['avg_time_ms'] / compare['avg_time_ms']
+    
+    def get_amortized_speedup(
+        self,
+        baseline_algo: str,
+        compare_algo: str,
+        num_queries: int
+    ) -> float:
+        """
+        计算在 num_queries 次查询上摊销预处理时间后的加速比
+        总时间 = 预处理时间 + num_queries × 平均查询时间
+        """
+        baseline = next((r for r in self.results if r['algorithm'] == baseline_algo), None)
+        compare = next((r for r in self.results if r['algorithm'] == compare_algo), None)
+        
+        if not baseline or not compare or 'error' in baseline or 'error' in compare:
+            return 0.0
+        
+        baseline_total = baseline.get('preprocess_time_ms', 0) + num_queries * baseline['avg_time_ms']
+        compare_total = compare.get('preprocess_time_ms', 0) + num_queries * compare['avg_time_ms']
+        
+        if compare_total == 0:
+            return float('inf')
+        
+        return baseline_total / compare_total
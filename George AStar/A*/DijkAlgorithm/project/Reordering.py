@@ -0,0 +1,180 @@
+"""
+Reordering.py - CSR图的节点重排
+
+CSV里的节点顺序与图结构无关，相邻站点的ID可能相距很远，搜索时 dist / prev / 边数组
+的访问在内存中四处跳跃。重排把图上相近的节点放到相近的ID上：
+BFS序、逆Cuthill-McKee（RCM）序，或者按经纬度的Hilbert曲线序
+所有函数返回 order（order[新ID] = 旧ID），由 CSRGraph.permute 应用；节点名不变，
+所以调用方照常用站点名查询，重排对算法透明
+"""
+
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from project.CSRGraph import CSRGraph
+
+# reorder_graph 支持的方法
+REORDER_METHODS = ('bfs', 'rcm', 'hilbert')
+
+
+def _degrees(graph: CSRGraph) -> List[int]:
+    offsets = graph.offsets
+    return [offsets[v + 1] - offsets[v] for v in range(graph.num_nodes)]
+
+
+def bfs_order(graph: CSRGraph) -> array:
+    """
+    广度优先序：每个分量从其中ID最小的节点开始，按存储顺序访问邻居
+    """
+    n = graph.num_nodes
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(n)
+    order = array('i')
+    
+    for root in range(n):
+        if visited[root]:
+            continue
+        visited[root] = 1
+        queue = deque([root])
+        while queue:
+            u = queue.popleft()
+            order.append(u)
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if not visited[v]:
+                    visited[v] = 1
+                    queue.append(v)
+    
+    return order
+
+
+def _pseudo_peripheral(graph: CSRGraph, root: int, degrees: List[int]) -> int:
+    """
+    从 root 出发反复取BFS最远层中度数最小的节点，直到离心率不再增大（George-Liu）
+    """
+    offsets, targets = graph.offsets, graph.targets
+    eccentricity = -1
+    
+    while True:
+        level = {root: 0}
+        frontier = [root]
+        depth = 0
+        while frontier:
+            next_frontier = []
+            for u in frontier:
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = targets[i]
+                    if v not in level:
+                        level[v] = depth + 1
+                        next_frontier.append(v)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+            depth += 1
+        
+        if depth <= eccentricity:
+            return root
+        eccentricity = depth
+        root = min(frontier, key=lambda v: degrees[v])
+
+
+def rcm_order(graph: CSRGraph) -> array:
+    """
+    逆Cuthill-McKee序：每个分量从伪外围节点开始BFS，同层邻居按度数升序入队，最后整体反转
+    得到的邻接矩阵带宽小，边的两端ID相近
+    """
+    n = graph.num_nodes
+    offsets, targets = graph.offsets, graph.targets
+    degrees = _degrees(graph)
+    visited = bytearray(n)
+    order = []
+    
+    for root in sorted(range(n), key=lambda v: degrees[v]):
+        if visited[root]:
+            continue
+        start = _pseudo_peripheral(graph, root, degrees)
+        visited[start] = 1
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            order.append(u)
+            neighbors = [targets[i] for i in range(offsets[u], offsets[u + 1]) if not visited[targets[i]]]
+            neighbors.sort(key=lambda v: degrees[v])
+            for v in neighbors:
+                if not visited[v]:
+                    visited[v] = 1
+                    queue.append(v)
+    
+    order.reverse()
+    return array('i', order)
+
+
+def _hilbert_index(bits: int, x: int, y: int) -> int:
+    """(x, y) 在 2^bits x 2^bits 网格上的Hilbert曲线序号"""
+    d = 0
+    s = 1 << (bits - 1)
+    while s:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        d += s * s * ((3 * rx) ^ ry)
+        # 旋转象限
+        if ry == 0:
+            if rx == 1:
+                x = s - 1 - x
+                y = s - 1 - y
+            x, y = y, x
+        s >>= 1
+    return d
+
+
+def hilbert_order(
+    graph: CSRGraph,
+    coordinates: Dict[str, Tuple[float, float]],
+    bits: int = 16
+) -> array:
+    """
+    按站点经纬度在Hilbert曲线上的位置排序，地理上相近的站点ID相近
+    没有坐标的节点按原顺序排在最后
+    """
+    names = graph.node_names
+    located = [v for v in range(graph.num_nodes) if names[v] in coordinates]
+    missing = [v for v in range(graph.num_nodes) if names[v] not in coordinates]
+    if not located:
+        return array('i', missing)
+    
+    lats = [coordinates[names[v]][0] for v in located]
+    lons = [coordinates[names[v]][1] for v in located]
+    min_lat, min_lon = min(lats), min(lons)
+    span = max(max(lats) - min_lat, max(lons) - min_lon) or 1.0
+    scale = ((1 << bits) - 1) / span
+    
+    keys = {
+        v: _hilbert_index(bits, int((lon - min_lon) * scale), int((lat - min_lat) * scale))
+        for v, lat, lon in zip(located, lats, lons)
+    }
+    located.sort(key=lambda v: keys[v])
+    return array('i', located + missing)
+
+
+def reorder_graph(
+    graph: CSRGraph,
+    method: str = 'rcm',
+    coordinates: Optional[Dict[str, Tuple[float, float]]] = None
+) -> Tuple[CSRGraph, array]:
+    """
+    按指定方法重排节点，返回 (新图, order)；order[新ID] = 原ID，可用于把新ID映射回原图
+    method: 'bfs' / 'rcm' / 'hilbert'（hilbert 需要 coordinates）
+    """
+    if method == 'bfs':
+        order = bfs_order(graph)
+    elif method == 'rcm':
+        order = rcm_order(graph)
+    elif method == 'hilbert':
+        if coordinates is None:
+            raise ValueError("hilbert ordering needs station coordinates")
+        order = hilbert_order(graph, coordinates)
+    else:
+        raise ValueError(f"Unknown reorder method {method!r}, expected one of {REORDER_METHODS}")
+    
+    return graph.permute(order), order
@@ -0,0 +1,159 @@
+"""
+SearchSession.py - 可续跑的单源Dijkstra会话
+
+同一个起点到不同终点的一连串查询，每次从头搜索都会重复确定同一批节点。
+会话保存一次从起点出发的搜索的优先队列、距离、前驱和已确定集合：
+终点已经确定时直接重建路径；否则从保存的边界继续搜索，直到终点出队
+会话放在按 (起点, 图) 索引的小LRU中，图的版本即图对象本身
+（CSRGraph不可变；原地修改邻接表字典后需要调用 invalidate）
+"""
+
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from project.CSRGraph import CSRGraph
+from project.SearchWorkspace import SearchWorkspace, INF
+
+
+class DijkstraSession:
+    """
+    从 source 出发的一次可暂停的Dijkstra
+    CSR图使用会话独占的 SearchWorkspace（不归还到池中），邻接表字典使用字典和集合
+    同一时间只能有一个线程推进会话，调用方持有 lock
+    """
+    
+    def __init__(self, graph: Dict[str, List[Tuple[str, float]]], source: str):
+        self.graph = graph
+        self.source = source
+        self.lock = threading.Lock()
+        self.nodes_visited = 0
+        self.nodes_expanded = 0
+        
+        if isinstance(graph, CSRGraph):
+            source_id = graph.node_index[source]
+            self.workspace = SearchWorkspace(graph.num_nodes)
+            self.workspace.dist[source_id] = 0
+            self.pq = [(0, source_id)]
+        else:
+            self.dist = {source: 0}
+            self.prev = {source: None}
+            self.visited = set()
+            self.pq = [(0, source)]
+    
+    def settle(self, target: str) -> Tuple[float, List[str]]:
+        """
+        推进搜索直到 target 出队（或队列耗尽），返回 (距离, 路径)
+        已经确定的终点不做任何搜索；CSR图中没有的终点直接返回不可达
+        """
+        if isinstance(self.graph, CSRGraph):
+            target_id = self.graph.node_index.get(target)
+            if target_id is None:
+                return float('inf'), []
+            return self._settle_csr(target_id)
+        
+        graph, dist, prev, visited, pq = self.graph, self.dist, self.prev, self.visited, self.pq
+        while target not in visited and pq:
+            current_dist, current_node = heapq.heappop(pq)
+            if current_node in visited:
+                continue
+            visited.add(current_node)
+            self.nodes_visited += 1
+            
+            self.nodes_expanded += 1
+            for neighbor, weight in graph[current_node]:
+                distance = current_dist + weight
+                if distance < dist.get(neighbor, INF):
+                    dist[neighbor] = distance
+                    prev[neighbor] = current_node
+                    heapq.heappush(pq, (distance, neighbor))
+        
+        if target not in visited:
+            return float('inf'), []
+        path = []
+        node = target
+        while node is not None:
+            path.append(node)
+            node = prev[node]
+        path.reverse()
+        return dist[target], path
+    
+    def _settle_csr(self, target: int) -> Tuple[float, List[str]]:
+        """CSR图上的 settle，节点用整数ID"""
+        graph = self.graph
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        dist, prev, visited = self.workspace.dist, self.workspace.prev, self.workspace.visited
+        pq = self.pq
+        
+        while not visited[target] and pq:
+            current_dist, u = heapq.heappop(pq)
+            if visited[u]:
+                continue
+            visited[u] = 1
+            self.nodes_visited += 1
+            
+            self.nodes_expanded += 1
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                distance = current_dist + weights[i]
+                if distance < dist[v]:
+                    dist[v] = distance
+                    prev[v] = u
+                    heapq.heappush(pq, (distance, v))
+        
+        if not visited[target]:
+            return float('inf'), []
+        return dist[target], graph.reconstruct_path(prev, graph.node_index[self.source], target)
+
+
+class SessionCache:
+    """
+    按 (起点, 图) 索引的会话LRU，最多保留 max_sessions 个会话
+    只有图对象相同（is）才算命中；查找和淘汰在锁内完成，多个线程可以共享
+    """
+    
+    def __init__(self, max_sessions: int = 8):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def session(self, graph: Dict[str, List[Tuple[str, float]]], source: str) -> DijkstraSession:
+        """返回 graph 上从 source 出发的会话，没有时新建（可能淘汰最久未用的会话）"""
+        key = (source, id(graph))
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None and session.graph is graph:
+                self._sessions.move_to_end(key)
+                self.hits += 1
+                return session
+            
+            self.misses += 1
+            session = DijkstraSession(graph, source)
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+            return session
+    
+    def invalidate(self, graph: Optional[Dict[str, List[Tuple[str, float]]]] = None):
+        """丢弃 graph 上的所有会话（graph 为 None 时全部丢弃），图被原地修改后调用"""
+        with self._lock:
+            if graph is None:
+                self._sessions.clear()
+                return
+            for key in [key for key, session in self._sessions.items() if session.graph is graph]:
+                del self._sessions[key]
+    
+    def get_stats(self) -> Dict[str, int]:
+        """会话缓存的命中/未命中/淘汰次数和当前会话数"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'sessions': len(self._sessions)
+        }
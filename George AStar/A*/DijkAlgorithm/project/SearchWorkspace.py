@@ -0,0 +1,76 @@
+"""
+SearchWorkspace.py - CSR图搜索用的可复用工作区
+
+每次查询都重新分配 dist / prev / visited 数组需要 O(V) 的初始化；
+工作区为一张图预分配这些数组，查询中记录被改动过的节点，
+结束后只把这些节点恢复成初始值，所以局部查询的开销只与实际访问的节点数成正比
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, List
+
+INF = float('inf')
+
+
+class SearchWorkspace:
+    """
+    单次搜索使用的数组：
+    dist[v] 初始为 inf，prev[v] 初始为 -1，visited[v] 初始为 0，h_cache[v] 初始为 -1.0（A*启发值缓存）
+    搜索中第一次改动某个节点时把它加入 touched，reset() 只恢复 touched 中的节点
+    """
+    
+    def __init__(self, num_nodes: int):
+        self.num_nodes = num_nodes
+        self.dist = [INF] * num_nodes
+        self.prev = [-1] * num_nodes
+        self.visited = bytearray(num_nodes)
+        self.h_cache = [-1.0] * num_nodes
+        self.touched = []
+    
+    def reset(self):
+        """把本次搜索改动过的节点恢复为初始值，O(改动的节点数)"""
+        dist, prev, visited, h_cache = self.dist, self.prev, self.visited, self.h_cache
+        for v in self.touched:
+            dist[v] = INF
+            prev[v] = -1
+            visited[v] = 0
+            h_cache[v] = -1.0
+        self.touched = []
+
+
+class WorkspacePool:
+    """
+    工作区池：每个并发查询借用一个工作区，用完后重置并归还
+    list 的 pop / append 在 CPython 中是原子操作，所以多个线程可以共享同一个池
+    """
+    
+    def __init__(self, max_idle: int = 4):
+        """max_idle: 最多保留的空闲工作区数量"""
+        self.max_idle = max_idle
+        self._idle: List[SearchWorkspace] = []
+    
+    def acquire(self, num_nodes: int) -> SearchWorkspace:
+        """取出一个大小为 num_nodes 的工作区，没有时新建"""
+        while True:
+            try:
+                workspace = self._idle.pop()
+            except IndexError:
+                return SearchWorkspace(num_nodes)
+            if workspace.num_nodes == num_nodes:
+                return workspace
+            # 换了一张大小不同的图，旧的工作区直接丢弃
+    
+    def release(self, workspace: SearchWorkspace):
+        """重置工作区并放回池中"""
+        workspace.reset()
+        if len(self._idle) < self.max_idle:
+            self._idle.append(workspace)
+    
+    @contextmanager
+    def borrow(self, num_nodes: int) -> Iterator[SearchWorkspace]:
+        """with pool.borrow(n) as workspace: ... 结束时自动归还"""
+        workspace = self.acquire(num_nodes)
+        try:
+            yield workspace
+        finally:
+            self.release(workspace)
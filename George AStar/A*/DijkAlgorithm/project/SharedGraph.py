@@ -0,0 +1,73 @@
+"""
+SharedGraph.py - 通过 multiprocessing.shared_memory 在进程间共享CSR图
+
+主进程把CSR图的三个数组复制到一块共享内存，子进程根据描述信息直接映射，
+不需要重新解析CSV，也不会为每个子进程复制一份边数组
+"""
+
+from array import array
+from multiprocessing import shared_memory
+from typing import Any, Dict, Tuple
+
+from project.CSRGraph import CSRGraph
+
+_ALIGN = 8
+_ARRAYS = ('offsets', 'targets', 'weights')
+
+
+def share_graph(graph: CSRGraph) -> Tuple[shared_memory.SharedMemory, Dict[str, Any]]:
+    """
+    把CSR图放进一块新的共享内存
+    
+    返回 (共享内存, 描述信息)；描述信息可以pickle后传给子进程，
+    共享内存由调用方在所有子进程结束后 close() 并 unlink()
+    """
+    layout = {}
+    offset = 0
+    views = {}
+    for name in _ARRAYS:
+        view = memoryview(getattr(graph, name))
+        offset = (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+        layout[name] = (view.format, offset, len(view))
+        views[name] = view
+        offset += view.nbytes
+    
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for name, view in views.items():
+        _, start, _ = layout[name]
+        shm.buf[start:start + view.nbytes] = view.cast('B')
+    
+    descriptor = {
+        'shm_name': shm.name,
+        'node_names': graph.node_names,
+        'layout': layout
+    }
+    return shm, descriptor
+
+
+def attach_graph(descriptor: Dict[str, Any]) -> Tuple[shared_memory.SharedMemory, CSRGraph]:
+    """
+    在子进程中按描述信息映射共享的CSR图（零拷贝，只读使用）
+    用完后调用 detach_graph 释放映射
+    """
+    shm = shared_memory.SharedMemory(name=descriptor['shm_name'])
+    
+    arrays = []
+    for name in _ARRAYS:
+        typecode, start, length = descriptor['layout'][name]
+        end = start + array(typecode).itemsize * length
+        arrays.append(shm.buf[start:end].cast(typecode))
+    
+    graph = CSRGraph(descriptor['node_names'], *arrays)
+    return shm, graph
+
+
+def detach_graph(shm: shared_memory.SharedMemory, graph: CSRGraph) -> None:
+    """
+    释放 attach_graph 得到的数组视图并关闭共享内存（不删除）
+    之后不能再使用该图
+    """
+    for name in _ARRAYS:
+        getattr(graph, name).release()
+    shm.close()
+
@@ -0,0 +1,160 @@
+"""
+Storage.py - 预处理结果的二进制存储格式
+
+文件结构：魔数(8字节) + JSON头部长度(uint64) + JSON头部 + 按8字节对齐的数组数据
+JSON头部记录每个数组的类型码、偏移和长度，以及调用方的元数据
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Tuple, Any, Sequence, Iterator
+
+MAGIC = b'SPSTORE1'
+_ALIGN = 8
+
+
+def save_arrays(
+    filepath: str,
+    meta: Dict[str, Any],
+    arrays: Dict[str, array]
+) -> None:
+    """
+    将元数据和若干 array.array 写入一个文件
+    先写到同目录下的临时文件再替换，写入中途被打断时不会留下不完整的文件
+    """
+    layout = {}
+    offset = 0
+    for name, arr in arrays.items():
+        offset = (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+        layout[name] = [arr.typecode, offset, len(arr)]
+        offset += arr.itemsize * len(arr)
+    
+    header = json.dumps({
+        'byteorder': sys.byteorder,
+        'arrays': layout,
+        'meta': meta
+    }).encode('utf-8')
+    # 数据区从8字节对齐的位置开始
+    data_start = len(MAGIC) + 8 + len(header)
+    padding = (-data_start) % _ALIGN
+    
+    temp_file = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(temp_file, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<Q', len(header) + padding))
+            f.write(header)
+            f.write(b' ' * padding)
+            written = 0
+            for name, arr in arrays.items():
+                start = layout[name][1]
+                f.write(b'\0' * (start - written))
+                f.write(arr.tobytes())
+                written = start + arr.itemsize * len(arr)
+        os.replace(temp_file, filepath)
+    except OSError:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def graph_signature(graph: Mapping) -> str:
+    """
+    图内容（节点、边和权重）的摘要，写进预处理文件的元数据中；
+    加载时摘要不同说明图已经变了（例如重新生成了数据），需要重新预处理
+    """
+    digest = hashlib.sha1()
+    for name, neighbors in graph.items():
+        digest.update(f"{name}\0".encode('utf-8'))
+        for neighbor, weight in neighbors:
+            digest.update(f"{neighbor}\t{float(weight)!r}\n".encode('utf-8'))
+        digest.update(b'\1')
+    return digest.hexdigest()
+
+
+def _read_header(f, filepath: str) -> Tuple[Dict[str, Any], int]:
+    """读取并校验文件头，返回 (JSON头部, 数据区起始偏移)"""
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{filepath} is not a storage file")
+    size = f.read(8)
+    if len(size) != 8:
+        raise ValueError(f"{filepath} is truncated")
+    header_len = struct.unpack('<Q', size)[0]
+    header = json.loads(f.read(header_len).decode('utf-8'))
+    
+    if header['byteorder'] != sys.byteorder:
+        raise ValueError(f"{filepath} was written on a {header['byteorder']}-endian machine")
+    
+    return header, len(MAGIC) + 8 + header_len
+
+
+def load_arrays(
+    filepath: str,
+    use_mmap: bool = False
+) -> Tuple[Dict[str, Any], Dict[str, Sequence]]:
+    """
+    读取 save_arrays 写入的文件，返回 (元数据, {数组名: 数组})
+    
+    use_mmap=True 时数组为指向内存映射文件的只读 memoryview（零拷贝，
+    多个进程打开同一文件时共享同一份物理内存）；否则返回 array.array 副本
+    """
+    if use_mmap:
+        mapped = MappedArrays(filepath)
+        return mapped.meta, {name: mapped[name] for name in mapped}
+    
+    with open(filepath, 'rb') as f:
+        header, _ = _read_header(f, filepath)
+        data = f.read()
+    
+    arrays = {}
+    for name, (typecode, offset, length) in header['arrays'].items():
+        arr = array(typecode)
+        size = arr.itemsize * length
+        chunk = data[offset:offset + size]
+        if len(chunk) != size:
+            raise ValueError(f"{filepath} is truncated: array '{name}' is incomplete")
+        arr.frombytes(chunk)
+        arrays[name] = arr
+    
+    return header['meta'], arrays
+
+
+class MappedArrays(Mapping):
+    """
+    以内存映射方式打开 save_arrays 写入的文件
+    
+    打开时只解析头部；按名字取数组时才生成指向映射区的只读 memoryview，
+    所以文件里有成千上万个数组时，取其中任意一个也是 O(1)
+    """
+    
+    def __init__(self, filepath: str):
+        with open(filepath, 'rb') as f:
+            header, self._data_start = _read_header(f, filepath)
+            self._buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        self._filepath = filepath
+        self.meta = header['meta']
+        self._layout = header['arrays']
+    
+    def __getitem__(self, name: str) -> memoryview:
+        typecode, offset, length = self._layout[name]
+        start = self._data_start + offset
+        size = array(typecode).itemsize * length
+        view = self._buffer[start:start + size]
+        if len(view) != size:
+            raise ValueError(f"{self._filepath} is truncated: array '{name}' is incomplete")
+        return view.cast(typecode)
+    
+    def __contains__(self, name) -> bool:
+        return name in self._layout
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layout)
+    
+    def __len__(self) -> int:
+        return len(self._layout)
@@ -1,26 +1,74 @@
 """
 Project: Shortest Path Algorithms Comparison
 Author: George
-Description: 实现和比较多种最短路径算法（Dijkstra, A*, ALT）
+Description: 实现和比较多种最短路径算法（Dijkstra, 桶队列Dijkstra, A*, ALT, 双向Dijkstra, CH, Hub Labeling）
 """
 
 __version__ = '2.0.0'
 __author__ = 'George'
 
-from .Interface import ShortestPathInterface
+from .Interface import ShortestPathInterface, QueryResult
+from .CSRGraph import CSRGraph
+from .Components import ComponentIndex
+from .Reordering import reorder_graph, bfs_order, rcm_order, hilbert_order
+from .SearchWorkspace import SearchWorkspace, WorkspacePool
+from .SearchSession import DijkstraSession, SessionCache
 from .Dijkstra import DijkstraShortestPath
+from .BucketDijkstra import BucketDijkstraShortestPath, DialQueue, RadixHeap
 from .AStarShortestPath import AStarShortestPath
-from .AltShortestPath import AltShortestPath
-from .DataLoader import MetroDataLoader
+from .AltShortestPath import AltShortestPath, LandmarkTables
+from .Landmarks import select_landmarks, LANDMARK_STRATEGIES
+from .LandmarkStore import QUANTIZATION_TYPECODES, quantize_landmark_matrix, save_landmark_store, load_landmark_store
+from .BidirectionalDijkstra import BidirectionalDijkstraShortestPath
+from .ContractionHierarchies import ContractionHierarchyShortestPath
+from .HubLabeling import HubLabels, HubLabelShortestPath, build_hub_labels
+from .ChainContraction import Chain, ChainContraction, ChainContractedShortestPath, contract_chains
+from .SharedGraph import share_graph, attach_graph, detach_graph
+from .DataLoader import MetroDataLoader, deep_sizeof, estimate_graph_bytes
 from .PerformanceTest import PerformanceTester
 from .Visualizer import Visualizer
 
 __all__ = [
     'ShortestPathInterface',
+    'QueryResult',
+    'CSRGraph',
+    'ComponentIndex',
+    'reorder_graph',
+    'bfs_order',
+    'rcm_order',
+    'hilbert_order',
+    'SearchWorkspace',
+    'WorkspacePool',
+    'DijkstraSession',
+    'SessionCache',
     'DijkstraShortestPath',
+    'BucketDijkstraShortestPath',
+    'DialQueue',
+    'RadixHeap',
     'AStarShortestPath',
     'AltShortestPath',
+    'LandmarkTables',
+    'select_landmarks',
+    'LANDMARK_STRATEGIES',
+    'QUANTIZATION_TYPECODES',
+    'quantize_landmark_matrix',
+    'save_landmark_store',
+    'load_landmark_store',
+    'BidirectionalDijkstraShortestPath',
+    'ContractionHierarchyShortestPath',
+    'HubLabels',
+    'HubLabelShortestPath',
+    'build_hub_labels',
+    'Chain',
+    'ChainContraction',
+    'ChainContractedShortestPath',
+    'contract_chains',
+    'share_graph',
+    'attach_graph',
+    'detach_graph',
     'MetroDataLoader',
+    'deep_sizeof',
+    'estimate_graph_bytes',
     'PerformanceTester',
     'Visualizer'
 ]
@@ -0,0 +1,137 @@
+# src/components.py
+"""
+Component labels for O(1) rejection of unreachable queries.
+
+Graph is directed, so two labels are kept per node:
+  - the weakly connected component (union-find over edges, direction ignored);
+    different weak components can never reach each other;
+  - the strongly connected component (iterative Tarjan), numbered in
+    topological order of the condensation, so every edge between two
+    different SCCs goes from a smaller id to a larger one. u can only reach v
+    if scc[u] <= scc[v].
+Both tests are necessary conditions; a query that passes them still needs a search.
+"""
+
+
+def _successors(graph):
+    """Return (names, successor id lists) for a Graph or CSRGraph."""
+    if hasattr(graph, "offsets"):
+        offsets, targets = graph.offsets, graph.targets
+        succ = [targets[offsets[i]:offsets[i + 1]] for i in range(len(graph.names))]
+        return list(graph.names), succ
+    names = graph.nodes()
+    index = {n: i for i, n in enumerate(names)}
+    succ = [[index[v] for v, _ in graph.neighbors(u)] for u in names]
+    return names, succ
+
+
+def weakly_connected_components(n, succ):
+    """Union-find over the edges (direction ignored). Returns a list of labels 0..k-1."""
+    parent = list(range(n))
+    for u in range(n):
+        for v in succ[u]:
+            # path halving
+            a, b = u, v
+            while parent[a] != a:
+                parent[a] = a = parent[parent[a]]
+            while parent[b] != b:
+                parent[b] = b = parent[parent[b]]
+            if a != b:
+                if a < b:
+                    parent[b] = a
+                else:
+                    parent[a] = b
+
+    labels = [0] * n
+    root_label = {}
+    for node in range(n):
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        labels[node] = root_label.setdefault(root, len(root_label))
+    return labels
+
+
+def strongly_connected_components(n, succ):
+    """
+    Iterative Tarjan. Returns (labels, count) where labels are in topological
+    order of the condensation (edges between SCCs go from smaller to larger labels).
+    """
+    index = [-1] * n
+    low = [0] * n
+    on_stack = bytearray(n)
+    stack = []
+    emitted = [0] * n      # Tarjan emits SCCs sink-first; reversed below
+    count = 0
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, 0)]
+
+        while work:
+            u, i = work[-1]
+            edges = succ[u]
+            if i < len(edges):
+                work[-1] = (u, i + 1)
+                v = edges[i]
+                if index[v] == -1:
+                    index[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack[v] = 1
+                    work.append((v, 0))
+                elif on_stack[v] and index[v] < low[u]:
+                    low[u] = index[v]
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[u] < low[parent]:
+                    low[parent] = low[u]
+            if low[u] == index[u]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = 0
+                    emitted[w] = count
+                    if w == u:
+                        break
+                count += 1
+
+    return [count - 1 - label for label in emitted], count
+
+
+class ComponentIndex:
+    """
+    Weak and strong component labels of one graph.
+
+    may_reach(u, v) is False only when u provably cannot reach v; nodes the
+    index does not know are left to the search (True).
+    """
+
+    def __init__(self, graph):
+        names, succ = _successors(graph)
+        self.index = {name: i for i, name in enumerate(names)}
+        self.weak = weakly_connected_components(len(names), succ)
+        self.strong, self.num_strong = strongly_connected_components(len(names), succ)
+        self.num_weak = max(self.weak) + 1 if names else 0
+
+    def may_reach(self, u, v):
+        """Constant-time necessary condition for a u -> v path."""
+        i = self.index.get(u)
+        j = self.index.get(v)
+        if i is None or j is None:
+            return True
+        return self.weak[i] == self.weak[j] and self.strong[i] <= self.strong[j]
+
+    def same_strong_component(self, u, v):
+        """True when u and v reach each other."""
+        i = self.index.get(u)
+        j = self.index.get(v)
+        return i is not None and j is not None and self.strong[i] == self.strong[j]
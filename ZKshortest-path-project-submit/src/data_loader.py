@@ -1,6 +1,7 @@
 # src/data_loader.py
 import json
 import csv
+from graph import CSRGraph
 
 def load_from_dict_format():
     """
@@ -42,12 +43,15 @@ def load_from_csv(filepath):
                 data[v] = {}
     return data
 
-def load_metro_adjacency(filepath):
+def load_metro_adjacency(filepath, compact=False):
     """
     Load adjacency.json generated by metro scripts (nyc/london/chicago)
     Format: { "node_id": {"neighbor_id": weight, ...} }
-    Returns dict directly usable by Graph.load_from_dict
+    Returns dict directly usable by Graph.load_from_dict,
+    or a CSRGraph (int node IDs, array storage) when compact=True
     """
     with open(filepath, "r", encoding="utf-8") as f:
         data = json.load(f)
+    if compact:
+        return CSRGraph.from_dict(data)
     return data  # Already in correct {u: {v: w}} format
\ No newline at end of file
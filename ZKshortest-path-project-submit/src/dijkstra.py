@@ -1,19 +1,39 @@
 # src/dijkstra.py
 
 import heapq
+from graph import CSRGraph
 
-def dijkstra(graph, start):
+def dijkstra(graph, start, method="auto"):
     """
     Compute shortest paths using Dijkstra's algorithm.
 
     Args:
       graph: Graph instance (containing adj).
       start: The starting node (must exist in the graph).
+      method: "heap" for the binary-heap search, "bfs" for the breadth-first
+        fast path (only valid when every weight is 0 or one common value c > 0,
+        e.g. the hop-count metro adjacency files), or "auto" to pick "bfs"
+        whenever the weights allow it.
 
     Returns:
       dist: A dictionary {node: distance}.
       prev: A dictionary {node: predecessor}.
     """
+    if method not in ("auto", "heap", "bfs"):
+        raise ValueError(f"Unknown method {method!r}")
+
+    if method != "heap":
+        uniform = _has_uniform_weights(graph)
+        if method == "bfs" and not uniform:
+            raise ValueError("BFS requires all edge weights to be 0 or one common positive value")
+        if uniform:
+            if isinstance(graph, CSRGraph):
+                return _bfs_csr(graph, start)
+            return _bfs(graph, start)
+
+    if isinstance(graph, CSRGraph):
+        return _dijkstra_csr(graph, start)
+
     # Initialization
     dist = {node: float("inf") for node in graph.nodes()}
     prev = {node: None for node in graph.nodes()}
@@ -44,6 +64,172 @@ def dijkstra(graph, start):
     return dist, prev
 
 
+def _dijkstra_csr(graph, start):
+    """
+    Dijkstra over a CSRGraph: int node IDs and flat lists instead of dicts.
+    The result is converted back to name-keyed dist/prev dictionaries.
+    """
+    if start not in graph.index:
+        raise ValueError(f"Start node {start} not found in graph")
+
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = len(graph.names)
+    dist = [float("inf")] * n
+    prev = [-1] * n
+
+    s = graph.index[start]
+    dist[s] = 0
+    pq = [(0, s)]
+
+    while pq:
+        curr_dist, u = heapq.heappop(pq)
+        if curr_dist > dist[u]:
+            continue
+
+        for i in range(offsets[u], offsets[u + 1]):
+            w = weights[i]
+            if w < 0:
+                raise ValueError("Dijkstra does not support negative edge weights")
+
+            v = targets[i]
+            alt = curr_dist + w
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+                heapq.heappush(pq, (alt, v))
+
+    names = graph.names
+    return (
+        dict(zip(names, dist)),
+        {names[v]: (names[p] if p != -1 else None) for v, p in enumerate(prev)},
+    )
+
+
+def _has_uniform_weights(graph):
+    """
+    True if every edge weight is either 0 or the same positive value c.
+    """
+    if isinstance(graph, CSRGraph):
+        weights = set(graph.weights)
+    else:
+        weights = set(graph.weight_values)
+    weights.discard(0)
+    return len(weights) <= 1 and all(w > 0 for w in weights)
+
+
+def _bfs(graph, start):
+    """
+    Level-synchronous BFS for graphs whose weights are all 0 or c.
+
+    All nodes at distance d form one level. A level is processed in the
+    order the heap-based search would pop it, i.e. by node name (the heap
+    tie-break on equal distances), and nodes reached over 0-weight edges
+    join the current level, as in 0-1 BFS. Because nodes are settled in
+    exactly the same order as in the heap search, dist and prev are
+    identical to the "heap" method, not just equally short.
+    """
+    nodes = graph.nodes()
+    dist = dict.fromkeys(nodes, float("inf"))
+    prev = dict.fromkeys(nodes)
+
+    if start not in dist:
+        raise ValueError(f"Start node {start} not found in graph")
+
+    has_zero = 0 in graph.weight_values
+    adj = graph.adj
+    dist[start] = 0
+    level = [start]
+
+    while level:
+        level_dist = dist[level[0]]
+        next_level = []
+
+        if has_zero:
+            heapq.heapify(level)
+            while level:
+                u = heapq.heappop(level)
+                for v, w in adj[u]:
+                    alt = level_dist + w
+                    if alt < dist[v]:
+                        dist[v] = alt
+                        prev[v] = u
+                        if w:
+                            next_level.append(v)
+                        else:
+                            heapq.heappush(level, v)
+            # Drop nodes that were later pulled into this level via a 0-weight edge
+            level = [v for v in next_level if dist[v] != level_dist]
+        else:
+            # No 0-weight edges: the first visit is final, a sorted level is the heap order
+            level.sort()
+            for u in level:
+                for v, w in adj[u]:
+                    alt = level_dist + w
+                    if alt < dist[v]:
+                        dist[v] = alt
+                        prev[v] = u
+                        next_level.append(v)
+            level = next_level
+
+    return dist, prev
+
+
+def _bfs_csr(graph, start):
+    """
+    _bfs over a CSRGraph (int IDs, so the level order is by ID like the heap).
+    """
+    if start not in graph.index:
+        raise ValueError(f"Start node {start} not found in graph")
+
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = len(graph.names)
+    dist = [float("inf")] * n
+    prev = [-1] * n
+
+    has_zero = 0 in weights
+    s = graph.index[start]
+    dist[s] = 0
+    level = [s]
+
+    while level:
+        level_dist = dist[level[0]]
+        next_level = []
+
+        if has_zero:
+            heapq.heapify(level)
+            while level:
+                u = heapq.heappop(level)
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = targets[i]
+                    w = weights[i]
+                    alt = level_dist + w
+                    if alt < dist[v]:
+                        dist[v] = alt
+                        prev[v] = u
+                        if w:
+                            next_level.append(v)
+                        else:
+                            heapq.heappush(level, v)
+            level = [v for v in next_level if dist[v] != level_dist]
+        else:
+            level.sort()
+            for u in level:
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = targets[i]
+                    alt = level_dist + weights[i]
+                    if alt < dist[v]:
+                        dist[v] = alt
+                        prev[v] = u
+                        next_level.append(v)
+            level = next_level
+
+    names = graph.names
+    return (
+        dict(zip(names, dist)),
+        {names[v]: (names[p] if p != -1 else None) for v, p in enumerate(prev)},
+    )
+
+
 def reconstruct_path(prev, target):
     """
     Reconstruct the path from source to target using the prev dictionary.
@@ -59,4 +245,19 @@ def reconstruct_path(prev, target):
         cur = prev[cur]
     
     path.reverse()
-    return path
\ No newline at end of file
+    return path
+
+def shortest_path(graph, start, target, method="auto"):
+    """
+    Single-pair query: returns (distance, path).
+
+    Uses graph.components() to answer (inf, []) in O(1) when start provably
+    cannot reach target, instead of exhausting start's whole component.
+    """
+    if start != target and not graph.components().may_reach(start, target):
+        return float("inf"), []
+    dist, prev = dijkstra(graph, start, method)
+    d = dist.get(target, float("inf"))
+    if d == float("inf"):
+        return d, []
+    return d, reconstruct_path(prev, target)
@@ -1,12 +1,20 @@
 # src/graph.py
+from array import array
+from components import ComponentIndex
 
 class Graph:
     def __init__(self):
         # Adjacency list: { node: [(neighbor, weight), ...], ... }
         self.adj = {}
+        # Distinct edge weights, lets dijkstra() spot hop-count graphs without a scan
+        self.weight_values = set()
+        # Component labels, built on first use and dropped whenever an edge is added
+        self._components = None
 
     def add_edge(self, u, v, w):
         """Add a directed edge u -> v with weight w."""
+        self.weight_values.add(w)
+        self._components = None
         if u not in self.adj:
             self.adj[u] = []
         self.adj[u].append((v, w))
@@ -24,6 +32,12 @@ class Graph:
         """Return a list of all nodes in the graph."""
         return list(self.adj.keys())
 
+    def components(self):
+        """ComponentIndex of the current graph (cached until the next add_edge)."""
+        if self._components is None:
+            self._components = ComponentIndex(self)
+        return self._components
+
     def load_from_dict(self, data_dict):
         """
         Load graph from a dictionary format: { u: { v: weight, ... }, ... }
@@ -31,4 +45,91 @@ class Graph:
         """
         for u, nbrs in data_dict.items():
             for v, w in nbrs.items():
-                self.add_edge(u, v, w)
\ No newline at end of file
+                self.add_edge(u, v, w)
+
+class CSRGraph:
+    """
+    Frozen compressed-sparse-row graph.
+
+    Node names are interned to contiguous ints. The out-edges of node i are
+    targets[offsets[i]:offsets[i + 1]] with matching entries in weights.
+    Exposes the same nodes()/neighbors() API as Graph, so it can be passed
+    to dijkstra() directly.
+    """
+
+    __slots__ = ("names", "index", "offsets", "targets", "weights", "_components")
+
+    def __init__(self, names, offsets, targets, weights):
+        if len(offsets) != len(names) + 1 or offsets[-1] != len(targets):
+            raise ValueError("offsets do not match names/targets")
+        if len(targets) != len(weights):
+            raise ValueError("targets and weights must have the same length")
+        object.__setattr__(self, "names", tuple(names))
+        object.__setattr__(self, "index", {n: i for i, n in enumerate(self.names)})
+        object.__setattr__(self, "offsets", offsets)
+        object.__setattr__(self, "targets", targets)
+        object.__setattr__(self, "weights", weights)
+        object.__setattr__(self, "_components", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CSRGraph is immutable")
+
+    @classmethod
+    def from_dict(cls, data_dict):
+        """
+        Build from { u: { v: weight, ... }, ... } (same input as Graph.load_from_dict).
+        """
+        names = list(data_dict.keys())
+        index = {n: i for i, n in enumerate(names)}
+        for nbrs in data_dict.values():
+            for v in nbrs:
+                if v not in index:
+                    index[v] = len(names)
+                    names.append(v)
+
+        offsets = array("i", [0])
+        targets = array("i")
+        weights = array("d")
+        for u in names:
+            for v, w in data_dict.get(u, {}).items():
+                targets.append(index[v])
+                weights.append(w)
+            offsets.append(len(targets))
+        return cls(names, offsets, targets, weights)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Build from a Graph instance (keeps parallel edges)."""
+        names = graph.nodes()
+        index = {n: i for i, n in enumerate(names)}
+        offsets = array("i", [0])
+        targets = array("i")
+        weights = array("d")
+        for u in names:
+            for v, w in graph.neighbors(u):
+                targets.append(index[v])
+                weights.append(w)
+            offsets.append(len(targets))
+        return cls(names, offsets, targets, weights)
+
+    def neighbors(self, u):
+        """Return a list of (neighbor, weight) tuples (name based, slower path)."""
+        i = self.index.get(u)
+        if i is None:
+            return []
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return [(self.names[v], w) for v, w in zip(self.targets[lo:hi], self.weights[lo:hi])]
+
+    def nodes(self):
+        """Return a list of all nodes in the graph."""
+        return list(self.names)
+
+    def components(self):
+        """ComponentIndex of the graph, built once (the graph is immutable)."""
+        if self._components is None:
+            object.__setattr__(self, "_components", ComponentIndex(self))
+        return self._components
+
+    def num_edges(self):
+        """Number of directed edges."""
+        return len(self.targets)
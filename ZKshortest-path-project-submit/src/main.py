@@ -2,6 +2,9 @@
 from graph import Graph
 from dijkstra import dijkstra, reconstruct_path
 from data_loader import load_from_dict_format, load_from_json, load_from_csv, load_metro_adjacency
+from spt_store import SPTStore, dataset_hash
+import hashlib
+import os
 import sys
 
 def build_graph_from_data(data_dict):
@@ -21,27 +24,68 @@ def demo_with_temp_data():
     path = reconstruct_path(prev, target)
     print("\nExample path (A -> D):", " -> ".join(path) if path else "No path")
 
+def load_data(fmt, filepath):
+    if fmt == "json":
+        return load_from_json(filepath)
+    if fmt == "csv":
+        return load_from_csv(filepath)
+    if fmt == "metro":  # Support metro adjacency.json
+        return load_metro_adjacency(filepath)
+    raise ValueError(f"Unknown format {fmt!r}")
+
+def spt_cache_dir(filepath):
+    """
+    Per-dataset shortest-path-tree directory under the user cache
+    ($XDG_CACHE_HOME or ~/.cache), keyed by the dataset's absolute path,
+    so nothing is written next to the datasets in the repository.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    key = hashlib.sha1(os.path.abspath(filepath).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_home, "zk-shortest-path", f"{os.path.basename(filepath)}-{key}")
+
+def shortest_paths(fmt, filepath, start, target=None):
+    """
+    Distances from start to every node and the path to target (None without a target).
+    The tree is read from spt_cache_dir(filepath) when the dataset file is unchanged,
+    otherwise computed with dijkstra() and stored there; if the store cannot be
+    written, the fresh search is used as is.
+    """
+    store = SPTStore(spt_cache_dir(filepath))
+    digest = dataset_hash(filepath)
+    tree = store.open(digest, start)
+    if tree is None:
+        g = build_graph_from_data(load_data(fmt, filepath))
+        dist, prev = dijkstra(g, start)
+        store.save(digest, start, dist, prev)
+        return dist, reconstruct_path(prev, target) if target else None
+    try:
+        return dict(tree.distances()), tree.path(target) if target else None
+    finally:
+        tree.close()
+
 if __name__ == "__main__":
-    if len(sys.argv) == 1:
+    # --no-cache: always search, never read or write the shortest-path-tree store
+    use_cache = "--no-cache" not in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--no-cache"]
+
+    if not args:
         demo_with_temp_data()
     else:
-        fmt = sys.argv[1].lower()
-        filepath = sys.argv[2]
-        start = sys.argv[3]
-        target = sys.argv[4] if len(sys.argv) > 4 else None
-
-        if fmt == "json":
-            data = load_from_json(filepath)
-        elif fmt == "csv":
-            data = load_from_csv(filepath)
-        elif fmt == "metro":  # Support metro adjacency.json
-            data = load_metro_adjacency(filepath)
-        else:
+        fmt = args[0].lower()
+        filepath = args[1]
+        start = args[2]
+        target = args[3] if len(args) > 3 else None
+
+        if fmt not in ("json", "csv", "metro"):
             print("Error: Format must be 'json', 'csv' or 'metro'")
             sys.exit(1)
 
-        g = build_graph_from_data(data)
-        dist, prev = dijkstra(g, start)
+        if use_cache:
+            dist, path = shortest_paths(fmt, filepath, start, target)
+        else:
+            g = build_graph_from_data(load_data(fmt, filepath))
+            dist, prev = dijkstra(g, start)
+            path = reconstruct_path(prev, target) if target else None
 
         print(f"Shortest distances (in transfers) from {start} to all stations:")
         for node, d in sorted(dist.items()):
@@ -51,7 +95,6 @@ if __name__ == "__main__":
                 print(f"{start} -> {node}: inf (unreachable)")
 
         if target:
-            path = reconstruct_path(prev, target)
             if path and len(path) > 1:
                 print(f"\nShortest path ({start} -> {target}), {len(path)-1} transfers ({len(path)} stations):")
                 print(" -> ".join(path))
@@ -0,0 +1,187 @@
+# src/spt_store.py
+"""
+On-disk store of shortest-path trees.
+
+dijkstra(g, start) already answers every target from start, so the tree is
+written once and reused: one file per (dataset hash, source) holding a JSON
+header (node names, source, dataset hash) followed by packed arrays:
+dist (float64), prev (int32 node IDs, -1 for none) and one byte per node
+marking distances that dijkstra() returned as int. Later runs
+memory-map the file and answer distance and path lookups without loading
+the graph or searching. The dataset hash is the SHA-256 of the adjacency
+file, so editing the file makes every old tree miss and get rebuilt.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"ZKSPT001"
+_ALIGN = 8
+
+
+def dataset_hash(filepath):
+    """SHA-256 hex digest of the dataset file's bytes."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_tree(filepath, digest, source, dist, prev):
+    """
+    Write the dist/prev dictionaries returned by dijkstra() to filepath.
+    The file is written to a temporary name first, so readers never see a partial tree.
+    """
+    names = list(dist)
+    index = {n: i for i, n in enumerate(names)}
+    dist_array = array("d", (dist[n] for n in names))
+    prev_array = array("i", (index[prev[n]] if prev.get(n) is not None else -1 for n in names))
+    # dist[start] is the int 0 and hop-count graphs give int distances; keep them ints on lookup
+    ints = bytes(isinstance(dist[n], int) for n in names)
+
+    header = json.dumps({
+        "byteorder": sys.byteorder,
+        "dataset_hash": digest,
+        "source": source,
+        "names": names,
+    }).encode("utf-8")
+    padding = (-(len(MAGIC) + 8 + len(header))) % _ALIGN
+    header += b" " * padding
+
+    # Per-process temp name, so concurrent runs never write into each other's file
+    tmp = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            f.write(dist_array.tobytes())
+            f.write(prev_array.tobytes())
+            f.write(ints)
+        os.replace(tmp, filepath)
+    except OSError:
+        # Don't leave a half-written temp file behind (e.g. the disk filled up)
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class ShortestPathTree:
+    """
+    dist/prev of one source, memory-mapped from a file written by write_tree().
+    Lookups touch only the pages they need; call close() when done.
+    """
+
+    def __init__(self, filepath):
+        with open(filepath, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{filepath} is not a shortest-path-tree file")
+            header_len = struct.unpack("<Q", f.read(8))[0]
+            header = json.loads(f.read(header_len).decode("utf-8"))
+            if header["byteorder"] != sys.byteorder:
+                raise ValueError(f"{filepath} was written on a {header['byteorder']}-endian machine")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.dataset_hash = header["dataset_hash"]
+        self.source = header["source"]
+        self.names = header["names"]
+        self.index = {n: i for i, n in enumerate(self.names)}
+
+        n = len(self.names)
+        start = len(MAGIC) + 8 + header_len
+        if len(self._mmap) < start + 13 * n:
+            self._mmap.close()
+            raise ValueError(f"{filepath} is truncated")
+        self._buffer = memoryview(self._mmap)
+        self.dist = self._buffer[start:start + 8 * n].cast("d")
+        self.prev = self._buffer[start + 8 * n:start + 12 * n].cast("i")
+        self._ints = self._buffer[start + 12 * n:start + 13 * n]
+
+    def distance(self, target):
+        """Distance from the source to target (inf if unreachable or unknown)."""
+        i = self.index.get(target)
+        return float("inf") if i is None else self._value(i)
+
+    def path(self, target):
+        """Same result as reconstruct_path(prev, target) on the original prev dictionary."""
+        i = self.index.get(target)
+        if i is None:
+            return []
+        path = []
+        while i != -1:
+            path.append(self.names[i])
+            i = self.prev[i]
+        path.reverse()
+        return path
+
+    def distances(self):
+        """Yield (node, distance) for every node, in the order dijkstra() returned them."""
+        for i, name in enumerate(self.names):
+            yield name, self._value(i)
+
+    def _value(self, i):
+        d = self.dist[i]
+        return int(d) if self._ints[i] else d
+
+    def close(self):
+        """Release the array views and unmap the file."""
+        self.dist.release()
+        self.prev.release()
+        self._ints.release()
+        self._buffer.release()
+        self._mmap.close()
+
+
+class SPTStore:
+    """
+    Directory of shortest-path trees for one dataset, keyed by (dataset hash, source).
+
+    Saving a tree removes trees built from other versions of the dataset,
+    so the directory only holds trees for the current file contents.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _filename(self, digest, source):
+        source_key = hashlib.sha1(str(source).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.root, f"{digest[:16]}-{source_key}.spt")
+
+    def open(self, digest, source):
+        """The stored tree for (digest, source), or None if there is none yet."""
+        filepath = self._filename(digest, source)
+        if not os.path.exists(filepath):
+            return None
+        try:
+            tree = ShortestPathTree(filepath)
+        except (OSError, ValueError, KeyError, struct.error):
+            # Unreadable or partially written file: treat it as missing and rebuild
+            return None
+        if tree.dataset_hash != digest or tree.source != source:
+            tree.close()
+            return None
+        return tree
+
+    def save(self, digest, source, dist, prev):
+        """
+        Store dijkstra()'s result for (digest, source).
+        Returns False if the directory cannot be written (e.g. read-only), in which
+        case nothing is cached and the caller keeps using dist/prev directly.
+        """
+        filepath = self._filename(digest, source)
+        prefix = digest[:16] + "-"
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            for name in os.listdir(self.root):
+                if name.endswith(".spt") and not name.startswith(prefix):
+                    os.remove(os.path.join(self.root, name))
+            write_tree(filepath, digest, source, dist, prev)
+        except OSError:
+            return False
+        return True
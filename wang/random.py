@@ -62,6 +62,26 @@ def _is_connected(node_ids: List[str], edges: List[dict]) -> bool:
     return len(seen) == len(node_ids)
 
 
+def _components(node_ids: List[str], edges: List[dict]) -> List[List[str]]:
+    """并查集求连通分量（忽略方向），按大小降序返回"""
+    parent = {n: n for n in node_ids}
+
+    def find(x: str) -> str:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for e in edges:
+        ru, rv = find(e["u"]), find(e["v"])
+        if ru != rv:
+            parent[rv] = ru
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for n in node_ids:
+        groups[find(n)].append(n)
+    return sorted(groups.values(), key=len, reverse=True)
+
+
 def _haversine_km(lat1, lon1, lat2, lon2) -> float:
     R = 6371.0
     phi1, phi2 = math.radians(lat1), math.radians(lat2)
@@ -222,9 +242,14 @@ def generate_one_large_metro_graph(
         node_ids.append(nid)
 
     if not _is_connected(node_ids, edges):
-        node_ids_sorted = sorted(node_ids)
-        for u, v in zip(node_ids_sorted[:-1], node_ids_sorted[1:]):
+        # 每个小分量只补一条边：分量代表站连到主分量中地理上最近的站（共 c-1 条）
+        comps = _components(node_ids, edges)
+        main = comps[0]
+        for comp in comps[1:]:
+            u = comp[0]
+            v = min(main, key=lambda m: distance_km(u, m))
             add_edge(u, v, "X", 1)
+            main.extend(comp)
 
     # adjacency
     adj: Dict[str, Dict[str, int]] = defaultdict(dict)